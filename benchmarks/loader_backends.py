@@ -0,0 +1,94 @@
+"""
+Times every available Loader backend on a fixed corpus of images 
+and prints the fastest backend order for each file type. Compare it 
+with the shipped orders in chafa.loader._SUFFIX_ORDERS, or pass it to 
+chafa.loader.set_backend_order to use orders measured on your images.
+
+Usage: python benchmarks/loader_backends.py [--repeat N] [--max-size WxH] [images...]
+"""
+import argparse
+import statistics
+import time
+from pathlib import Path
+
+from chafa.loader import Loader, available_backends
+
+ROOT = Path(__file__).parent.parent
+
+CORPUS = [
+    ROOT / "tests"    / "snake.jpg",
+    ROOT / "examples" / "snake.jpg",
+    ROOT / "examples" / "frieren.gif",
+    ROOT / "img"      / "readme_snake.png",
+    ROOT / "docs"     / "crunchyfy.png",
+]
+
+
+def time_backend(path, backend, repeat, max_size):
+    """
+    Returns the median time in seconds it takes backend 
+    to load path, or None if the backend can not load it.
+    """
+    times = []
+
+    for _ in range(repeat):
+        start = time.perf_counter()
+
+        try:
+            Loader(path, max_size=max_size, backend=backend)
+
+        except (ValueError, ImportError):
+            return None
+
+        times.append(time.perf_counter() - start)
+
+    return statistics.median(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("images", nargs="*", type=Path, default=CORPUS)
+    parser.add_argument("--repeat",   type=int, default=10)
+    parser.add_argument("--max-size", type=str, default=None, help="e.g. 320x240")
+
+    args = parser.parse_args()
+
+    max_size = None
+
+    if args.max_size:
+        max_size = tuple(int(v) for v in args.max_size.lower().split("x"))
+
+    backends = available_backends()
+
+    print(f"{'image':<24}" + "".join(f"{name:>12}" for name in backends))
+
+    totals = {}
+
+    for path in args.images:
+        row = f"{path.name:<24}"
+
+        for backend in backends:
+            elapsed = time_backend(path, backend, args.repeat, max_size)
+
+            if elapsed is None:
+                row += f"{'-':>12}"
+                continue
+
+            row += f"{elapsed * 1000:>10.2f}ms"
+
+            suffix = path.suffix.lower()
+            totals.setdefault(suffix, {}).setdefault(backend, 0)
+            totals[suffix][backend] += elapsed
+
+        print(row)
+
+    print()
+    print("Fastest order per file type:")
+
+    for suffix, results in totals.items():
+        order = tuple(sorted(results, key=results.get))
+        print(f"    {suffix!r}: {order},")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""
+Renders a corpus of images with every CanvasConfig preset in every 
+pixel mode and prints the median time to draw and print a frame and 
+the size of the output. Run it on images like yours to see what 
+the presets in chafa.canvas_config._PRESETS cost on your host.
+
+Usage: python benchmarks/presets.py [--repeat N] [--size WxH] [--json FILE] [images...]
+"""
+import argparse
+import json
+import platform
+import statistics
+import time
+from pathlib import Path
+
+from chafa import CanvasConfig, Canvas, TermDb, PixelMode, CanvasMode
+from chafa.canvas_config import _PRESETS
+from chafa.loader import Loader
+
+ROOT = Path(__file__).parent.parent
+
+# A photo, a flat illustration, a logo and a terminal screenshot
+CORPUS = [
+    ROOT / "tests" / "snake.jpg",
+    ROOT / "img"   / "readme_snake.png",
+    ROOT / "docs"  / "crunchyfy.png",
+    ROOT / "docs"  / "usage" / "tutorial_img" / "sixels.png",
+]
+
+PIXEL_MODES = [
+    PixelMode.CHAFA_PIXEL_MODE_SYMBOLS,
+    PixelMode.CHAFA_PIXEL_MODE_SIXELS,
+    PixelMode.CHAFA_PIXEL_MODE_KITTY,
+    PixelMode.CHAFA_PIXEL_MODE_ITERM2,
+]
+
+# Cell size used for the pixel modes, in pixels
+CELL_WIDTH  = 10
+CELL_HEIGHT = 20
+
+
+def render(image, preset, pixel_mode, size, term_info, repeat):
+    """
+    Returns the median time in seconds to draw and print 
+    image with preset, and the size of the output in bytes.
+    """
+    width, height = size
+
+    config = CanvasConfig.from_preset(
+        preset,
+        width       = width,
+        height      = height,
+        cell_width  = CELL_WIDTH,
+        cell_height = CELL_HEIGHT,
+        pixel_mode  = pixel_mode,
+        canvas_mode = CanvasMode.CHAFA_CANVAS_MODE_TRUECOLOR
+    )
+
+    config.calc_canvas_geometry(image.width, image.height, CELL_WIDTH / CELL_HEIGHT)
+
+    pixels = image.get_pixels()
+    times  = []
+
+    for _ in range(repeat):
+        start = time.perf_counter()
+
+        canvas = Canvas(config)
+        canvas.draw_all_pixels(
+            image.pixel_type,
+            pixels,
+            image.width, image.height,
+            image.rowstride
+        )
+
+        output = canvas.print(term_info)
+
+        times.append(time.perf_counter() - start)
+
+    return statistics.median(times), len(output)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("images", nargs="*", type=Path, default=CORPUS)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--size",   default="80x40", help="Canvas size in cells, WxH")
+    parser.add_argument("--json",   type=Path, help="Also write the results to this file")
+
+    args = parser.parse_args()
+    size = tuple(int(value) for value in args.size.lower().split("x"))
+
+    term_info = TermDb().get_fallback_info()
+    images    = [(path, Loader(path)) for path in args.images if path.exists()]
+    results   = []
+
+    print(f"{'preset':10} {'pixel mode':26} {'ms/frame':>9} {'bytes':>10}")
+
+    for preset in _PRESETS:
+        for pixel_mode in PIXEL_MODES:
+            times = []
+            sizes = []
+
+            for path, image in images:
+                seconds, output_size = render(image, preset, pixel_mode, size, term_info, args.repeat)
+
+                times.append(seconds)
+                sizes.append(output_size)
+
+                results.append({
+                    "preset":     preset,
+                    "pixel_mode": pixel_mode.name,
+                    "image":      path.name,
+                    "seconds":    seconds,
+                    "bytes":      output_size,
+                })
+
+            if not images:
+                continue
+
+            print(f"{preset:10} {pixel_mode.name:26} {statistics.mean(times) * 1000:9.2f} {statistics.mean(sizes):10.0f}")
+
+    if args.json:
+        report = {
+            "machine": platform.platform(),
+            "python":  platform.python_version(),
+            "size":    size,
+            "repeat":  args.repeat,
+            "results": results,
+        }
+
+        args.json.write_text(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Measures how long ``python -c "import chafa"`` takes, since short 
+lived command line tools are dominated by it. The cold run uses an 
+empty library cache so libchafa and glib may have to be searched for, 
+the warm runs reuse the cache written by the cold run.
+
+Usage: python benchmarks/startup.py [--repeat N] [--importtime]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+
+def run(code, env, *flags):
+    """
+    Runs code in a fresh interpreter and returns the 
+    wall clock time in seconds it took, and its stderr.
+    """
+    start = time.perf_counter()
+
+    result = subprocess.run(
+        [sys.executable, *flags, "-c", code],
+        env=env,
+        stderr=subprocess.PIPE,
+        check=True
+    )
+
+    return time.perf_counter() - start, result.stderr.decode()
+
+
+def print_importtime(stderr):
+    """
+    Prints the slowest imports from the output of ``-X importtime``.
+    """
+    rows = []
+
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+
+        _, cumulative, name = line[len("import time:"):].split("|")
+        rows.append((int(cumulative), name.rstrip()))
+
+    print()
+    print("Slowest imports (cumulative):")
+
+    for cumulative, name in sorted(rows, reverse=True)[:15]:
+        print(f"    {cumulative / 1000:8.2f}ms {name}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--importtime", action="store_true", help="show the slowest imports")
+
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        env = dict(os.environ, CHAFA_PY_CACHE_DIR=cache_dir)
+
+        cold, _ = run("import chafa", env)
+
+        warm        = [run("import chafa", env)[0] for _ in range(args.repeat)]
+        interpreter = [run("pass", env)[0]         for _ in range(args.repeat)]
+
+        print(f"interpreter only: {statistics.median(interpreter) * 1000:8.2f}ms")
+        print(f"cold import:      {cold * 1000:8.2f}ms")
+        print(f"warm import:      {statistics.median(warm) * 1000:8.2f}ms (median of {args.repeat})")
+        print(f"best warm import: {min(warm) * 1000:8.2f}ms")
+
+        if args.importtime:
+            _, stderr = run("import chafa", env, "-X", "importtime")
+            print_importtime(stderr)
+
+
+if __name__ == "__main__":
+    main()
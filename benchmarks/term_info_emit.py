@@ -0,0 +1,72 @@
+"""
+Compares the ways TermInfo can emit sequences: the variadic
+chafa_term_info_emit_seq, the typed chafa_term_info_emit_* 
+functions and TermInfo.emit with its caches. The colors 
+cycle through a screen worth of cells, like a renderer 
+redrawing a frame would.
+
+Usage: python benchmarks/term_info_emit.py [--number N] [--term TERM]
+"""
+import argparse
+import os
+import timeit
+
+from chafa import TermDb, TermSeq
+
+WIDTH  = 200
+HEIGHT = 60
+
+POSITIONS = [(x, y) for y in range(HEIGHT) for x in range(WIDTH)]
+
+
+def bench(name, function, number):
+    seconds = min(timeit.repeat(function, number=number, repeat=5))
+
+    print(f"{name:34} {seconds / number / len(POSITIONS) * 1e9:8.1f}ns per sequence")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--number", type=int, default=5)
+    parser.add_argument("--term", default="xterm-256color")
+
+    args = parser.parse_args()
+
+    os.environ["TERM"] = args.term
+    info = TermDb().detect()
+
+    # CURSOR_TO_POS always goes through emit_seq, since its
+    # typed function makes positions 1-based
+    color  = TermSeq.CHAFA_TERM_SEQ_SET_COLOR_FGBG_DIRECT
+    reset  = TermSeq.CHAFA_TERM_SEQ_RESET_ATTRIBUTES
+
+    def variadic():
+        for x, y in POSITIONS:
+            info._emit_seq(color, x, y, 0, y, x, 0)
+
+    def typed():
+        for x, y in POSITIONS:
+            info._emit_uncached(color, x, y, 0, y, x, 0)
+
+    def cached():
+        for x, y in POSITIONS:
+            info.emit(color, x, y, 0, y, x, 0)
+
+    def argless():
+        for _ in POSITIONS:
+            info.emit(reset)
+
+    # Fill the cache first so we measure hits
+    info._EMIT_CACHE_SIZE = len(POSITIONS)
+    cached()
+
+    print(f"TERM={args.term}, {len(POSITIONS)} color changes per round")
+
+    bench("variadic emit_seq", variadic, args.number)
+    bench("typed emit_set_color_fgbg_direct", typed, args.number)
+    bench("emit, cache hits", cached, args.number)
+    bench("emit, no arguments", argless, args.number)
+
+
+if __name__ == "__main__":
+    main()
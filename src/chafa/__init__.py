@@ -1,3 +1,5 @@
+from ._version import __version__
+
 from .enums import PixelMode
 from .enums import DitherMode
 from .enums import CanvasMode
@@ -15,13 +17,20 @@ from .symbol_map import SymbolMap
 from .symbol_map import ReadOnlySymbolMap
 
 from .canvas_config import CanvasConfig
+from .canvas_config import CanvasConfigSnapshot
 from .canvas_config import ReadOnlyCanvasConfig
 
 from .canvas import Canvas
+from .canvas_pool import CanvasPool
+from .adaptive_renderer import AdaptiveRenderer
+from .render_cache import RenderCache
+from .render_cache import RenderCacheStats
+from .disk_render_store import DiskRenderStore
 
 from .term_db import TermDb
 
 from .term_info import TermInfo
+from .compiled_term_info import CompiledTermInfo
 
 from .placement import Placement
 from .frame import Frame
@@ -29,4 +38,11 @@ from .image import Image
 
 from .chafa import get_device_attributes
 from .chafa import get_cell_geometry
-from .chafa import get_terminal_geometry
\ No newline at end of file
+from .chafa import get_terminal_geometry
+from .chafa import get_terminal_pixel_geometry
+from .chafa import query_terminal
+from .chafa import probe_terminal
+
+from .geometry import calc_geometries
+
+from .terminal_geometry import TerminalGeometry
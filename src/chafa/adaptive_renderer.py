@@ -0,0 +1,298 @@
+from __future__ import annotations
+import time
+from typing import Callable, Dict, List, Optional
+
+from .canvas import Canvas
+from .canvas_config import CanvasConfig
+from .term_info import TermInfo
+from .enums import PixelType, DitherMode, ColorExtractor
+
+# How many windows to wait before trying a level that was too slow again
+_RETRY_WINDOWS = 16
+
+
+class AdaptiveRenderer:
+    """
+    Draws frames with a :py:class:`CanvasConfig` whose 
+    :py:attr:`CanvasConfig.work_factor` (and optionally 
+    :py:attr:`CanvasConfig.dither_mode` and 
+    :py:attr:`CanvasConfig.color_extractor`) is turned down when 
+    :py:meth:`Canvas.draw_all_pixels` takes longer than the target 
+    frame time and back up when there is time to spare.
+
+    :param CanvasConfig config: The config to start from. It's copied, the highest quality used is the one it has.
+    :param float target_frame_time: How long drawing a frame may take, in seconds.
+    :param float min_work_factor: The lowest work factor to use.
+    :param float step: How much the work factor changes at a time.
+    :param float hysteresis: How far, as a fraction of the target, the frame time has to be off before the quality is changed.
+    :param int window: How many frames to average over, and to wait after a change before changing again.
+    :param bool tune_dither_mode: Turn dithering off once the work factor is at its lowest.
+    :param bool tune_color_extractor: Use :py:attr:`ColorExtractor.CHAFA_COLOR_EXTRACTOR_AVERAGE` once the work factor is at its lowest.
+    :param Callable clock: Returns the time in seconds, :py:func:`time.perf_counter` by default.
+
+    :raises TypeError: if config is not a :py:class:`CanvasConfig`
+    :raises ValueError: if target_frame_time, step or window are not positive, or hysteresis is not between 0 and 1
+    """
+
+    def __init__(
+        self,
+        config: CanvasConfig,
+        target_frame_time: float,
+        min_work_factor: float=0.0,
+        step: float=0.1,
+        hysteresis: float=0.2,
+        window: int=8,
+        tune_dither_mode: bool=False,
+        tune_color_extractor: bool=False,
+        clock: Callable[[], float]=time.perf_counter
+    ):
+        if not isinstance(config, CanvasConfig):
+            raise TypeError(f"config must be of type CanvasConfig, not {type(config)}")
+
+        if target_frame_time <= 0:
+            raise ValueError("target_frame_time must be positive")
+
+        if step <= 0:
+            raise ValueError("step must be positive")
+
+        if not 0 <= hysteresis < 1:
+            raise ValueError("hysteresis must be between 0 and 1")
+
+        if window < 1:
+            raise ValueError("window must be positive")
+
+        self._target     = float(target_frame_time)
+        self._hysteresis = float(hysteresis)
+        self._window     = int(window)
+        self._clock      = clock
+
+        self._min_work_factor      = float(min_work_factor)
+        self._step                 = float(step)
+        self._tune_dither_mode     = tune_dither_mode
+        self._tune_color_extractor = tune_color_extractor
+
+        # Seconds per cell of the last frames drawn with the current settings
+        self._samples: List[float] = []
+        self._last_frame_time      = None
+
+        # Seconds per cell and frame number when each level was last
+        # left, so we don't keep going back to a level that was too slow
+        self._level_times: Dict[int, tuple] = {}
+        self._frames = 0
+
+        self._level = 0
+        self._set_base_config(config)
+
+
+    def _set_base_config(self, config: CanvasConfig):
+        """
+        Builds the quality levels for config and 
+        the config and canvas for the current level.
+        """
+        self._base   = config.copy()
+        self._levels = self._build_levels(self._base)
+        self._level  = min(self._level, len(self._levels) - 1)
+
+        self._apply_level()
+
+
+    def _build_levels(self, config: CanvasConfig) -> List[Dict]:
+        """
+        The settings to use at each level of quality, best first
+        """
+        work_factor = config.work_factor
+        levels      = [{"work_factor": work_factor}]
+
+        while work_factor - self._step >= self._min_work_factor - 1e-6:
+            work_factor = max(round(work_factor - self._step, 6), self._min_work_factor)
+            levels.append({"work_factor": work_factor})
+
+        lowest = dict(levels[-1])
+
+        if self._tune_dither_mode and config.dither_mode != DitherMode.CHAFA_DITHER_MODE_NONE:
+            lowest["dither_mode"] = DitherMode.CHAFA_DITHER_MODE_NONE
+            levels.append(dict(lowest))
+
+        if self._tune_color_extractor and config.color_extractor != ColorExtractor.CHAFA_COLOR_EXTRACTOR_AVERAGE:
+            lowest["color_extractor"] = ColorExtractor.CHAFA_COLOR_EXTRACTOR_AVERAGE
+            levels.append(dict(lowest))
+
+        return levels
+
+
+    def _apply_level(self):
+        self._config = self._base.copy_with(**self._levels[self._level])
+        self._canvas = Canvas(self._config)
+        self._cells  = max(self._config.width * self._config.height, 1)
+
+
+    @property
+    def config(self) -> CanvasConfig:
+        """
+        :type: CanvasConfig
+
+        The config frames are currently drawn with. Changing it 
+        has no effect, use :py:meth:`update_config` instead.
+        """
+        return self._config
+
+
+    @property
+    def canvas(self) -> Canvas:
+        """
+        :type: Canvas
+
+        The canvas the last frame was drawn on.
+        """
+        return self._canvas
+
+
+    @property
+    def level(self) -> int:
+        """
+        :type: int
+
+        How far the quality has been turned down, 0 is the config 
+        the renderer was made with.
+        """
+        return self._level
+
+
+    @property
+    def last_frame_time(self) -> Optional[float]:
+        """
+        :type: float | None
+
+        How long drawing the last frame took, in seconds.
+        """
+        return self._last_frame_time
+
+
+    def update_config(self, config: CanvasConfig):
+        """
+        Replaces the config to start from, after the terminal is 
+        resized for example. The quality stays turned down as much 
+        as it was, and the timings so far still count since they are 
+        kept per cell.
+
+        :param CanvasConfig config: The new config to start from.
+
+        :raises TypeError: if config is not a :py:class:`CanvasConfig`
+        """
+
+        if not isinstance(config, CanvasConfig):
+            raise TypeError(f"config must be of type CanvasConfig, not {type(config)}")
+
+        self._set_base_config(config)
+
+
+    def draw(
+        self,
+        src_pixel_type: PixelType,
+        src_pixels,
+        src_width: int,
+        src_height: int,
+        src_rowstride: int
+    ) -> Canvas:
+        """
+        Draws a frame like :py:meth:`Canvas.draw_all_pixels`, 
+        adjusting the quality for the next frame, and returns 
+        the canvas it was drawn on.
+
+        :rtype: Canvas
+        """
+        canvas = self._canvas
+
+        start = self._clock()
+        canvas.draw_all_pixels(
+            src_pixel_type,
+            src_pixels,
+            src_width,
+            src_height,
+            src_rowstride
+        )
+        self._record(self._clock() - start)
+
+        return canvas
+
+
+    def render(
+        self,
+        src_pixel_type: PixelType,
+        src_pixels,
+        src_width: int,
+        src_height: int,
+        src_rowstride: int,
+        term_info: TermInfo=None,
+        fallback: bool=False
+    ) -> bytes:
+        """
+        Draws a frame with :py:meth:`draw` and returns 
+        it printed with :py:meth:`Canvas.print`.
+
+        :rtype: bytes
+        """
+        canvas = self.draw(
+            src_pixel_type,
+            src_pixels,
+            src_width,
+            src_height,
+            src_rowstride
+        )
+
+        return canvas.print(term_info, fallback)
+
+
+    def _may_raise(self) -> bool:
+        """
+        Whether the next better level is worth trying. It isn't if it 
+        was too slow the last time, unless that was long ago and the 
+        load may have changed since.
+        """
+        try:
+            per_cell, frame = self._level_times[self._level - 1]
+
+        except KeyError:
+            return True
+
+        if self._frames - frame > self._window * _RETRY_WINDOWS:
+            return True
+
+        return per_cell * self._cells <= self._target
+
+
+    def _record(self, frame_time: float):
+        """
+        Records how long a frame took and changes 
+        the quality level if needed.
+        """
+        self._last_frame_time = frame_time
+        self._frames         += 1
+        self._samples.append(frame_time / self._cells)
+
+        # Wait for a full window after every change
+        if len(self._samples) < self._window:
+            return
+
+        del self._samples[:-self._window]
+
+        per_cell = sum(self._samples) / len(self._samples)
+        expected = per_cell * self._cells
+
+        if expected > self._target * (1 + self._hysteresis):
+            level = self._level + 1
+
+        elif expected < self._target * (1 - self._hysteresis) and self._may_raise():
+            level = self._level - 1
+
+        else:
+            return
+
+        if not 0 <= level < len(self._levels):
+            return
+
+        self._level_times[self._level] = (per_cell, self._frames)
+        self._level = level
+        self._samples.clear()
+
+        self._apply_level()
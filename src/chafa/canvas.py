@@ -2,9 +2,9 @@ from __future__ import annotations
 import ctypes
 from typing import Iterable
 import array
-from typing import Tuple, Union, Generator
+from typing import Tuple, Union, Generator, List, Optional
 
-from .libraries import _Chafa
+from .libraries import _Chafa, _GLib
 from .canvas_config import ReadOnlyCanvasConfig, CanvasConfig
 from .enums import *
 from .term_info import TermInfo
@@ -21,6 +21,10 @@ class Canvas:
         :raises TypeError: If term_info is not None or :py:class:`TermInfo`
         :raises TypeError: If config is not None or :py:class:`CanvasConfig`
         """
+        # Symbol maps are copied along with the config
+        self._symbol_map_ops      = None
+        self._fill_symbol_map_ops = None
+
         # Init config
         if config is None:
             _Chafa.chafa_canvas_new.argtypes = [ctypes.c_size_t]
@@ -31,6 +35,10 @@ class Canvas:
 
         else:
             _Chafa.chafa_canvas_new.argtypes = [ctypes.c_void_p]
+
+            self._symbol_map_ops      = config._symbol_map_ops
+            self._fill_symbol_map_ops = config._fill_symbol_map_ops
+
             config = config._canvas_config
 
         # Init canvas
@@ -42,6 +50,19 @@ class Canvas:
         self._placement = None
 
 
+    def __del__(self):
+        canvas = getattr(self, "_canvas", None)
+
+        # The library may already be gone at interpreter exit
+        if canvas is None or _Chafa is None:
+            return
+
+        _Chafa.chafa_canvas_unref.argtypes = [ctypes.c_void_p]
+        _Chafa.chafa_canvas_unref(canvas)
+
+        self._canvas = None
+
+
     class GString(ctypes.Structure):
         _fields_ = [('str',         ctypes.c_char_p),
                     ('len',           ctypes.c_uint),
@@ -95,11 +116,14 @@ class Canvas:
         # Get new pointer
         new_pointer = _Chafa.chafa_canvas_new_similar(self._canvas)
 
-        # Init canvas
-        new_canvas = Canvas(None)
+        # Wrap the new pointer without allocating a canvas of our own
+        new_canvas = Canvas.__new__(Canvas)
+
+        new_canvas._canvas    = new_pointer
+        new_canvas._placement = None
 
-        # Assign the new pointer to the newly created canvas
-        new_canvas._canvas = new_pointer
+        new_canvas._symbol_map_ops      = self._symbol_map_ops
+        new_canvas._fill_symbol_map_ops = self._fill_symbol_map_ops
 
         return new_canvas
 
@@ -130,6 +154,12 @@ class Canvas:
         config = ReadOnlyCanvasConfig()
         config._canvas_config = new_pointer
 
+        # The config belongs to the canvas, keep it alive
+        config._canvas = self
+
+        config._symbol_map_ops      = self._symbol_map_ops
+        config._fill_symbol_map_ops = self._fill_symbol_map_ops
+
         return config
 
 
@@ -515,6 +545,28 @@ class Canvas:
         )
 
 
+    @staticmethod
+    def _resolve_term_info(term_info: TermInfo, fallback: bool) -> TermInfo:
+        """
+        Returns the :py:class:`TermInfo` to print with. If term_info is 
+        None, the cached result of :py:meth:`TermDb.detect` is used.
+        """
+
+        # Check for term info
+        if term_info is None:
+            return TermDb()._detect_cached(fallback)
+
+        if not isinstance(term_info, TermInfo):
+            raise TypeError(f"term_info must be None or of type TermInfo or None, not {type(term_info)}")
+
+        # Supplement with fallback sequences
+        if fallback:
+            fallback_info = TermDb().get_fallback_info()
+            term_info.supplement(fallback_info)
+
+        return term_info
+
+
     def print(self, term_info: TermInfo=None, fallback=False) -> bytes:
         """
         Builds a UTF-8 string of terminal control sequences and symbols 
@@ -535,80 +587,121 @@ class Canvas:
         be supplemented with fallback control sequences.
         """
 
-        term_db = None
+        term_info = self._resolve_term_info(term_info, fallback)
 
-        # Check for term info
-        if term_info is None:
-            term_db = TermDb()
-            term_info = term_db.detect()
+        _Chafa.chafa_canvas_print.argtypes = [
+            ctypes.c_void_p, 
+            ctypes.c_void_p
+        ]
 
-        elif not isinstance(term_info, TermInfo):
-            raise TypeError(f"term_info must be None or of type TermInfo or None, not {type(term_info)}")
+        _Chafa.chafa_canvas_print.restype  = ctypes.c_void_p
 
-        # Supplement with fallback sequences
-        if fallback:
-            if term_db is None:
-                term_db = TermDb()
+        output  = _Chafa.chafa_canvas_print(self._canvas, term_info._term_info)
+        gstring = self.GString.from_address(output)
 
-            fallback_info = term_db.get_fallback_info()
-            term_info.supplement(fallback_info)
+        out = gstring.str
 
+        _GLib.g_string_free(output, True)
 
+        return out
 
-        _Chafa.chafa_canvas_print.argtypes = [
-            ctypes.c_void_p, 
-            ctypes.c_void_p
+
+    def print_rows(self, term_info: TermInfo=None, fallback=False) -> Generator[bytes]:
+        """
+        Like :py:meth:`print`, but yields the output one row at a time.
+        The rows do not end in newlines.
+        """
+        term_info = self._resolve_term_info(term_info, fallback)
+
+        # Array of GString pointers, allocated by chafa
+        output_array = ctypes.POINTER(ctypes.POINTER(self.GString))()
+        output_rows  = ctypes.c_int()
+
+        _Chafa.chafa_canvas_print_rows.argtypes = [
+            ctypes.c_void_p,
+            ctypes.c_void_p,
+            ctypes.POINTER(ctypes.POINTER(ctypes.POINTER(self.GString))),
+            ctypes.POINTER(ctypes.c_int)
         ]
 
-        _Chafa.chafa_canvas_print.restype  = ctypes.c_void_p
+        _Chafa.chafa_canvas_print_rows(self._canvas, term_info._term_info, output_array, output_rows)
 
-        output = _Chafa.chafa_canvas_print(self._canvas, term_info._term_info)
-        output = self.GString.from_address(output)
+        # Copy the rows out so everything can be freed right away
+        rows = []
 
-        return output.str
+        for current_row in range(output_rows.value):
+            rows.append(output_array[current_row].contents.str)
+            _GLib.g_string_free(output_array[current_row], True)
 
+        _GLib.g_free(output_array)
 
-    def print_rows(self, term_info: TermInfo=None, fallback=False) -> Generator[bytes]:
-        term_db = None
+        yield from rows
 
-        # Check for term info
-        if term_info is None:
-            term_db = TermDb()
-            term_info = term_db.detect()
 
-        elif not isinstance(term_info, TermInfo):
-            raise TypeError(f"term_info must be None or of type TermInfo or None, not {type(term_info)}")
+    def print_rows_strv(
+        self, 
+        term_info: TermInfo=None, 
+        fallback=False, 
+        out: Optional[List[bytearray]]=None
+    ) -> Union[List[bytes], List[int]]:
+        """
+        Like :py:meth:`print`, but returns the output as a list 
+        of rows built in one call. The rows do not end in newlines.
 
-        # Supplement with fallback sequences
-        if fallback:
-            if term_db is None:
-                term_db = TermDb()
+        If out is given, the rows are written into the bytearrays 
+        in it instead, reusing them from frame to frame. Missing 
+        bytearrays are added and surplus ones removed. The indices 
+        of the rows that changed are returned.
 
-            fallback_info = term_db.get_fallback_info()
-            term_info.supplement(fallback_info)
+        :param TermInfo term_info: The :py:class:`TermInfo` that will 
+        provide the control sequences used when printing. If None is 
+        specified, the term_info will be initialised with 
+        :py:meth:`TermDb.detect`
 
-        config = self.peek_config()
+        :param bool fallback: If True, the term_info will be 
+        supplemented with fallback control sequences.
 
-        max_length = config.height
+        :param list out: A list of bytearrays to write the rows into.
 
-        # Define storage for output with max_length to accomodate all the possible rows
-        output_array = ctypes.POINTER(ctypes.POINTER(self.GString) * max_length)()
-        output_rows = ctypes.c_int()
+        :rtype: list[bytes] | list[int]
+        """
 
-        _Chafa.chafa_canvas_print_rows.argtypes = [
-            ctypes.c_void_p,
+        term_info = self._resolve_term_info(term_info, fallback)
+
+        _Chafa.chafa_canvas_print_rows_strv.argtypes = [
             ctypes.c_void_p,
-            ctypes.POINTER(ctypes.POINTER(ctypes.POINTER(self.GString)*max_length)),
-            ctypes.POINTER(ctypes.c_int)
+            ctypes.c_void_p
         ]
 
-        _Chafa.chafa_canvas_print_rows(self._canvas, term_info._term_info, output_array, output_rows)
+        # NULL terminated array of strings, allocated by chafa
+        _Chafa.chafa_canvas_print_rows_strv.restype = ctypes.POINTER(ctypes.c_char_p)
+
+        output_array = _Chafa.chafa_canvas_print_rows_strv(self._canvas, term_info._term_info)
+
+        rows = []
+
+        try:
+            while output_array[len(rows)] is not None:
+                rows.append(output_array[len(rows)])
+
+        finally:
+            _GLib.g_strfreev(output_array)
+
+        if out is None:
+            return rows
+
+        # Fit out to the number of rows
+        del out[len(rows):]
+        out.extend(bytearray() for _ in range(len(rows) - len(out)))
+
+        changed = []
+
+        for index, row in enumerate(rows):
+            if out[index] != row:
+                out[index][:] = row
+                changed.append(index)
 
-        # Create a generator for the output
-        current_row = 0
-        while current_row < output_rows.value:
-            yield output_array.contents[current_row].contents.str
-            current_row += 1
+        return changed
 
 
 
@@ -1,9 +1,13 @@
 from __future__ import annotations
+import os
+import json
 import ctypes
-from typing import Tuple, Iterable
+import hashlib
+from typing import Tuple, Iterable, NamedTuple, Optional, Mapping
 
 from .libraries import _Chafa
 from .symbol_map import ReadOnlySymbolMap, SymbolMap
+from .geometry import _calc_canvas_geometry, _check_geometry_args, _check_source_size
 from .enums import *
 
 def packed_8bit_to_tuple(color: int) -> Tuple[int, int, int]:
@@ -47,12 +51,300 @@ def tuple_to_packed_8bit(color_tuple: Tuple[int, int, int]) -> int:
     return color
 
 
+# === Bulk settings ===
+
+def _to_bool(name: str):
+    def convert(value) -> bool:
+        if value is None:
+            raise TypeError(f"{name} must not be None")
+
+        return bool(value)
+
+    return convert
+
+
+def _to_enum(enum):
+    def convert(value):
+        # Accept names too, for settings that come from e.g. JSON
+        if isinstance(value, str):
+            try:
+                return enum[value]
+
+            except KeyError:
+                raise ValueError(f"{value!r} is not a valid {enum.__name__}")
+
+        return enum(value)
+
+    return convert
+
+
+def _to_unit_float(name: str):
+    def convert(value) -> float:
+        value = float(value)
+
+        if 1 < value or value < 0:
+            raise ValueError(f"{name} must be in range [0,1]")
+
+        return value
+
+    return convert
+
+
+def _to_dither_intensity(intensity) -> float:
+    intensity = float(intensity)
+
+    if intensity < 0:
+        raise ValueError("Dither intensity must be positive.")
+
+    return intensity
+
+
+def _to_optimizations(optimizations) -> int:
+    if not isinstance(optimizations, Iterable):
+        raise TypeError(f"optimizations must be iterable, not {type(optimizations)}")
+
+    compounded = 0
+
+    for flag in optimizations:
+        compounded |= _to_enum(Optimizations)(flag)
+
+    return compounded
+
+
+def _to_color(name: str):
+    def convert(color) -> int:
+        if isinstance(color, str):
+            raise TypeError(f"{name} must not be a string")
+
+        if not isinstance(color, Iterable):
+            raise TypeError(f"{name} must be iterable, not {type(color)}")
+
+        if len(color) != 3:
+            raise ValueError(f"{name} must have exactly 3 values")
+
+        return tuple_to_packed_8bit(color)
+
+    return convert
+
+
+# Setting: (validator, setter, position in the setter's arguments)
+_BULK_SETTINGS = {
+    "width":                  (int, "chafa_canvas_config_set_geometry", 0),
+    "height":                 (int, "chafa_canvas_config_set_geometry", 1),
+    "cell_width":             (int, "chafa_canvas_config_set_cell_geometry", 0),
+    "cell_height":            (int, "chafa_canvas_config_set_cell_geometry", 1),
+    "dither_width":           (int, "chafa_canvas_config_set_dither_grain_size", 0),
+    "dither_height":          (int, "chafa_canvas_config_set_dither_grain_size", 1),
+    "pixel_mode":             (_to_enum(PixelMode),      "chafa_canvas_config_set_pixel_mode", 0),
+    "canvas_mode":            (_to_enum(CanvasMode),     "chafa_canvas_config_set_canvas_mode", 0),
+    "color_extractor":        (_to_enum(ColorExtractor), "chafa_canvas_config_set_color_extractor", 0),
+    "color_space":            (_to_enum(ColorSpace),     "chafa_canvas_config_set_color_space", 0),
+    "dither_mode":            (_to_enum(DitherMode),     "chafa_canvas_config_set_dither_mode", 0),
+    "passthrough":            (_to_enum(Passthrough),    "chafa_canvas_config_set_passthrough", 0),
+    "dither_intensity":       (_to_dither_intensity,     "chafa_canvas_config_set_dither_intensity", 0),
+    "preprocessing":          (_to_bool("preprocessing"),                   "chafa_canvas_config_set_preprocessing_enabled", 0),
+    "fg_only":                (_to_bool("fg_only"),                         "chafa_canvas_config_set_fg_only_enabled", 0),
+    "optimizations":          (_to_optimizations,                           "chafa_canvas_config_set_optimizations", 0),
+    "work_factor":            (_to_unit_float("Work factor"),               "chafa_canvas_config_set_work_factor", 0),
+    "transparency_threshold": (_to_unit_float("Transparency threshold"),    "chafa_canvas_config_set_transparency_threshold", 0),
+    "fg_color":               (_to_color("fg_color"),                       "chafa_canvas_config_set_fg_color", 0),
+    "bg_color":               (_to_color("bg_color"),                       "chafa_canvas_config_set_bg_color", 0),
+}
+
+def _convert(name: str, value):
+    """
+    Validates and converts value for the setting name. The property 
+    setters and the bulk constructor both go through here.
+    """
+    return _BULK_SETTINGS[name][0](value)
+
+
+# Named settings for CanvasConfig.from_preset, from fastest to best looking.
+# These are heuristics, benchmarks/presets.py measures what they cost and
+# the figures from the last run are in docs/api/CanvasConfig.rst.
+_PRESETS = {
+    "fastest": {
+        "work_factor":     0.0,
+        "color_extractor": ColorExtractor.CHAFA_COLOR_EXTRACTOR_AVERAGE,
+        "color_space":     ColorSpace.CHAFA_COLOR_SPACE_RGB,
+        "dither_mode":     DitherMode.CHAFA_DITHER_MODE_NONE,
+        "preprocessing":   False,
+        "optimizations":   (Optimizations.CHAFA_OPTIMIZATION_ALL,),
+    },
+    "balanced": {
+        "work_factor":     0.5,
+        "color_extractor": ColorExtractor.CHAFA_COLOR_EXTRACTOR_AVERAGE,
+        "color_space":     ColorSpace.CHAFA_COLOR_SPACE_RGB,
+        "dither_mode":     DitherMode.CHAFA_DITHER_MODE_ORDERED,
+        "preprocessing":   True,
+        "optimizations":   (Optimizations.CHAFA_OPTIMIZATION_ALL,),
+    },
+    "quality": {
+        "work_factor":     1.0,
+        "color_extractor": ColorExtractor.CHAFA_COLOR_EXTRACTOR_MEDIAN,
+        "color_space":     ColorSpace.CHAFA_COLOR_SPACE_DIN99D,
+        "dither_mode":     DitherMode.CHAFA_DITHER_MODE_DIFFUSION,
+        "preprocessing":   True,
+        "optimizations":   (Optimizations.CHAFA_OPTIMIZATION_ALL,),
+    },
+}
+
+# Argument types of the setters after the config pointer
+_BULK_PROTOTYPES = {
+    "chafa_canvas_config_set_geometry":               [ctypes.c_uint, ctypes.c_uint],
+    "chafa_canvas_config_set_cell_geometry":          [ctypes.c_int, ctypes.c_int],
+    "chafa_canvas_config_set_dither_grain_size":      [ctypes.c_int, ctypes.c_int],
+    "chafa_canvas_config_set_pixel_mode":             [ctypes.c_uint],
+    "chafa_canvas_config_set_canvas_mode":            [ctypes.c_uint],
+    "chafa_canvas_config_set_color_extractor":        [ctypes.c_uint],
+    "chafa_canvas_config_set_color_space":            [ctypes.c_uint],
+    "chafa_canvas_config_set_dither_mode":            [ctypes.c_uint],
+    "chafa_canvas_config_set_passthrough":            [ctypes.c_uint],
+    "chafa_canvas_config_set_dither_intensity":       [ctypes.c_float],
+    "chafa_canvas_config_set_preprocessing_enabled":  [ctypes.c_bool],
+    "chafa_canvas_config_set_fg_only_enabled":        [ctypes.c_bool],
+    "chafa_canvas_config_set_optimizations":          [ctypes.c_uint],
+    "chafa_canvas_config_set_work_factor":            [ctypes.c_float],
+    "chafa_canvas_config_set_transparency_threshold": [ctypes.c_float],
+    "chafa_canvas_config_set_fg_color":               [ctypes.c_uint32],
+    "chafa_canvas_config_set_bg_color":               [ctypes.c_uint32],
+}
+
+# Getters for the current values of paired settings, 
+# for when only one of the pair is given
+_PAIR_GETTERS = {
+    "chafa_canvas_config_set_geometry":          "get_geometry",
+    "chafa_canvas_config_set_cell_geometry":     "_get_cell_geometry",
+    "chafa_canvas_config_set_dither_grain_size": "_get_dither_grain_size",
+}
+
+# Setters with their prototypes declared, filled in on first use
+_bulk_setters = {}
+
+def _get_bulk_setter(name: str):
+    """
+    Returns the setter called name with its prototype declared.
+    """
+    try:
+        return _bulk_setters[name]
+
+    except KeyError:
+        pass
+
+    setter = getattr(_Chafa, name)
+    setter.argtypes = [ctypes.c_void_p, *_BULK_PROTOTYPES[name]]
+
+    _bulk_setters[name] = setter
+
+    return setter
+
+
+class CanvasConfigSnapshot(NamedTuple):
+    """
+    An immutable copy of everything in a :py:class:`CanvasConfig`. 
+    Symbol maps are described by the operations that built them, 
+    None meaning chafa's default map.
+    """
+    width:                  int
+    height:                 int
+    cell_width:             int
+    cell_height:            int
+    pixel_mode:             PixelMode
+    canvas_mode:            CanvasMode
+    color_extractor:        ColorExtractor
+    color_space:            ColorSpace
+    dither_mode:            DitherMode
+    dither_width:           int
+    dither_height:          int
+    dither_intensity:       float
+    preprocessing:          bool
+    optimizations:          Tuple[Optimizations, ...]
+    work_factor:            float
+    transparency_threshold: float
+    fg_only:                bool
+    fg_color:               Tuple[int, int, int]
+    bg_color:               Tuple[int, int, int]
+    passthrough:            Passthrough
+    symbol_map:             Optional[tuple]
+    fill_symbol_map:        Optional[tuple]
+
+    @property
+    def digest(self) -> str:
+        """
+        :type: str
+
+        A hex digest of the snapshot that stays the 
+        same across processes and python versions.
+        """
+        data = json.dumps(self, separators=(",", ":"))
+
+        return hashlib.sha256(data.encode()).hexdigest()
+
+
+def _symbol_map_ops(symbol_map: ReadOnlySymbolMap) -> tuple:
+    """
+    The canonical operations that built symbol_map. Maps that weren't 
+    built from scratch get a unique marker instead, so they never 
+    compare equal to another map.
+    """
+    canonical = symbol_map.canonical
+
+    if canonical is None:
+        return (("opaque", os.urandom(16).hex()),)
+
+    return canonical
+
+
 class ReadOnlyCanvasConfig:
     def __init__(self):
         # Init config
         _Chafa.chafa_canvas_config_new.restype = ctypes.c_void_p
         self._canvas_config = _Chafa.chafa_canvas_config_new()
 
+        # How the symbol maps were built, None for chafa's defaults
+        self._symbol_map_ops      = None
+        self._fill_symbol_map_ops = None
+
+
+    def snapshot(self) -> CanvasConfigSnapshot:
+        """
+        Returns an immutable, hashable and picklable copy of the 
+        config's settings, including its symbol maps. 
+        Use :py:meth:`CanvasConfig.from_snapshot` to turn it back 
+        into a :py:class:`CanvasConfig`.
+
+        :rtype: CanvasConfigSnapshot
+        """
+
+        width, height               = self.get_geometry()
+        cell_width, cell_height     = self._get_cell_geometry()
+        dither_width, dither_height = self._get_dither_grain_size()
+
+        return CanvasConfigSnapshot(
+            width                  = width,
+            height                 = height,
+            cell_width             = cell_width,
+            cell_height            = cell_height,
+            pixel_mode             = self.pixel_mode,
+            canvas_mode            = self.canvas_mode,
+            color_extractor        = self.color_extractor,
+            color_space            = self.color_space,
+            dither_mode            = self.dither_mode,
+            dither_width           = dither_width,
+            dither_height          = dither_height,
+            dither_intensity       = self.dither_intensity,
+            preprocessing          = self.preprocessing,
+            optimizations          = self.optimizations,
+            work_factor            = self.work_factor,
+            transparency_threshold = self.transparency_threshold,
+            fg_only                = self.fg_only,
+            fg_color               = self.fg_color,
+            bg_color               = self.bg_color,
+            passthrough            = self.passthrough,
+            symbol_map             = self._symbol_map_ops,
+            fill_symbol_map        = self._fill_symbol_map_ops
+        )
+
 
     # === Width & Height property ===
 
@@ -691,21 +983,146 @@ class ReadOnlyCanvasConfig:
         symbol_map = ReadOnlySymbolMap()
         symbol_map._symbol_map = new_pointer
 
+        if self._symbol_map_ops is None:
+            symbol_map._ops = None
+
+        else:
+            symbol_map._ops = list(self._symbol_map_ops)
+
         return symbol_map
 
 
 
 class CanvasConfig(ReadOnlyCanvasConfig):
+    def __init__(self, **settings):
+        """
+        :param settings: Initial values for the config's properties, 
+        e.g. ``CanvasConfig(width=40, height=20)``.
+
+        :raises TypeError: if a setting is unknown
+        """
+        super().__init__()
+
+        if settings:
+            self._apply(settings)
+
+
+    @staticmethod
+    def from_dict(settings: Mapping) -> CanvasConfig:
+        """
+        Builds a new :py:class:`CanvasConfig` from a mapping of 
+        property names to values. Enums may also be given by name, 
+        e.g. ``"CHAFA_CANVAS_MODE_TRUECOLOR"``. ``symbol_map`` and 
+        ``fill_symbol_map`` take a :py:class:`SymbolMap`.
+
+        All values are validated before any of them are applied.
+
+        :param Mapping settings: The settings to apply.
+
+        :raises TypeError: if a setting is unknown
+
+        :rtype: CanvasConfig
+        """
+
+        config = CanvasConfig()
+        config._apply(settings)
+
+        return config
+
+
+    @staticmethod
+    def from_preset(name: str, **changes) -> CanvasConfig:
+        """
+        Builds a new :py:class:`CanvasConfig` from one of the named 
+        presets, ``"fastest"``, ``"balanced"`` or ``"quality"``, 
+        with some settings changed.
+
+        :param str name: The name of the preset.
+        :param changes: The settings to change, like :py:meth:`from_dict`.
+
+        :raises ValueError: if there is no preset called name
+        :raises TypeError: if a setting is unknown
+
+        :rtype: CanvasConfig
+        """
+
+        try:
+            preset = _PRESETS[name]
+
+        except (KeyError, TypeError):
+            raise ValueError(f"Unknown preset {name!r}, expected one of {', '.join(_PRESETS)}") from None
+
+        return CanvasConfig.from_dict({**preset, **changes})
+
+
+    def copy_with(self, **changes) -> CanvasConfig:
+        """
+        Returns a copy of this config with some settings changed.
+
+        :param changes: The settings to change, like :py:meth:`from_dict`.
+
+        :raises TypeError: if a setting is unknown
+
+        :rtype: CanvasConfig
+        """
+
+        config = self.copy()
+        config._apply(changes)
+
+        return config
+
+
+    def _apply(self, settings: Mapping):
+        """
+        Validates all settings, then applies them 
+        with one call to chafa per setter.
+        """
+
+        symbol_maps = {}
+        calls       = {}
+
+        for name, value in settings.items():
+            if name in ("symbol_map", "fill_symbol_map"):
+                if not isinstance(value, SymbolMap):
+                    raise TypeError(f"{name} must be a SymbolMap, not {type(value)}")
+
+                symbol_maps[name] = value
+                continue
+
+            try:
+                convert, setter, position = _BULK_SETTINGS[name]
+
+            except KeyError:
+                raise TypeError(f"Unknown CanvasConfig setting {name!r}")
+
+            args = calls.setdefault(setter, [None] * len(_BULK_PROTOTYPES[setter]))
+            args[position] = convert(value)
+
+        # Everything checks out, apply
+        for setter, args in calls.items():
+            if None in args:
+                current = getattr(self, _PAIR_GETTERS[setter])()
+                args    = [old if new is None else new for new, old in zip(args, current)]
+
+            _get_bulk_setter(setter)(self._canvas_config, *args)
+
+        if "symbol_map" in symbol_maps:
+            self.set_symbol_map(symbol_maps["symbol_map"])
+
+        if "fill_symbol_map" in symbol_maps:
+            self.set_fill_symbol_map(symbol_maps["fill_symbol_map"])
+
+
     # === Width & Height property ===
     @ReadOnlyCanvasConfig.height.setter
     def height(self, value: int):
-        value = int(value)
+        value = _convert("height", value)
 
         self._set_geometry(self.width, value)
 
     @ReadOnlyCanvasConfig.width.setter
     def width(self, value: int):
-        value = int(value)
+        value = _convert("width", value)
 
         self._set_geometry(value, self.height)
 
@@ -713,7 +1130,7 @@ class CanvasConfig(ReadOnlyCanvasConfig):
     # === pixel mode property ===
     @ReadOnlyCanvasConfig.pixel_mode.setter
     def pixel_mode(self, mode: PixelMode):
-        mode = PixelMode(mode)
+        mode = _convert("pixel_mode", mode)
 
         self._set_pixel_mode(mode)
 
@@ -722,7 +1139,7 @@ class CanvasConfig(ReadOnlyCanvasConfig):
 
     @ReadOnlyCanvasConfig.color_extractor.setter
     def color_extractor(self, extractor: ColorExtractor):
-        extractor = ColorExtractor(extractor)
+        extractor = _convert("color_extractor", extractor)
 
         self._set_color_extractor(extractor)
 
@@ -731,7 +1148,7 @@ class CanvasConfig(ReadOnlyCanvasConfig):
 
     @ReadOnlyCanvasConfig.color_space.setter
     def color_space(self, space: ColorSpace):
-        space = ColorSpace(space)
+        space = _convert("color_space", space)
 
         self._set_color_space(space)
 
@@ -740,7 +1157,7 @@ class CanvasConfig(ReadOnlyCanvasConfig):
 
     @ReadOnlyCanvasConfig.canvas_mode.setter
     def canvas_mode(self, mode: CanvasMode):
-        mode = CanvasMode(mode)
+        mode = _convert("canvas_mode", mode)
 
         self._set_canvas_mode(mode)
 
@@ -749,10 +1166,7 @@ class CanvasConfig(ReadOnlyCanvasConfig):
 
     @ReadOnlyCanvasConfig.preprocessing.setter
     def preprocessing(self, preproc: bool):
-        if preproc is None:
-            raise TypeError("preprocessing must not be None")
-
-        preproc = bool(preproc)
+        preproc = _convert("preprocessing", preproc)
 
         self._set_preprocessing_enabled(preproc)
     
@@ -761,14 +1175,14 @@ class CanvasConfig(ReadOnlyCanvasConfig):
     
     @ReadOnlyCanvasConfig.dither_width.setter
     def dither_width(self, width: int):
-        width = int(width)
+        width = _convert("dither_width", width)
 
         self._set_dither_grain_size(width, self.dither_height)
 
     
     @ReadOnlyCanvasConfig.dither_height.setter
     def dither_height(self, height: int):
-        height = int(height)
+        height = _convert("dither_height", height)
 
         self._set_dither_grain_size(self.dither_width, height)
 
@@ -777,7 +1191,7 @@ class CanvasConfig(ReadOnlyCanvasConfig):
     
     @ReadOnlyCanvasConfig.dither_mode.setter
     def dither_mode(self, mode: DitherMode):
-        mode = DitherMode(mode)
+        mode = _convert("dither_mode", mode)
 
         self._set_dither_mode(mode)
 
@@ -786,10 +1200,7 @@ class CanvasConfig(ReadOnlyCanvasConfig):
 
     @ReadOnlyCanvasConfig.dither_intensity.setter
     def dither_intensity(self, intensity: float):
-        intensity = float(intensity)
-
-        if intensity < 0:
-            raise ValueError("Dither intensity must be positive.")
+        intensity = _convert("dither_intensity", intensity)
 
         self._set_dither_intensity(intensity)
     
@@ -798,18 +1209,7 @@ class CanvasConfig(ReadOnlyCanvasConfig):
 
     @ReadOnlyCanvasConfig.optimizations.setter
     def optimizations(self, optimizations: Tuple):
-        # Convert optimizations to proper type to
-        # raise appropriate errors
-        if not isinstance(optimizations, Iterable):
-            raise TypeError(f"optimizations must be iterable, not {type(optimizations)}")
-
-        # Or all optimizations together
-        compounded = 0
-        for flag in optimizations:
-            # Convert flag to Optimizations to get error if invalid
-            flag = Optimizations(flag)
-
-            compounded |= flag
+        compounded = _convert("optimizations", optimizations)
 
         self._set_optimizations(compounded)
 
@@ -818,14 +1218,14 @@ class CanvasConfig(ReadOnlyCanvasConfig):
     
     @ReadOnlyCanvasConfig.cell_width.setter
     def cell_width(self, width: int):
-        width = int(width)
+        width = _convert("cell_width", width)
 
         self._set_cell_geometry(width, self.cell_height)
 
     
     @ReadOnlyCanvasConfig.cell_height.setter
     def cell_height(self, height: int):
-        height = int(height)
+        height = _convert("cell_height", height)
 
         self._set_cell_geometry(self.cell_width, height)
 
@@ -834,10 +1234,7 @@ class CanvasConfig(ReadOnlyCanvasConfig):
     
     @ReadOnlyCanvasConfig.transparency_threshold.setter
     def transparency_threshold(self, threshold: float):
-        threshold = float(threshold)
-
-        if 1 < threshold or threshold < 0:
-            raise ValueError("Transparency threshold must be in range [0,1]")
+        threshold = _convert("transparency_threshold", threshold)
 
         self._set_transparency_threshold(threshold)
 
@@ -846,10 +1243,7 @@ class CanvasConfig(ReadOnlyCanvasConfig):
 
     @ReadOnlyCanvasConfig.work_factor.setter
     def work_factor(self, factor: float):
-        factor = float(factor)
-
-        if 1 < factor or factor < 0:
-            raise ValueError("Work factor must be in range [0,1]")
+        factor = _convert("work_factor", factor)
 
         self._set_work_factor(factor)
         
@@ -858,10 +1252,7 @@ class CanvasConfig(ReadOnlyCanvasConfig):
 
     @ReadOnlyCanvasConfig.fg_only.setter
     def fg_only(self, fg_only: bool):
-        if fg_only is None:
-            raise TypeError("fg_only must not be None")
-
-        fg_only = bool(fg_only)
+        fg_only = _convert("fg_only", fg_only)
 
         self._set_fg_only_enabled(fg_only)
         
@@ -870,41 +1261,21 @@ class CanvasConfig(ReadOnlyCanvasConfig):
 
     @ReadOnlyCanvasConfig.fg_color.setter
     def fg_color(self, fg_color: Tuple[int, int, int]):
-
-        if isinstance(fg_color, str):
-            raise TypeError(f"fg_color must not be a string")
-
-        if not isinstance(fg_color, Iterable):
-            raise TypeError(f"fg_color must be iterable, not {type(fg_color)}")
-
-        if len(fg_color) != 3:
-            raise ValueError("fg_color must have exactly 3 values")
-
-        color  = tuple_to_packed_8bit(fg_color)
+        color = _convert("fg_color", fg_color)
 
         self._set_fg_color(color)
 
 
     @ReadOnlyCanvasConfig.bg_color.setter
     def bg_color(self, bg_color: Tuple[int, int, int]):
-
-        if isinstance(bg_color, str):
-            raise TypeError(f"bg_color must not be a string")
-
-        if not isinstance(bg_color, Iterable):
-            raise TypeError(f"bg_color must be iterable, not {type(bg_color)}")
-
-        if len(bg_color) != 3:
-            raise ValueError("bg_color must have exactly 3 values")
-
-        color = tuple_to_packed_8bit(bg_color)
+        color = _convert("bg_color", bg_color)
 
         self._set_bg_color(color)
 
     
     @ReadOnlyCanvasConfig.passthrough.setter
     def passthrough(self, through: Passthrough):
-        through = Passthrough(through)
+        through = _convert("passthrough", through)
 
         self._set_passthrough(through)
 
@@ -932,9 +1303,36 @@ class CanvasConfig(ReadOnlyCanvasConfig):
 
         new_config._canvas_config = config_copy
 
+        new_config._symbol_map_ops      = self._symbol_map_ops
+        new_config._fill_symbol_map_ops = self._fill_symbol_map_ops
+
         return new_config
 
 
+    @staticmethod
+    def from_snapshot(snapshot: CanvasConfigSnapshot) -> CanvasConfig:
+        """
+        Builds a new :py:class:`CanvasConfig` from a snapshot made 
+        by :py:meth:`snapshot`.
+
+        :param CanvasConfigSnapshot snapshot: The snapshot to restore.
+
+        :raises ValueError: if a symbol map in the snapshot can't be rebuilt
+
+        :rtype: CanvasConfig
+        """
+
+        settings = CanvasConfigSnapshot(*snapshot)._asdict()
+
+        for name in ("symbol_map", "fill_symbol_map"):
+            ops = settings.pop(name)
+
+            if ops is not None:
+                settings[name] = SymbolMap._from_ops(ops)
+
+        return CanvasConfig.from_dict(settings)
+
+
     def _set_geometry(self, width: int, height: int):
         """
         Wrapper for chafa_canvas_config_set_geometry
@@ -1231,6 +1629,8 @@ class CanvasConfig(ReadOnlyCanvasConfig):
 
         _Chafa.chafa_canvas_config_set_symbol_map(self._canvas_config, symbol_map._symbol_map)
 
+        self._symbol_map_ops = _symbol_map_ops(symbol_map)
+
 
     def set_fill_symbol_map(self, fill_symbol_map: SymbolMap):
         """
@@ -1253,6 +1653,8 @@ class CanvasConfig(ReadOnlyCanvasConfig):
 
         _Chafa.chafa_canvas_config_set_fill_symbol_map(self._canvas_config, fill_symbol_map._symbol_map)
 
+        self._fill_symbol_map_ops = _symbol_map_ops(fill_symbol_map)
+
     def calc_canvas_geometry(self, src_width: int, src_height: int, font_ratio: float, zoom: bool=False, stretch: bool=False):
         """
         Calculates an optimal geometry for a :py:class:`Canvas` given 
@@ -1269,51 +1671,14 @@ class CanvasConfig(ReadOnlyCanvasConfig):
         :raises ValueError: if src_width or src_height are <= 0
         """
 
-        src_width  = int(src_width)
-        src_height = int(src_height)
-
-        font_ratio = float(font_ratio)
-
-        if zoom is None:
-            raise TypeError("zoom must not be None")
-
-        if stretch is None:
-            raise TypeError("stretch must not be None")
-
-        zoom       = bool(zoom)
-        stretch    = bool(stretch)
+        font_ratio, zoom, stretch = _check_geometry_args(font_ratio, zoom, stretch)
+        src_width, src_height     = _check_source_size(src_width, src_height)
 
-
-        if src_width <= 0:
-            raise ValueError("src_width must be greater than 0")
-
-        if src_height <= 0:
-            raise ValueError("src_height must be greater than 0")
-
-        if font_ratio <= 0:
-            raise ValueError("font_ratio must be greater than 0")
-
-        _Chafa.chafa_calc_canvas_geometry.argtypes = [
-            ctypes.c_uint,
-            ctypes.c_uint,
-            ctypes.POINTER(ctypes.c_uint),
-            ctypes.POINTER(ctypes.c_uint),
-            ctypes.c_float,
-            ctypes.c_bool,
-            ctypes.c_bool
-        ]
-
-        new_width  = ctypes.pointer(ctypes.c_uint(self.width))
-        new_height = ctypes.pointer(ctypes.c_uint(self.height))
-        
-        _Chafa.chafa_calc_canvas_geometry(
+        self.width, self.height = _calc_canvas_geometry(
             src_width, src_height,
-            new_width, new_height,
+            self.width, self.height,
             font_ratio,
             zoom,
             stretch
         )
 
-        self.width  = new_width. contents.value
-        self.height = new_height.contents.value
-
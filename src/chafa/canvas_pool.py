@@ -0,0 +1,212 @@
+from __future__ import annotations
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Union
+
+from .canvas import Canvas
+from .canvas_config import ReadOnlyCanvasConfig, CanvasConfig, CanvasConfigSnapshot
+
+
+class CanvasPool:
+    """
+    Reuses :py:class:`Canvas` objects for configs that are used 
+    over and over, instead of allocating a new canvas and setting 
+    up its symbol maps every time. Canvases are kept per 
+    :py:class:`CanvasConfigSnapshot`. The pool is thread safe.
+
+    :param int max_idle: How many unused canvases to keep per config.
+    :param int max_keys: How many configs to keep canvases for. The 
+        canvases of the least recently used config are freed beyond that.
+
+    :raises ValueError: if max_idle is negative or max_keys is less than 1
+    """
+
+    def __init__(self, max_idle: int=4, max_keys: int=64):
+        max_idle = int(max_idle)
+        max_keys = int(max_keys)
+
+        if max_idle < 0:
+            raise ValueError("max_idle must not be negative")
+
+        if max_keys < 1:
+            raise ValueError("max_keys must be at least 1")
+
+        self._max_idle = max_idle
+        self._max_keys = max_keys
+        self._lock     = threading.Lock()
+
+        # One canvas per config that is never handed out,
+        # new canvases are made similar to it. Least recently
+        # used first, idle only has keys that are in here
+        self._prototypes: OrderedDict[CanvasConfigSnapshot, Canvas] = OrderedDict()
+        self._idle: Dict[CanvasConfigSnapshot, List[Canvas]] = {}
+
+        # Canvases that are checked out, by id, with their key
+        self._checked_out = {}
+
+
+    @property
+    def max_idle(self) -> int:
+        """
+        :type: int
+
+        How many unused canvases are kept per config.
+        """
+        return self._max_idle
+
+
+    @property
+    def max_keys(self) -> int:
+        """
+        :type: int
+
+        How many configs canvases are kept for.
+        """
+        return self._max_keys
+
+
+    def config_count(self) -> int:
+        """
+        Returns how many configs canvases are kept for.
+
+        :rtype: int
+        """
+        with self._lock:
+            return len(self._prototypes)
+
+
+    def idle_count(self, config: Union[ReadOnlyCanvasConfig, CanvasConfigSnapshot, None]=None) -> int:
+        """
+        Returns how many unused canvases are kept for config, 
+        or for all configs if config is None.
+
+        :rtype: int
+        """
+        with self._lock:
+            if config is None:
+                return sum(len(idle) for idle in self._idle.values())
+
+            return len(self._idle.get(self._key(config), ()))
+
+
+    @staticmethod
+    def _key(config: Union[ReadOnlyCanvasConfig, CanvasConfigSnapshot]) -> CanvasConfigSnapshot:
+        if isinstance(config, CanvasConfigSnapshot):
+            return config
+
+        if isinstance(config, ReadOnlyCanvasConfig):
+            return config.snapshot()
+
+        raise TypeError(f"config must be of type CanvasConfig or CanvasConfigSnapshot, not {type(config)}")
+
+
+    def acquire(self, config: Union[CanvasConfig, CanvasConfigSnapshot]) -> Canvas:
+        """
+        Returns a canvas for config, reusing an idle one if there is 
+        one. Reused canvases still hold what was last drawn on them. 
+        Hand it back with :py:meth:`release` when done.
+
+        :param config: The config the canvas should have. Passing a 
+            snapshot saves taking one on every call.
+        :type config: CanvasConfig | CanvasConfigSnapshot
+
+        :rtype: Canvas
+
+        :raises TypeError: if config is not a :py:class:`CanvasConfig` or :py:class:`CanvasConfigSnapshot`
+        """
+        key = self._key(config)
+
+        with self._lock:
+            idle      = self._idle.get(key)
+            canvas    = idle.pop() if idle else None
+            prototype = self._prototypes.get(key)
+
+            if prototype is not None:
+                self._prototypes.move_to_end(key)
+
+        if canvas is None:
+            if prototype is None:
+                # Canvas only takes a CanvasConfig
+                if not isinstance(config, CanvasConfig):
+                    config = CanvasConfig.from_snapshot(key)
+
+                prototype = Canvas(config)
+
+                with self._lock:
+                    prototype = self._prototypes.setdefault(key, prototype)
+                    self._prototypes.move_to_end(key)
+                    self._evict()
+
+            # Copies the config natively, symbol maps and all
+            canvas = prototype.new_similar()
+
+        with self._lock:
+            self._checked_out[id(canvas)] = (key, canvas)
+
+        return canvas
+
+
+    def release(self, canvas: Canvas):
+        """
+        Hands a canvas from :py:meth:`acquire` back to the pool. 
+        It is freed if there are already :py:attr:`max_idle` 
+        unused canvases for its config or the config was evicted.
+
+        :raises ValueError: if canvas was not acquired from this pool
+        """
+        with self._lock:
+            try:
+                key, _ = self._checked_out.pop(id(canvas))
+
+            except KeyError:
+                raise ValueError("canvas was not acquired from this pool") from None
+
+            # Its config was evicted or cleared, let it go
+            if key not in self._prototypes:
+                return
+
+            idle = self._idle.setdefault(key, [])
+
+            if len(idle) < self._max_idle:
+                idle.append(canvas)
+
+
+    def _evict(self):
+        """
+        Frees the canvases of the least recently used configs 
+        beyond max_keys. Must be called with the lock held.
+        """
+        while len(self._prototypes) > self._max_keys:
+            key, _ = self._prototypes.popitem(last=False)
+            self._idle.pop(key, None)
+
+
+    @contextmanager
+    def checkout(self, config: Union[CanvasConfig, CanvasConfigSnapshot]) -> Iterator[Canvas]:
+        """
+        Acquires a canvas for config for the duration of 
+        a ``with`` block and releases it afterwards.
+
+        :param config: The config the canvas should have.
+        :type config: CanvasConfig | CanvasConfigSnapshot
+
+        :rtype: Canvas
+        """
+        canvas = self.acquire(config)
+
+        try:
+            yield canvas
+
+        finally:
+            self.release(canvas)
+
+
+    def clear(self):
+        """
+        Frees every unused canvas. Canvases that are checked out 
+        can still be released afterwards.
+        """
+        with self._lock:
+            self._idle.clear()
+            self._prototypes.clear()
@@ -1,68 +1,268 @@
 from __future__ import annotations
+import os
+import re
+import asyncio
 import sys
+import time
 import platform
 from io import UnsupportedOperation
+from typing import NamedTuple, Tuple
 
 SYSTEM = platform.system()
 
 if SYSTEM == "Linux" or SYSTEM == "Darwin":
     import termios
+    import select
 
-def _read_escape_sequence(escape_code, terminator, sep=";"):
+#: How long to wait for the terminal to reply to a query, in seconds
+DEFAULT_TIMEOUT = 1.0
+
+# Queries we know how to send
+_DEVICE_ATTRIBUTES_QUERY = "\033[c"
+_PIXEL_GEOMETRY_QUERY    = "\033[14t"
+_TERMINAL_GEOMETRY_QUERY = "\033[18t"
+
+# And the replies we expect for them
+_DEVICE_ATTRIBUTES_REPLY = re.compile(rb"\033\[\?([\d;]*)c")
+_PIXEL_GEOMETRY_REPLY    = re.compile(rb"\033\[4;(\d+);(\d+)t")
+_TERMINAL_GEOMETRY_REPLY = re.compile(rb"\033\[8;(\d+);(\d+)t")
+
+
+class TerminalQueryResult(NamedTuple):
+    """
+    The terminal's replies to a batch of queries. Queries 
+    the terminal did not reply to are empty tuples.
+    """
+
+    #: The terminal's device attributes
+    device_attributes: Tuple[int, ...] = ()
+
+    #: The size of the terminal in character cells, ``(height, width)``
+    terminal_geometry: Tuple[int, ...] = ()
+
+    #: The size of the terminal in pixels, ``(height, width)``
+    pixel_geometry: Tuple[int, ...] = ()
+
+    @property
+    def cell_geometry(self) -> Tuple[int, ...]:
+        """
+        The size of a character cell in pixels, ``(height, width)``.
+        """
+        if len(self.pixel_geometry) != 2 or len(self.terminal_geometry) != 2:
+            return tuple()
+
+        pixel_height, pixel_width = self.pixel_geometry
+        character_height, character_width = self.terminal_geometry
+
+        if character_height == 0 or character_width == 0:
+            return tuple()
+
+        return (pixel_height//character_height, pixel_width//character_width)
+
+
+def _get_tty_fileno():
+    """
+    Returns the file descriptor of stdin if it is a 
+    terminal we can query, None otherwise.
+    """
     if SYSTEM != "Linux" and SYSTEM != "Darwin":
-        return tuple()
+        return None
 
     try:
         stdin_fileno = sys.stdin.fileno()
 
-    except UnsupportedOperation:
-        return tuple()
+    except (UnsupportedOperation, AttributeError, ValueError):
+        return None
+
+    if not os.isatty(stdin_fileno):
+        return None
+
+    return stdin_fileno
+
+
+def _query_mode(stdin_fileno):
+    """
+    Returns the terminal attributes for reading query replies; 
+    non-canonical mode without echo.
+    """
+    new_term = termios.tcgetattr(stdin_fileno)
+
+    new_term[3] &= ~(termios.ICANON | termios.ECHO)
+
+    # Reads return whatever is available right away
+    new_term[6][termios.VMIN]  = 0
+    new_term[6][termios.VTIME] = 0
+
+    return new_term
+
+
+def _query_terminal(queries, timeout: float) -> bytes:
+    """
+    Sends queries to the terminal in one go, followed by a device 
+    attributes query, and returns the raw replies. Every terminal 
+    replies to the device attributes query and replies come in order, 
+    so once its reply arrives there is nothing more to wait for.
+
+    Gives up after timeout seconds and returns whatever was read.
+    """
+    stdin_fileno = _get_tty_fileno()
+
+    if stdin_fileno is None:
+        return b""
 
     # Set up
     old_term = termios.tcgetattr(stdin_fileno)
-    new_term = termios.tcgetattr(stdin_fileno)
+    new_term = _query_mode(stdin_fileno)
+
+    replies = b""
+
+    try:
+        termios.tcsetattr(stdin_fileno, termios.TCSANOW, new_term)
+
+        # Emit the queries
+        sys.stdout.write("".join(queries) + _DEVICE_ATTRIBUTES_QUERY)
+        sys.stdout.flush()
+
+        deadline = time.monotonic() + timeout
 
-    # disable canonical mode and disable echo input
-    new_lflags  = ~(termios.ICANON | termios.ECHO) 
-    new_term[3] = new_lflags
+        # Read the replies in bulk until the device attributes show up
+        while not _DEVICE_ATTRIBUTES_REPLY.search(replies):
+            remaining = deadline - time.monotonic()
 
-    # Emit sequence
-    sys.stdout.write(escape_code)
-    sys.stdout.flush()
-    
-    termios.tcsetattr(stdin_fileno, termios.TCSANOW, new_term)
+            if remaining <= 0:
+                break
 
-    # Read the sequence
-    char = sys.stdin.read(1)
-    attributes = []
+            ready, _, _ = select.select([stdin_fileno], [], [], remaining)
 
-    while char != terminator:
-        attributes.append(char)
-        char = sys.stdin.read(1)
+            if not ready:
+                break
 
-    # Set terminal back to normal
-    termios.tcsetattr(stdin_fileno, termios.TCSANOW, old_term)
+            chunk = os.read(stdin_fileno, 1024)
 
-    # Split attributes by ; and turn them into integers
-    if len(attributes) >= 4:
-        attributes = "".join(attributes[3:]).split(sep)
+            if not chunk:
+                break
 
+            replies += chunk
+
+    finally:
+        # Set terminal back to normal
+        termios.tcsetattr(stdin_fileno, termios.TCSANOW, old_term)
+
+    return replies
+
+
+def _parse_replies(replies: bytes) -> TerminalQueryResult:
+    """
+    Picks the replies we know about out of the bytes read from the terminal.
+    """
+    device_attributes = _DEVICE_ATTRIBUTES_REPLY.search(replies)
+    pixel_geometry    = _PIXEL_GEOMETRY_REPLY.search(replies)
+    terminal_geometry = _TERMINAL_GEOMETRY_REPLY.search(replies)
+
+    result = {}
+
+    if device_attributes:
         # Convert all attributes to ints unless we can't, then we skip
-        out = []
-        for attrib in attributes:
-            try:
-                out.append(int(attrib))
-            except ValueError:
-                continue
+        result["device_attributes"] = tuple(
+            int(attrib) for attrib in device_attributes.group(1).split(b";") if attrib
+        )
+
+    if pixel_geometry:
+        result["pixel_geometry"] = tuple(map(int, pixel_geometry.groups()))
+
+    if terminal_geometry:
+        result["terminal_geometry"] = tuple(map(int, terminal_geometry.groups()))
+
+    return TerminalQueryResult(**result)
+
+
+def query_terminal(timeout: float=DEFAULT_TIMEOUT) -> TerminalQueryResult:
+    """
+    Queries the terminal for its device attributes, its size in 
+    character cells and its size in pixels in a single round trip.
+
+    .. note::
+        Returns an empty result on Windows or if stdin is not a terminal.
 
-        out = tuple(out)
+    :param float timeout: How long to wait for the terminal to reply, in seconds.
 
-    else:
-        out = tuple()
+    :rtype: TerminalQueryResult
+    """
+    replies = _query_terminal(
+        [_PIXEL_GEOMETRY_QUERY, _TERMINAL_GEOMETRY_QUERY], 
+        timeout
+    )
+
+    return _parse_replies(replies)
 
-    return out
 
-def get_device_attributes():
+async def probe_terminal(timeout: float=DEFAULT_TIMEOUT) -> TerminalQueryResult:
+    """
+    Like :py:func:`query_terminal`, but reads the replies through the 
+    running event loop instead of blocking it.
+
+    .. note::
+        Returns an empty result on Windows or if stdin is not a terminal.
+
+    :param float timeout: How long to wait for the terminal to reply, in seconds.
+
+    :rtype: TerminalQueryResult
+    """
+    stdin_fileno = _get_tty_fileno()
+
+    if stdin_fileno is None:
+        return TerminalQueryResult()
+
+    loop    = asyncio.get_running_loop()
+    done    = loop.create_future()
+    replies = bytearray()
+
+    def on_readable():
+        try:
+            replies.extend(os.read(stdin_fileno, 1024))
+
+        except OSError as err:
+            if not done.done():
+                done.set_exception(err)
+
+            return
+
+        if _DEVICE_ATTRIBUTES_REPLY.search(replies) and not done.done():
+            done.set_result(None)
+
+    # Set up
+    old_term = termios.tcgetattr(stdin_fileno)
+    new_term = _query_mode(stdin_fileno)
+
+    try:
+        termios.tcsetattr(stdin_fileno, termios.TCSANOW, new_term)
+        loop.add_reader(stdin_fileno, on_readable)
+
+        try:
+            # Emit the queries
+            sys.stdout.write(
+                _PIXEL_GEOMETRY_QUERY 
+                + _TERMINAL_GEOMETRY_QUERY 
+                + _DEVICE_ATTRIBUTES_QUERY
+            )
+            sys.stdout.flush()
+
+            await asyncio.wait_for(done, timeout)
+
+        except asyncio.TimeoutError:
+            pass
+
+        finally:
+            loop.remove_reader(stdin_fileno)
+
+    finally:
+        # Set terminal back to normal
+        termios.tcsetattr(stdin_fileno, termios.TCSANOW, old_term)
+
+    return _parse_replies(bytes(replies))
+
+
+def get_device_attributes(timeout: float=DEFAULT_TIMEOUT):
     """
     A function that returns an array containing the current
     terminal's device attributes, fetched by reading the string
@@ -73,13 +273,15 @@ def get_device_attributes():
     .. note::
         Returns an empty tuple on Windows
 
+    :param float timeout: How long to wait for the terminal to reply, in seconds.
+
     :rtype: Tuple[int]
     """
 
-    return _read_escape_sequence("\033[c", "c")
+    return _parse_replies(_query_terminal([], timeout)).device_attributes
 
 
-def get_terminal_geometry():
+def get_terminal_geometry(timeout: float=DEFAULT_TIMEOUT):
     """
     A function that returns the size of the terminal text area in character cells. 
     Format: ``(height, width)``.
@@ -87,12 +289,16 @@ def get_terminal_geometry():
     .. note::
         Returns an empty tuple on Windows
 
+    :param float timeout: How long to wait for the terminal to reply, in seconds.
+
     :rtype: Tuple[int]
     """
-    return _read_escape_sequence("\033[18t", "t")
+    replies = _query_terminal([_TERMINAL_GEOMETRY_QUERY], timeout)
+
+    return _parse_replies(replies).terminal_geometry
 
 
-def get_terminal_pixel_geometry():
+def get_terminal_pixel_geometry(timeout: float=DEFAULT_TIMEOUT):
     """
     A function that returns the size of the terminal text area in pixels.
     Foramt: ``(height, width)``
@@ -100,13 +306,16 @@ def get_terminal_pixel_geometry():
     .. note::
         Returns an empty tuple on Windows
 
+    :param float timeout: How long to wait for the terminal to reply, in seconds.
+
     :rtype: Tuple[int]
     """
+    replies = _query_terminal([_PIXEL_GEOMETRY_QUERY], timeout)
 
-    return _read_escape_sequence("\033[14t", "t")
+    return _parse_replies(replies).pixel_geometry
 
 
-def get_cell_geometry():
+def get_cell_geometry(timeout: float=DEFAULT_TIMEOUT):
     """
     A function that returns the cell geometry of the terminal in pixels. This is achieved by simply
     dividing the terminal's reported pixel size by its reported size in characters.
@@ -115,9 +324,9 @@ def get_cell_geometry():
     .. note::
         Returns an empty tuple on Windows
 
+    :param float timeout: How long to wait for the terminal to reply, in seconds.
+
     :rtype: Tuple[int]
     """
-    pixel_height, pixel_width = get_terminal_pixel_geometry()
-    character_height, character_width = get_terminal_geometry()
 
-    return (pixel_height//character_height, pixel_width//character_width)
\ No newline at end of file
+    return query_terminal(timeout).cell_geometry
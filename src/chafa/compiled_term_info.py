@@ -0,0 +1,201 @@
+from __future__ import annotations
+import re
+import ctypes
+from typing import Iterable, Tuple
+
+from .enums import TermSeq
+from .term_info import TermInfo, _EMIT_ARGTYPES
+
+# Distinct values used to find where each argument ends up in a sequence
+_PROBES = {
+    ctypes.c_uint8: (101, 133, 167, 199, 211, 241),
+    ctypes.c_uint:  (4001, 5002, 6003, 7004, 8005),
+}
+
+# Values a learned template has to reproduce before we trust it
+_CHECKS = {
+    ctypes.c_uint8: (0, 1, 7, 8, 9, 10, 15, 16, 99, 100, 231, 232, 254, 255),
+    ctypes.c_uint:  (0, 1, 9, 10, 99, 100, 999, 1000, 9999, 65535),
+}
+
+# What ctypes keeps of an argument when converting it
+_MASKS = {
+    ctypes.c_uint8: 0xff,
+    ctypes.c_uint:  0xffffffff,
+}
+
+# libchafa clamps formatted arguments to this
+_ARG_MAX = 9999
+
+# How far a formatted argument may be from the one passed,
+# cursor positions are 1-based in the terminal for example
+_MAX_OFFSET = 2
+
+_DIGITS = re.compile(rb"\d+")
+
+
+def _constant_encoder(out: bytes):
+    def encode():
+        return out
+
+    return encode
+
+
+def _table_encoder(table: Tuple[bytes, ...], mask: int):
+    def encode(arg):
+        return table[arg & mask]
+
+    return encode
+
+
+def _template_encoder(seq: TermSeq, template: bytes, slots: Tuple[Tuple[int, int, int], ...], arity: int):
+    def encode(*args):
+        if len(args) != arity:
+            raise TypeError(f"{seq.name} takes {arity} arguments, not {len(args)}")
+
+        return template % tuple(min((args[index] & mask) + offset, _ARG_MAX) for index, offset, mask in slots)
+
+    return encode
+
+
+def _learn_template(term_info: TermInfo, seq: TermSeq, argtypes):
+    """
+    Emits seq with probe arguments and turns the output into a
+    %-format template by replacing every run of digits that is
+    one of the arguments, give or take an offset, with ``%d``.
+    Returns None if the template fails to reproduce libchafa's
+    output for any of the check values.
+    """
+
+    probe = [_PROBES[argtype][index] for index, argtype in enumerate(argtypes)]
+    out   = term_info._emit_uncached(seq, *probe)
+
+    template = b""
+    slots    = []
+    position = 0
+
+    for digits in _DIGITS.finditer(out):
+        value = int(digits.group())
+
+        for index, arg in enumerate(probe):
+            offset = value - arg
+
+            if abs(offset) <= _MAX_OFFSET:
+                break
+
+        else:
+            # Literal digits, part of the sequence itself
+            continue
+
+        template += out[position:digits.start()].replace(b"%", b"%%") + b"%d"
+        position  = digits.end()
+
+        slots.append((index, offset, _MASKS[argtypes[index]]))
+
+    template += out[position:].replace(b"%", b"%%")
+
+    encode = _template_encoder(seq, template, tuple(slots), len(argtypes))
+
+    # Vary one argument at a time while the others keep their probe values
+    for index, argtype in enumerate(argtypes):
+        for value in _CHECKS[argtype]:
+            args = list(probe)
+            args[index] = value
+
+            if encode(*args) != term_info._emit_uncached(seq, *args):
+                return None
+
+    return encode
+
+
+class CompiledTermInfo:
+    """
+    A snapshot of the sequences of a :py:class:`TermInfo`,
+    formatted in Python instead of by libchafa.
+    """
+
+    def __init__(self, term_info: TermInfo):
+        if not isinstance(term_info, TermInfo):
+            raise TypeError(f"term_info must be of type TermInfo, not {type(term_info)}")
+
+        self._term_info = term_info
+        self._encoders  = {}
+
+        for seq in TermSeq:
+            if seq == TermSeq.CHAFA_TERM_SEQ_MAX or not term_info.have_seq(seq):
+                continue
+
+            encoder = self._compile(seq)
+
+            if encoder is not None:
+                self._encoders[seq] = encoder
+
+
+    def _compile(self, seq: TermSeq):
+        """
+        Returns an encoder for seq, or None if it can't be compiled
+        """
+        argtypes = _EMIT_ARGTYPES.get(seq, ())
+
+        if not argtypes:
+            return _constant_encoder(self._term_info._emit_uncached(seq))
+
+        # Small enough to emit every possible value
+        if argtypes == (ctypes.c_uint8,):
+            table = tuple(self._term_info._emit_uncached(seq, value) for value in range(256))
+
+            return _table_encoder(table, _MASKS[ctypes.c_uint8])
+
+        return _learn_template(self._term_info, seq, argtypes)
+
+
+    @property
+    def sequences(self) -> Tuple[TermSeq, ...]:
+        """
+        :type: Tuple[TermSeq, ...]
+
+        The sequences that are formatted in Python.
+        Others are passed on to the :py:class:`TermInfo`.
+        """
+        return tuple(self._encoders)
+
+
+    def emit(self, sequence: TermSeq, *args) -> bytes:
+        """
+        Returns the asked for terminal sequence as bytes,
+        like :py:meth:`TermInfo.emit`.
+
+        :param TermSeq sequence: The sequence to emit
+        :param int *args: The arguments of the sequence
+
+        :rtype: bytes
+        """
+        try:
+            encode = self._encoders[sequence]
+
+        except KeyError:
+            return self._term_info.emit(sequence, *args)
+
+        return encode(*args)
+
+
+    def emit_many(self, sequences: Iterable) -> bytes:
+        """
+        Emits several sequences in one go and returns them joined together,
+        like :py:meth:`TermInfo.emit_many`.
+
+        :param Iterable sequences: The sequences to emit
+
+        :rtype: bytes
+        """
+
+        out = []
+
+        for sequence in sequences:
+            if isinstance(sequence, tuple):
+                out.append(self.emit(*sequence))
+
+            else:
+                out.append(self.emit(sequence))
+
+        return b"".join(out)
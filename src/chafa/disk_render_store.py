@@ -0,0 +1,271 @@
+from __future__ import annotations
+import os
+import re
+import hashlib
+import time
+import tempfile
+import threading
+from pathlib import Path
+from typing import Optional, Union
+
+from . import libraries
+from ._version import __version__
+
+# Keys are hex digests, anything else could escape the directory
+_KEY_PATTERN = re.compile(r"[0-9a-f]{8,128}")
+
+# Evict down to this fraction of max_bytes, so that every put
+# after reaching the budget doesn't have to scan the directory
+_LOW_WATER = 0.9
+
+# Temporary files older than this, in seconds, were left
+# behind by a writer that crashed and are removed on eviction
+_STALE_TMP_AGE = 60 * 60
+
+
+def _library_fingerprint() -> str:
+    """
+    Identifies this version of chafa.py and libchafa. Output rendered
+    by a different libchafa is kept in a different directory.
+    """
+    library = libraries._lib
+
+    try:
+        stat = os.stat(library)
+        library_id = f"{library}:{stat.st_size}:{stat.st_mtime_ns}"
+
+    except (OSError, TypeError):
+        library_id = str(library)
+
+    return hashlib.sha256(f"{__version__}:{library_id}".encode()).hexdigest()[:16]
+
+
+def _default_directory() -> Path:
+    """
+    The renders directory next to the library search cache.
+    """
+    return libraries._library_cache_path().parent / "renders"
+
+
+class DiskRenderStore:
+    """
+    Rendered output stored as one file per key in a directory, 
+    so it survives restarts and can be shared by processes. 
+    Files are written atomically. Once the directory holds more 
+    than max_bytes the least recently used files are removed.
+
+    :param directory: Where to store the output. Defaults to a ``renders`` directory in the chafa.py cache directory.
+    :type directory: str | Path | None
+    :param int max_bytes: How much output to keep on disk, in bytes.
+
+    :raises ValueError: if max_bytes is negative
+    """
+
+    def __init__(self, directory: Union[str, Path, None]=None, max_bytes: int=512 * 1024 * 1024):
+        max_bytes = int(max_bytes)
+
+        if max_bytes < 0:
+            raise ValueError("max_bytes must not be negative")
+
+        if directory is None:
+            directory = _default_directory()
+
+        self._root      = Path(directory)
+        self._directory = self._root / _library_fingerprint()
+        self._max_bytes = max_bytes
+        self._lock      = threading.Lock()
+
+        self._directory.mkdir(parents=True, exist_ok=True)
+
+        # Only counts what this process wrote since the last scan,
+        # other writers are caught by the next scan
+        self._size = self._scan_size()
+
+
+    @property
+    def directory(self) -> Path:
+        """
+        :type: Path
+
+        The directory the output of this version of libchafa is stored in.
+        """
+        return self._directory
+
+
+    @property
+    def max_bytes(self) -> int:
+        """
+        :type: int
+
+        How much output to keep on disk, in bytes.
+        """
+        return self._max_bytes
+
+
+    def _path(self, key: str) -> Path:
+        if not isinstance(key, str) or not _KEY_PATTERN.fullmatch(key):
+            raise ValueError(f"key must be a lowercase hex digest, not {key!r}")
+
+        return self._directory / key[:2] / key
+
+
+    def _entries(self):
+        """
+        Yields (path, size, last use) for every stored file.
+        """
+        for subdirectory in self._directory.iterdir():
+            if not subdirectory.is_dir():
+                continue
+
+            for path in subdirectory.iterdir():
+                # Half written files of other processes
+                if path.suffix == ".tmp":
+                    continue
+
+                try:
+                    stat = path.stat()
+
+                except FileNotFoundError:
+                    continue
+
+                yield path, stat.st_size, stat.st_mtime_ns
+
+
+    def _remove_stale_temp_files(self):
+        """
+        Removes temporary files that crashed writers left behind.
+        """
+        cutoff = time.time() - _STALE_TMP_AGE
+
+        for path in self._directory.glob("*/*.tmp"):
+            try:
+                if path.stat().st_mtime < cutoff:
+                    path.unlink()
+
+            # Finished or removed by another process
+            except FileNotFoundError:
+                pass
+
+
+    def _scan_size(self) -> int:
+        return sum(size for _, size, _ in self._entries())
+
+
+    def get(self, key: str) -> Optional[bytes]:
+        """
+        Returns the output stored under key, or None.
+
+        :rtype: bytes | None
+
+        :raises ValueError: if key is not a hex digest
+        """
+        path = self._path(key)
+
+        try:
+            with open(path, "rb") as file:
+                out = file.read()
+
+        except FileNotFoundError:
+            return None
+
+        # Mark as recently used for eviction
+        try:
+            os.utime(path)
+
+        except OSError:
+            pass
+
+        return out
+
+
+    def put(self, key: str, out: bytes):
+        """
+        Stores out under key. Other processes either see the whole 
+        file or none of it. Output larger than :py:attr:`max_bytes` 
+        is not stored.
+
+        :raises ValueError: if key is not a hex digest
+        """
+        path = self._path(key)
+        out  = bytes(out)
+
+        if len(out) > self._max_bytes:
+            return
+
+        path.parent.mkdir(exist_ok=True)
+
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+
+        try:
+            with os.fdopen(fd, "wb") as file:
+                file.write(out)
+
+            # Overwriting a key replaces its old output
+            try:
+                old_size = path.stat().st_size
+
+            except FileNotFoundError:
+                old_size = 0
+
+            os.replace(tmp_path, path)
+
+        except BaseException:
+            try:
+                os.unlink(tmp_path)
+
+            except OSError:
+                pass
+
+            raise
+
+        with self._lock:
+            self._size += len(out) - old_size
+
+            if self._size > self._max_bytes:
+                self._evict()
+
+
+    def _evict(self):
+        """
+        Removes the least recently used files until the store
+        is below the low water mark.
+        """
+        self._remove_stale_temp_files()
+
+        entries = sorted(self._entries(), key=lambda entry: entry[2])
+        size    = sum(entry[1] for entry in entries)
+        target  = int(self._max_bytes * _LOW_WATER)
+
+        for path, entry_size, _ in entries:
+            if size <= target:
+                break
+
+            try:
+                path.unlink()
+
+            # Another process got there first
+            except FileNotFoundError:
+                pass
+
+            size -= entry_size
+
+        self._size = size
+
+
+    def __contains__(self, key: str) -> bool:
+        return self._path(key).exists()
+
+
+    def clear(self):
+        """
+        Removes all stored output of this version of libchafa.
+        """
+        with self._lock:
+            for path, _, _ in list(self._entries()):
+                try:
+                    path.unlink()
+
+                except FileNotFoundError:
+                    pass
+
+            self._size = 0
@@ -0,0 +1,131 @@
+from __future__ import annotations
+import array
+import ctypes
+from functools import lru_cache
+from typing import Iterable, Tuple
+
+from .libraries import _Chafa
+
+# How many geometries to remember, a gallery's worth of source sizes
+_GEOMETRY_CACHE_SIZE = 65536
+
+_Chafa.chafa_calc_canvas_geometry.argtypes = [
+    ctypes.c_uint,
+    ctypes.c_uint,
+    ctypes.POINTER(ctypes.c_uint),
+    ctypes.POINTER(ctypes.c_uint),
+    ctypes.c_float,
+    ctypes.c_bool,
+    ctypes.c_bool
+]
+
+_Chafa.chafa_calc_canvas_geometry.restype = None
+
+
+@lru_cache(maxsize=_GEOMETRY_CACHE_SIZE)
+def _calc_canvas_geometry(
+    src_width: int,
+    src_height: int,
+    width: int,
+    height: int,
+    font_ratio: float,
+    zoom: bool,
+    stretch: bool
+) -> Tuple[int, int]:
+    """
+    Bindings for chafa_calc_canvas_geometry, returns ``(width, height)``.
+    The arguments must already be validated.
+    """
+    new_width  = ctypes.c_uint(width)
+    new_height = ctypes.c_uint(height)
+
+    _Chafa.chafa_calc_canvas_geometry(
+        src_width, src_height,
+        ctypes.byref(new_width), ctypes.byref(new_height),
+        font_ratio,
+        zoom,
+        stretch
+    )
+
+    return new_width.value, new_height.value
+
+
+def _check_geometry_args(font_ratio, zoom, stretch) -> Tuple[float, bool, bool]:
+    font_ratio = float(font_ratio)
+
+    if zoom is None:
+        raise TypeError("zoom must not be None")
+
+    if stretch is None:
+        raise TypeError("stretch must not be None")
+
+    if font_ratio <= 0:
+        raise ValueError("font_ratio must be greater than 0")
+
+    return font_ratio, bool(zoom), bool(stretch)
+
+
+def _check_source_size(src_width, src_height) -> Tuple[int, int]:
+    src_width  = int(src_width)
+    src_height = int(src_height)
+
+    if src_width <= 0:
+        raise ValueError("src_width must be greater than 0")
+
+    if src_height <= 0:
+        raise ValueError("src_height must be greater than 0")
+
+    return src_width, src_height
+
+
+def calc_geometries(
+    sizes: Iterable[Tuple[int, int]],
+    width: int,
+    height: int,
+    font_ratio: float,
+    zoom: bool=False,
+    stretch: bool=False
+) -> Tuple[array.array, array.array]:
+    """
+    Calculates the canvas geometry for many images at once, like 
+    :py:meth:`CanvasConfig.calc_canvas_geometry` does for one, 
+    without needing a config. Results are remembered, so repeated 
+    source sizes are only calculated once.
+
+    :param sizes: The ``(width, height)`` of each image in pixels.
+    :type sizes: Iterable[Tuple[int, int]]
+    :param int width: The widest the canvas may be, in character cells.
+    :param int height: The tallest the canvas may be, in character cells.
+    :param float font_ratio: The font's width divided by its height.
+    :param bool zoom: Upscale the images to fit the canvas.
+    :param bool stretch: Ignore the aspect ratio of the images.
+
+    :returns: The widths and heights of the canvases, in the order of sizes.
+    :rtype: Tuple[array.array, array.array]
+
+    :raises ValueError: if a source width or height is <= 0 or font_ratio is <= 0
+    """
+
+    font_ratio, zoom, stretch = _check_geometry_args(font_ratio, zoom, stretch)
+
+    width  = int(width)
+    height = int(height)
+
+    widths  = array.array("I")
+    heights = array.array("I")
+
+    for src_width, src_height in sizes:
+        src_width, src_height = _check_source_size(src_width, src_height)
+
+        new_width, new_height = _calc_canvas_geometry(
+            src_width, src_height,
+            width, height,
+            font_ratio,
+            zoom,
+            stretch
+        )
+
+        widths.append(new_width)
+        heights.append(new_height)
+
+    return widths, heights
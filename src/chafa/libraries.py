@@ -3,10 +3,81 @@ from pathlib import Path
 import ctypes
 import ctypes.util
 import platform
+import sys
+
+from ._version import __version__
 
 #  CHAFA LETS GOOOOOOO!!!
 _root_dir = Path(os.path.dirname(__file__)) 
 
+def _library_cache_path() -> Path:
+    """
+    Where we remember the paths of libraries we have already 
+    searched for, so other processes don't have to search again. 
+    Can be moved with the ``CHAFA_PY_CACHE_DIR`` environment variable.
+    """
+    cache_dir = os.environ.get("CHAFA_PY_CACHE_DIR")
+
+    if not cache_dir:
+        if platform.system() == "Windows":
+            cache_dir = Path(os.environ.get("LOCALAPPDATA", Path.home())) / "chafa.py"
+
+        else:
+            cache_dir = Path(os.environ.get("XDG_CACHE_HOME", Path.home() / ".cache")) / "chafa.py"
+
+    return Path(cache_dir) / "libraries.json"
+
+
+def _read_library_cache(key: str):
+    """
+    Returns the cached library path for key, or None if there is none.
+    """
+    import json
+
+    try:
+        with open(_library_cache_path(), "r") as file:
+            return json.load(file).get(key)
+
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def _write_library_cache(key: str, library: str):
+    """
+    Remembers library as the path for key. The cache is replaced 
+    atomically so concurrent processes never see a partial file. 
+    Failing to write the cache is not an error.
+    """
+    import json
+    import tempfile
+
+    cache_path = _library_cache_path()
+
+    try:
+        with open(cache_path, "r") as file:
+            cache = json.load(file)
+
+        if not isinstance(cache, dict):
+            cache = {}
+
+    except (OSError, ValueError):
+        cache = {}
+
+    cache[key] = str(library)
+
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+
+        fd, tmp_path = tempfile.mkstemp(dir=cache_path.parent, suffix=".tmp")
+
+        with os.fdopen(fd, "w") as file:
+            json.dump(cache, file)
+
+        os.replace(tmp_path, cache_path)
+
+    except OSError:
+        pass
+
 def find_chafa():
     search_names = ["chafa", "libchafa", "libchafa-0"]
     for name in search_names:
@@ -25,53 +96,95 @@ def find_glib():
     
     return glib
 
-# Figure out which libraries we need to import
-if platform.system() == "Linux":
-    _lib_glib = "libglib-2.0.so"
-    _lib      = _root_dir / "libs" / "libchafa.so"
+def _open_library(candidates, find, cache_key: str, env_var: str):
+    """
+    Opens a library and returns its path and the loaded library, or 
+    (None, None) if it can't be found. The library set by env_var is 
+    used if there is one. Otherwise the candidates are tried in order, 
+    then the path cached by an earlier process and finally find is 
+    used to search the system. Only the result of a search is cached, 
+    since that is the slow part.
+    """
+    override = os.environ.get(env_var)
 
-    try:
-        ctypes.CDLL(_lib_glib)
-    except OSError:
-        _lib_glib = find_glib()
+    if override:
+        try:
+            return override, ctypes.CDLL(override)
 
-    if not _lib.exists():
-        _lib = find_chafa()
+        except OSError as e:
+            raise ImportError(f"Could not load {env_var}={override}") from e
 
-elif platform.system() == "Windows":
-    os.add_dll_directory(os.path.dirname(__file__))
+    for candidate in candidates:
+        if isinstance(candidate, Path) and not candidate.exists():
+            continue
 
-    _lib_glib = _root_dir / "libs" / "libglib-2.0-0.dll"
-    _lib      = _root_dir / "libs" / "libchafa.dll"
+        try:
+            return str(candidate), ctypes.CDLL(str(candidate))
 
-    if not _lib_glib.exists():
-        _lib_glib = find_glib()
+        except OSError:
+            continue
 
-    if not _lib.exists():
-        _lib = find_chafa()
+    cached = _read_library_cache(cache_key)
 
+    if cached:
+        try:
+            return cached, ctypes.CDLL(cached)
 
-elif platform.system() == "Darwin":
-    _lib_glib = _root_dir / ".dylibs" / "libglib-2.0.0.dylib"
-    _lib      = _root_dir / "libs"    / "libchafa.dylib"
+        # The cached library has gone away
+        except OSError:
+            pass
+
+    found = find()
+
+    if found is None:
+        return None, None
+
+    library = ctypes.CDLL(str(found))
+    _write_library_cache(cache_key, found)
+
+    return str(found), library
+
+
+# Search results are only valid for this interpreter and this version of chafa.py
+_cache_key = f"{sys.executable}:{sys.version}:{__version__}"
+
+# Figure out which libraries we need to import
+if platform.system() == "Linux":
+    # The unversioned .so is only there if the glib headers are installed
+    _glib_candidates  = ["libglib-2.0.so.0", "libglib-2.0.so"]
+    _chafa_candidates = [_root_dir / "libs" / "libchafa.so"]
 
-    if not _lib_glib.exists():
-        _lib_glib = find_glib()
+elif platform.system() == "Windows":
+    os.add_dll_directory(os.path.dirname(__file__))
 
-    if not _lib.exists():
-        _lib = find_chafa()
+    _glib_candidates  = [_root_dir / "libs" / "libglib-2.0-0.dll"]
+    _chafa_candidates = [_root_dir / "libs" / "libchafa.dll"]
+
+elif platform.system() == "Darwin":
+    _glib_candidates  = [_root_dir / ".dylibs" / "libglib-2.0.0.dylib"]
+    _chafa_candidates = [_root_dir / "libs"    / "libchafa.dylib"]
 
 else:
     raise ImportError("You appear to be running on an unsupported system.")
 
 
-if _lib is None:
-    raise ImportError("libchafa was not found on your system.")
+_lib_glib, _GLib = _open_library(_glib_candidates, find_glib, f"glib:{_cache_key}", "CHAFA_GLIB_LIBRARY")
 
 if _lib_glib is None:
     raise ImportError("libglib-2.0 was not found on your system.")
 
-_lib      = str(_lib)
-_lib_glib = str(_lib_glib)
+_lib, _Chafa = _open_library(_chafa_candidates, find_chafa, f"chafa:{_cache_key}", "CHAFA_LIBRARY")
+
+if _lib is None:
+    raise ImportError("libchafa was not found on your system.")
+
+
+# The glib functions we use
+_GLib.g_get_environ.restype  = ctypes.c_void_p
+
+_GLib.g_strfreev.argtypes = [ctypes.c_void_p]
+_GLib.g_free.argtypes     = [ctypes.c_void_p]
+_GLib.g_error_free.argtypes = [ctypes.c_void_p]
 
-_Chafa = ctypes.CDLL(_lib)
\ No newline at end of file
+_GLib.g_string_free.argtypes = [ctypes.c_void_p, ctypes.c_int]
+_GLib.g_string_free.restype  = ctypes.c_void_p
@@ -1,8 +1,15 @@
+from __future__ import annotations
 import ctypes.util
 import ctypes
+import importlib.util
 from pathlib import Path
+from typing import Iterable, Iterator, Tuple, Union
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from collections import deque
 from .enums import PixelType
+from .libraries import _read_library_cache, _write_library_cache
 import platform
+import threading
 import os
 
 def _get_library_name():
@@ -16,11 +23,16 @@ def _get_library_name():
         import winreg
 
         # Query registry for imageMagick and add it to our dll path
-        with winreg.OpenKey(winreg.HKEY_LOCAL_MACHINE, "SOFTWARE\\ImageMagick\\Current") as key:
-            wand_path = winreg.QueryValueEx(key, "LibPath")
-            os.add_dll_directory(wand_path[0])
+        try:
+            with winreg.OpenKey(winreg.HKEY_LOCAL_MACHINE, "SOFTWARE\\ImageMagick\\Current") as key:
+                wand_path = winreg.QueryValueEx(key, "LibPath")
+                os.add_dll_directory(wand_path[0])
 
-            libwand = "CORE_RL_MagickWand_"
+                libwand = "CORE_RL_MagickWand_"
+
+        # ImageMagick is not installed
+        except OSError:
+            pass
 
         return libwand
 
@@ -57,41 +69,206 @@ def _get_library_name():
     return libwand
 
 
-# Try to find library and raise ImportError if it isn't found
-_lib = _get_library_name()
+# The MagickWand library is only searched for once a Loader needs it, 
+# since searching can take a while. It is optional since the other 
+# backends can decode the common formats without it.
+_MagickWand = None
+_magickwand_searched = False
+_magickwand_lock = threading.Lock()
 
-if not _lib:
-    raise ImportError("MagickWand library not found.")
 
-_MagickWand = ctypes.CDLL(_lib)
+def _load_magickwand():
+    """
+    Finds and loads the MagickWand library the first time it is 
+    called. Returns None if the library could not be found.
 
+    The library can be set with the ``CHAFA_MAGICKWAND_LIBRARY`` 
+    environment variable. Otherwise the path found by 
+    :py:func:`_get_library_name` is cached on disk, so it only 
+    has to be searched for once.
+    """
+    global _MagickWand, _magickwand_searched
 
-class Loader:
+    with _magickwand_lock:
+        if _magickwand_searched:
+            return _MagickWand
+
+        # The user knows best
+        override = os.environ.get("CHAFA_MAGICKWAND_LIBRARY")
+
+        if override:
+            try:
+                _MagickWand = ctypes.CDLL(override)
+
+            except OSError as e:
+                raise ImportError(f"Could not load CHAFA_MAGICKWAND_LIBRARY={override}") from e
+
+        # The registry lookup also sets up the dll path on 
+        # windows so we can't skip it by caching the result
+        elif platform.system() == "Windows":
+            lib = _get_library_name()
+
+            if lib:
+                _MagickWand = ctypes.CDLL(lib)
+
+        else:
+            cache_key = f"MagickWand:{platform.system()}:{os.environ.get('MAGICK_HOME', '')}"
+            lib = _read_library_cache(cache_key)
+
+            if lib:
+                try:
+                    _MagickWand = ctypes.CDLL(lib)
+
+                # The cached library has gone away
+                except OSError:
+                    lib = None
+
+            if not lib:
+                lib = _get_library_name()
+
+                if lib:
+                    _MagickWand = ctypes.CDLL(str(lib))
+                    _write_library_cache(cache_key, lib)
+
+        # Only once it was found or is known to be missing, 
+        # a bad override keeps raising until it is fixed
+        _magickwand_searched = True
+
+        # Init wand
+        if _MagickWand is not None:
+            _MagickWand.MagickWandGenesis()
+
+        return _MagickWand
+
+
+# Maps each PixelType to the order of its channels
+_CHANNEL_ORDERS = {
+    PixelType.CHAFA_PIXEL_RGB8:                "RGB",
+    PixelType.CHAFA_PIXEL_BGR8:                "BGR",
+    PixelType.CHAFA_PIXEL_RGBA8_UNASSOCIATED:  "RGBA",
+    PixelType.CHAFA_PIXEL_BGRA8_UNASSOCIATED:  "BGRA",
+    PixelType.CHAFA_PIXEL_ARGB8_UNASSOCIATED:  "ARGB",
+    PixelType.CHAFA_PIXEL_ABGR8_UNASSOCIATED:  "ABGR",
+    PixelType.CHAFA_PIXEL_RGBA8_PREMULTIPLIED: "RGBA",
+    PixelType.CHAFA_PIXEL_BGRA8_PREMULTIPLIED: "BGRA",
+    PixelType.CHAFA_PIXEL_ARGB8_PREMULTIPLIED: "ARGB",
+    PixelType.CHAFA_PIXEL_ABGR8_PREMULTIPLIED: "ABGR",
+}
+
+_PREMULTIPLIED = {
+    PixelType.CHAFA_PIXEL_RGBA8_PREMULTIPLIED,
+    PixelType.CHAFA_PIXEL_BGRA8_PREMULTIPLIED,
+    PixelType.CHAFA_PIXEL_ARGB8_PREMULTIPLIED,
+    PixelType.CHAFA_PIXEL_ABGR8_PREMULTIPLIED,
+}
+
+
+def _default_pixel_type(has_alpha: bool) -> PixelType:
     """
-    The :py:class:`Loader` is a reasonably fast way 
-    to load the pixel data of an image for use 
-    with chafa.py. In addition to loading the pixel 
-    data, the :py:class:`Loader` will also provide 
-    useful information such as the width and height 
-    of the image to further simplify drawing to the 
-    :py:class:`chafa.Canvas`.
+    The pixel type to use when none is asked for. We 
+    only carry an alpha channel if the image has one.
+    """
+    if has_alpha:
+        return PixelType.CHAFA_PIXEL_RGBA8_UNASSOCIATED
 
-    :param str path: The path to the image to load. 
-        This will not resolve special characters such as ``~``.
+    return PixelType.CHAFA_PIXEL_RGB8
 
-    :raises FileNotFoundError: if the image does not exist.
+
+def _fit_size(width: int, height: int, max_size: Tuple[int, int]) -> Tuple[int, int]:
+    """
+    Scales (width, height) down to fit within max_size, 
+    preserving the aspect ratio.
     """
+    max_width, max_height = max_size
 
-    def __init__(self, path: str):
-        
-        # check if path exists
-        path = Path(path).resolve()
+    scale = min(max_width / width, max_height / height, 1)
 
-        if not path.exists():
-            raise FileNotFoundError()
+    return max(1, round(width * scale)), max(1, round(height * scale))
 
-        self.path = str(path)
 
+def _reorder_channels(data: bytes, src_order: str, dst_order: str) -> bytearray:
+    """
+    Reorders the interleaved channels in data from src_order to 
+    dst_order using extended slices. Channels missing from src_order 
+    are filled with 255, i.e. an opaque alpha channel.
+    """
+    src_channels = len(src_order)
+    dst_channels = len(dst_order)
+
+    pixel_count = len(data) // src_channels
+
+    out = bytearray(pixel_count * dst_channels)
+
+    for i, channel in enumerate(dst_order):
+        if channel in src_order:
+            j = src_order.index(channel)
+            out[i::dst_channels] = data[j::src_channels]
+
+        else:
+            out[i::dst_channels] = b"\xff" * pixel_count
+
+    return out
+
+
+class LoaderBackend:
+    """
+    The interface implemented by the decoders used by 
+    :py:class:`Loader`. Every backend returns the same 
+    pixel buffer shape, a :py:class:`ctypes.Array` of 
+    tightly packed 8 bit channels.
+    """
+
+    #: The name used to refer to the backend
+    name = None
+
+    #: Lowercase file suffixes the backend can decode, or None for any
+    suffixes = None
+
+    #: Whether the backend can export premultiplied alpha
+    premultiplied = True
+
+    def is_available(self) -> bool:
+        """
+        Returns True if the backend's library can be used.
+        """
+        raise NotImplementedError()
+
+    def supports(self, path: Path, pixel_type: Union[PixelType, None]) -> bool:
+        """
+        Returns True if the backend should be able to 
+        decode the image at path as pixel_type.
+        """
+        if self.suffixes is not None and path.suffix.lower() not in self.suffixes:
+            return False
+
+        if pixel_type in _PREMULTIPLIED and not self.premultiplied:
+            return False
+
+        return True
+
+    def load(
+        self, 
+        path:       str, 
+        pixel_type: Union[PixelType, None], 
+        max_size:   Union[Tuple[int, int], None]
+    ) -> Tuple[ctypes.Array, int, int, PixelType]:
+        """
+        Decodes the image at path and returns a tuple of 
+        ``(pixels, width, height, pixel_type)``.
+        """
+        raise NotImplementedError()
+
+
+class MagickWandBackend(LoaderBackend):
+    name = "magickwand"
+
+    # MagickExportImagePixels can only export unassociated alpha
+    premultiplied = False
+
+    def is_available(self) -> bool:
+        return _load_magickwand() is not None
+
+    def load(self, path, pixel_type, max_size):
         # === Argtypes ===
 
         _MagickWand.PixelSetColor.argtypes = [
@@ -104,16 +281,31 @@ class Loader:
             ctypes.c_void_p
         ]
 
+        _MagickWand.MagickSetOption.argtypes = [
+            ctypes.c_void_p,
+            ctypes.c_char_p,
+            ctypes.c_char_p
+        ]
+
         _MagickWand.MagickReadImage.argtypes = [
             ctypes.c_void_p,
             ctypes.c_char_p
         ]
 
-        _MagickWand.DestroyPixelWand.argtypes = [ctypes.c_void_p]
+        _MagickWand.MagickThumbnailImage.argtypes = [
+            ctypes.c_void_p,
+            ctypes.c_size_t,
+            ctypes.c_size_t
+        ]
+
+        _MagickWand.DestroyPixelWand.argtypes  = [ctypes.c_void_p]
+        _MagickWand.DestroyMagickWand.argtypes = [ctypes.c_void_p]
 
         _MagickWand.MagickGetImageWidth. argtypes = [ctypes.c_void_p]
         _MagickWand.MagickGetImageHeight.argtypes = [ctypes.c_void_p]
 
+        _MagickWand.MagickGetImageAlphaChannel.argtypes = [ctypes.c_void_p]
+
         _MagickWand.MagickExportImagePixels.argtypes = [
             ctypes.c_void_p,
             ctypes.c_int,
@@ -131,49 +323,435 @@ class Loader:
         _MagickWand.NewMagickWand.restype = ctypes.c_void_p
         _MagickWand.NewPixelWand.restype  = ctypes.c_void_p
 
+        _MagickWand.DestroyMagickWand.restype = ctypes.c_void_p
+
+        _MagickWand.MagickReadImage.restype = ctypes.c_int
+
         _MagickWand.MagickGetImageWidth. restype = ctypes.c_int;
         _MagickWand.MagickGetImageHeight.restype = ctypes.c_int;
 
+        _MagickWand.MagickGetImageAlphaChannel.restype = ctypes.c_bool
+
         # === Load necessary image information ===
 
         # Enum for uint8 pixel values
         CharPixel = 1
 
-        # Init wand
-        _MagickWand.MagickWandGenesis()
-
         magick_wand = _MagickWand.NewMagickWand()
+
+        try:
+            # Let the jpeg decoder scale while decoding
+            if max_size is not None:
+                size_hint = bytes(f"{max_size[0]}x{max_size[1]}", "utf8")
+                _MagickWand.MagickSetOption(magick_wand, b"jpeg:size", size_hint)
+            
+            # Grab image
+            image_path = ctypes.c_char_p(bytes(path, "utf8"))
+
+            if not _MagickWand.MagickReadImage(magick_wand, image_path):
+                raise ValueError(f"MagickWand could not read {path}")
+
+            # Get image information
+            width  = _MagickWand.MagickGetImageWidth (magick_wand)
+            height = _MagickWand.MagickGetImageHeight(magick_wand)
+
+            if max_size is not None:
+                new_width, new_height = _fit_size(width, height, max_size)
+
+                if (new_width, new_height) != (width, height):
+                    _MagickWand.MagickThumbnailImage(magick_wand, new_width, new_height)
+
+                    width, height = new_width, new_height
+
+            # Only export an alpha channel if the image has one
+            if pixel_type is None:
+                pixel_type = _default_pixel_type(
+                    _MagickWand.MagickGetImageAlphaChannel(magick_wand)
+                )
+
+            export_map = _CHANNEL_ORDERS[pixel_type]
+            rowstride  = width * len(export_map)
+
+            # Get pixels
+            pixels = (ctypes.c_uint8 * (height * rowstride))()
+
+            _MagickWand.MagickExportImagePixels(
+                magick_wand,
+                0, 0,
+                width, height,
+                ctypes.c_char_p(bytes(export_map, "utf8")),
+                CharPixel,
+                pixels
+            )
+
+        finally:
+            # The pixels have been copied out so we can let go of the wand
+            _MagickWand.DestroyMagickWand(magick_wand)
+
+        return pixels, width, height, pixel_type
+
+
+class PillowBackend(LoaderBackend):
+    name = "pillow"
+
+    def is_available(self) -> bool:
+        return importlib.util.find_spec("PIL") is not None
+
+    def load(self, path, pixel_type, max_size):
+        from PIL import Image
+
+        with Image.open(path) as image:
+            # thumbnail uses draft() so jpegs are scaled while decoding
+            if max_size is not None:
+                image.thumbnail(max_size)
+
+            has_alpha = "A" in image.getbands() or "transparency" in image.info
+
+            if pixel_type is None:
+                pixel_type = _default_pixel_type(has_alpha)
+
+            order = _CHANNEL_ORDERS[pixel_type]
+
+            if len(order) == 3:
+                image = image.convert("RGB")
+
+            elif pixel_type in _PREMULTIPLIED:
+                image = image.convert("RGBA").convert("RGBa")
+
+            else:
+                image = image.convert("RGBA")
+
+            width, height = image.size
+
+            data = image.tobytes()
+
+        base_order = "RGBA"[:len(order)]
+
+        if order != base_order:
+            data = _reorder_channels(data, base_order, order)
+
+        pixels = (ctypes.c_uint8 * len(data)).from_buffer_copy(data)
+
+        return pixels, width, height, pixel_type
+
+
+class VipsBackend(LoaderBackend):
+    name = "pyvips"
+
+    def is_available(self) -> bool:
+        return importlib.util.find_spec("pyvips") is not None
+
+    def load(self, path, pixel_type, max_size):
+        import pyvips
+
+        # thumbnail shrinks on load, which is much faster for huge images
+        if max_size is not None:
+            image = pyvips.Image.thumbnail(path, max_size[0], height=max_size[1], size="down")
+
+        else:
+            image = pyvips.Image.new_from_file(path, access="sequential")
+
+        # Make sure we have 8 bit sRGB(A)
+        if image.interpretation != "srgb":
+            image = image.colourspace("srgb")
+
+        if image.format != "uchar":
+            image = image.cast("uchar")
+
+        has_alpha = image.hasalpha()
+
+        if pixel_type is None:
+            pixel_type = _default_pixel_type(has_alpha)
+
+        order = _CHANNEL_ORDERS[pixel_type]
+
+        if len(order) == 3 and has_alpha:
+            image = image.extract_band(0, n=3)
+
+        elif len(order) == 4 and not has_alpha:
+            image = image.bandjoin(255)
+
+        elif pixel_type in _PREMULTIPLIED:
+            image = image.premultiply().cast("uchar")
+
+        data = image.write_to_memory()
+
+        base_order = "RGBA"[:len(order)]
+
+        if order != base_order:
+            data = _reorder_channels(data, base_order, order)
+
+        pixels = (ctypes.c_uint8 * len(data)).from_buffer_copy(data)
+
+        return pixels, image.width, image.height, pixel_type
+
+
+class RawBackend(LoaderBackend):
+    """
+    A pure Python decoder for binary netpbm images 
+    (``P5`` and ``P6``). This is always available, 
+    but does not shrink images to max_size.
+    """
+    name = "raw"
+
+    suffixes = {".ppm", ".pgm", ".pnm"}
+
+    def is_available(self) -> bool:
+        return True
+
+    def load(self, path, pixel_type, max_size):
+        with open(path, "rb") as file:
+            data = file.read()
+
+        # Read the magic number, width, height and maxval
+        fields = []
+        index  = 0
+
+        while len(fields) < 4:
+            # Skip whitespace and comments
+            while data[index:index + 1].isspace():
+                index += 1
+
+            if data[index:index + 1] == b"#":
+                index = data.index(b"\n", index)
+                continue
+
+            start = index
+
+            while index < len(data) and not data[index:index + 1].isspace():
+                index += 1
+
+            fields.append(data[start:index])
+
+        # Exactly one whitespace character separates the header from the pixels
+        index += 1
+
+        magic  = fields[0]
+        width  = int(fields[1])
+        height = int(fields[2])
+        maxval = int(fields[3])
+
+        if magic not in (b"P5", b"P6") or not 0 < maxval <= 255:
+            raise ValueError(f"{path} is not an 8 bit binary netpbm image")
+
+        src_order = "RGB" if magic == b"P6" else "L"
+
+        size = width * height * len(src_order)
+        data = data[index:index + size]
+
+        # Native code reads width * height pixels, whatever we hand it
+        if width <= 0 or height <= 0 or len(data) < size:
+            raise ValueError(f"{path} is truncated or has an invalid size")
+
+        # Stretch the samples to the full range, like the other backends do
+        if maxval != 255:
+            table = bytes(min(value * 255 // maxval, 255) for value in range(256))
+            data  = data.translate(table)
+
+        # Images without alpha are the same premultiplied or not
+        if pixel_type is None:
+            pixel_type = PixelType.CHAFA_PIXEL_RGB8
+
+        order = _CHANNEL_ORDERS[pixel_type]
+
+        # Expand greyscale to RGB
+        if src_order == "L":
+            grey = data
+            data = bytearray(len(grey) * 3)
+            data[0::3] = data[1::3] = data[2::3] = grey
+
+            src_order = "RGB"
+
+        if order != src_order:
+            data = _reorder_channels(data, src_order, order)
+
+        pixels = (ctypes.c_uint8 * len(data)).from_buffer_copy(data)
+
+        return pixels, width, height, pixel_type
+
+
+_BACKENDS = {
+    backend.name: backend for backend in (
+        VipsBackend(),
+        PillowBackend(),
+        MagickWandBackend(),
+        RawBackend(),
+    )
+}
+
+# Which backends to try first for each file suffix. Pillow's draft 
+# mode makes it the one to beat for jpegs, pyvips for the big lossless 
+# formats and MagickWand is kept around for exotic formats. Re-measure 
+# with benchmarks/loader_backends.py when changing these.
+_DEFAULT_ORDER = ("pyvips", "pillow", "magickwand", "raw")
+
+_SUFFIX_ORDERS = {
+    ".jpg":  ("pillow", "pyvips", "magickwand"),
+    ".jpeg": ("pillow", "pyvips", "magickwand"),
+    ".gif":  ("pillow", "magickwand", "pyvips"),
+    ".ppm":  ("raw", "pillow", "pyvips", "magickwand"),
+    ".pgm":  ("raw", "pillow", "pyvips", "magickwand"),
+    ".pnm":  ("raw", "pillow", "pyvips", "magickwand"),
+}
+
+
+def available_backends() -> Tuple[str, ...]:
+    """
+    Returns the names of the backends that can be used on this system.
+
+    :rtype: tuple[str, ...]
+    """
+    return tuple(name for name, backend in _BACKENDS.items() if backend.is_available())
+
+
+def set_backend_order(order: Tuple[str, ...], suffix: str=None):
+    """
+    Sets the order in which :py:class:`Loader` tries the backends.
+
+    :param tuple[str, ...] order: The backend names, fastest first.
+    :param str|None suffix: The file suffix (e.g. ``".png"``) to set 
+        the order for. If None, the default order is set.
+
+    :raises ValueError: if order contains an unknown backend.
+    """
+    order = tuple(order)
+
+    for name in order:
+        if name not in _BACKENDS:
+            raise ValueError(f"Unknown backend {name!r}")
+
+    if suffix is None:
+        global _DEFAULT_ORDER
+        _DEFAULT_ORDER = order
+
+    else:
+        _SUFFIX_ORDERS[suffix.lower()] = order
+
+
+class Loader:
+    """
+    The :py:class:`Loader` is a reasonably fast way 
+    to load the pixel data of an image for use 
+    with chafa.py. In addition to loading the pixel 
+    data, the :py:class:`Loader` will also provide 
+    useful information such as the width and height 
+    of the image to further simplify drawing to the 
+    :py:class:`chafa.Canvas`.
+
+    The image is decoded with the fastest available 
+    backend for its format, see :py:func:`available_backends`.
+
+    :param str path: The path to the image to load. 
+        This will not resolve special characters such as ``~``.
+    :param PixelType|None pixel_type: The :py:class:`chafa.PixelType` 
+        to export the pixels as. If None, the pixels will be exported as 
+        :py:attr:`chafa.PixelType.CHAFA_PIXEL_RGB8` if the image has no 
+        alpha channel and 
+        :py:attr:`chafa.PixelType.CHAFA_PIXEL_RGBA8_UNASSOCIATED` otherwise.
+    :param tuple[int, int]|None max_size: If given, the image is shrunk 
+        to fit within ``(width, height)``, while decoding if the backend 
+        supports it.
+    :param str|None backend: The name of the backend to use. If None, 
+        the backends are tried fastest first.
+
+    :raises FileNotFoundError: if the image does not exist.
+    :raises ValueError: if the image could not be decoded.
+    :raises ImportError: if no backend is available.
+    """
+
+    def __init__(
+        self, 
+        path:       str, 
+        pixel_type: PixelType=None, 
+        max_size:   Tuple[int, int]=None, 
+        backend:    str=None
+    ):
         
-        # Grab image
-        image_path = ctypes.c_char_p(bytes(self.path, "utf8"))
+        # check if path exists
+        path = Path(path).resolve()
+
+        if not path.exists():
+            raise FileNotFoundError()
+
+        self.path = str(path)
+
+        # Check the arguments
+        if pixel_type is not None:
+            pixel_type = PixelType(pixel_type)
+
+            if pixel_type not in _CHANNEL_ORDERS:
+                raise ValueError(f"The loader can not export pixels as {pixel_type.name}")
+
+        if max_size is not None:
+            max_size = (int(max_size[0]), int(max_size[1]))
+
+            if max_size[0] <= 0 or max_size[1] <= 0:
+                raise ValueError("max_size must be greater than 0")
+
+        if backend is None:
+            order = _SUFFIX_ORDERS.get(path.suffix.lower(), _DEFAULT_ORDER)
+
+        elif backend in _BACKENDS:
+            order = (backend, )
+
+        else:
+            raise ValueError(f"Unknown backend {backend!r}")
+
+        # Try the backends in order until one succeeds. Availability is 
+        # checked lazily so we don't look for libraries we end up not using
+        have_backend = False
+        error        = None
+
+        for name in order:
+            candidate = _BACKENDS[name]
+
+            if not candidate.is_available():
+                continue
+
+            have_backend = True
+
+            if not candidate.supports(path, pixel_type):
+                continue
 
-        _MagickWand.MagickReadImage(magick_wand, image_path)
+            try:
+                pixels, width, height, loaded_type = candidate.load(self.path, pixel_type, max_size)
 
-        # Get image information
-        width  = _MagickWand.MagickGetImageWidth (magick_wand)
-        height = _MagickWand.MagickGetImageHeight(magick_wand)
+            except Exception as e:
+                error = e
+                continue
 
-        # We will have 4 channels because we are outputting RGBA
-        rowstride = width * 4
+            break
 
-        # Get pixels
-        pixels = (ctypes.c_uint8 * (height * rowstride))()
+        else:
+            if not have_backend:
+                raise ImportError(
+                    f"No backend is available to load {path.name}. "
+                    "Install Pillow, pyvips or the MagickWand library."
+                )
 
-        _MagickWand.MagickExportImagePixels(
-            magick_wand,
-            0, 0,
-            width, height,
-            ctypes.c_char_p(bytes("RGBA", "utf8")),
-            CharPixel,
-            pixels
-        )
+            if error is None:
+                raise ValueError(f"None of the available backends can load {path.name} as requested")
+
+            raise ValueError(f"Could not decode {path.name}") from error
+
+        channels = len(_CHANNEL_ORDERS[loaded_type])
 
         self._height        = height
         self._width         = width
-        self._rowstride     = rowstride
-        self._channels      = 4
-        self._pixel_type    = PixelType.CHAFA_PIXEL_RGBA8_UNASSOCIATED
+        self._rowstride     = width * channels
+        self._channels      = channels
+        self._pixel_type    = loaded_type
         self._pixels        = pixels
+        self._backend       = candidate.name
+
+    @property
+    def backend(self) -> str:
+        """
+        :type: str
+
+        The name of the backend that decoded the image.
+        """
+        return self._backend
 
     @property
     def width(self) -> int:
@@ -228,3 +806,104 @@ class Loader:
         Returns the pixel data of the image.
         """
         return self._pixels
+
+
+def load_many(
+    paths:             Iterable[str], 
+    workers:           int=None, 
+    max_size:          Tuple[int, int]=None, 
+    pixel_type:        PixelType=None,
+    backend:           str=None,
+    ordered:           bool=True,
+    max_pending:       int=None,
+    return_exceptions: bool=False
+) -> Iterator[Loader]:
+    """
+    Loads many images concurrently in a pool of threads and yields 
+    a :py:class:`Loader` for each. The decoders release the GIL while 
+    decoding, so this scales with the number of cores.
+
+    At most max_pending images are decoded or waiting to be consumed 
+    at any time, which bounds the memory used for pixel data.
+
+    :param Iterable[str] paths: The paths of the images to load.
+    :param int|None workers: The number of threads. Defaults to the 
+        number of CPUs.
+    :param tuple[int, int]|None max_size: Passed on to :py:class:`Loader`.
+    :param PixelType|None pixel_type: Passed on to :py:class:`Loader`.
+    :param str|None backend: Passed on to :py:class:`Loader`.
+    :param bool ordered: If True, the images are yielded in the order of 
+        paths. Otherwise they are yielded as soon as they are loaded.
+    :param int|None max_pending: The maximum number of images in flight. 
+        Defaults to twice the number of workers.
+    :param bool return_exceptions: If True, an exception raised while 
+        loading an image is yielded in its place instead of being raised.
+
+    :raises ValueError: if workers or max_pending are less than 1.
+    """
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    workers = int(workers)
+
+    if workers < 1:
+        raise ValueError("workers must be at least 1")
+
+    if max_pending is None:
+        max_pending = 2 * workers
+
+    max_pending = int(max_pending)
+
+    if max_pending < 1:
+        raise ValueError("max_pending must be at least 1")
+
+    def load(path):
+        return Loader(path, pixel_type=pixel_type, max_size=max_size, backend=backend)
+
+    def result(future):
+        if return_exceptions:
+            return future.exception() or future.result()
+
+        return future.result()
+
+    paths = iter(paths)
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+
+        def submit():
+            """
+            Submits the next path, returns False when there are none left.
+            """
+            for path in paths:
+                pending.append(executor.submit(load, path))
+                return True
+
+            return False
+
+        try:
+            # Fill the pipeline
+            while len(pending) < max_pending and submit():
+                pass
+
+            while pending:
+                if ordered:
+                    future = pending.popleft()
+
+                else:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    future  = done.pop()
+                    pending.remove(future)
+
+                yield result(future)
+
+                # Top up only once the consumer is back, so it never 
+                # holds an image on top of max_pending in flight
+                del future
+                submit()
+
+        finally:
+            # Don't start anything new if the consumer stops early
+            for future in pending:
+                future.cancel()
@@ -0,0 +1,294 @@
+from __future__ import annotations
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import NamedTuple, Optional, Union
+
+from .canvas import Canvas
+from .canvas_config import ReadOnlyCanvasConfig, CanvasConfig, CanvasConfigSnapshot
+from .term_info import TermInfo
+from .enums import PixelType
+
+
+class RenderCacheStats(NamedTuple):
+    """
+    Counters describing how a :py:class:`RenderCache` has been doing.
+    """
+
+    #: Renders answered from the cache
+    hits: int
+
+    #: Renders not found in memory
+    misses: int
+
+    #: Entries dropped to stay within the byte budget
+    evictions: int
+
+    #: Misses answered by the store instead of drawing
+    store_hits: int
+
+    #: Entries currently cached
+    entries: int
+
+    #: Bytes of output currently cached
+    size: int
+
+    @property
+    def hit_rate(self) -> float:
+        """
+        The fraction of renders answered from the cache.
+        """
+        total = self.hits + self.misses
+
+        return self.hits / total if total else 0.0
+
+
+def _pixels_digest(pixels) -> bytes:
+    """
+    Hashes the pixel buffer without copying it if it supports 
+    the buffer protocol.
+    """
+    try:
+        view = memoryview(pixels)
+
+    except TypeError:
+        view = bytes(pixels)
+
+    return hashlib.blake2b(view, digest_size=16).digest()
+
+
+class RenderCache:
+    """
+    A least recently used cache of :py:meth:`Canvas.print` output, 
+    keyed by the pixels, the :py:class:`CanvasConfig` and the 
+    :py:class:`TermInfo` used to render them. 
+
+    :param int max_bytes: How much output to keep around, in bytes.
+    :param store: A second level of cache that is asked on a miss 
+        before drawing, a :py:class:`DiskRenderStore` for example. 
+        Anything with ``get(key)`` and ``put(key, out)`` methods will do.
+    """
+
+    def __init__(self, max_bytes: int=64 * 1024 * 1024, store=None):
+        max_bytes = int(max_bytes)
+
+        if max_bytes < 0:
+            raise ValueError("max_bytes must not be negative")
+
+        self._max_bytes = max_bytes
+        self._entries   = OrderedDict()
+        self._size      = 0
+        self._lock      = threading.Lock()
+        self._store     = store
+
+        self._hits       = 0
+        self._misses     = 0
+        self._evictions  = 0
+        self._store_hits = 0
+
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._entries
+
+
+    @property
+    def max_bytes(self) -> int:
+        """
+        :type: int
+
+        How much output the cache keeps around, in bytes.
+        """
+        return self._max_bytes
+
+
+    @property
+    def store(self):
+        """
+        The second level of cache, or None.
+        """
+        return self._store
+
+
+    @property
+    def stats(self) -> RenderCacheStats:
+        """
+        :type: RenderCacheStats
+
+        The cache's hit, miss and eviction counts and current size.
+        """
+        with self._lock:
+            return RenderCacheStats(
+                self._hits,
+                self._misses,
+                self._evictions,
+                self._store_hits,
+                len(self._entries),
+                self._size
+            )
+
+
+    @staticmethod
+    def key(
+        config: Union[ReadOnlyCanvasConfig, CanvasConfigSnapshot],
+        src_pixel_type: PixelType,
+        src_pixels,
+        src_width: int,
+        src_height: int,
+        src_rowstride: int,
+        term_info: TermInfo
+    ) -> str:
+        """
+        Returns the cache key for rendering src_pixels with config 
+        and term_info. Keys are the same across processes.
+
+        :rtype: str
+        """
+
+        if not isinstance(config, CanvasConfigSnapshot):
+            config = config.snapshot()
+
+        key = hashlib.sha256()
+
+        key.update(_pixels_digest(src_pixels))
+        key.update(f"{int(src_pixel_type)}:{int(src_width)}:{int(src_height)}:{int(src_rowstride)}".encode())
+        key.update(config.digest.encode())
+        key.update(term_info._sequences_digest().encode())
+
+        return key.hexdigest()
+
+
+    def get(self, key: str) -> Optional[bytes]:
+        """
+        Returns the output cached under key, or None.
+
+        :rtype: bytes | None
+        """
+        with self._lock:
+            out = self._entries.get(key)
+
+            if out is None:
+                self._misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self._hits += 1
+
+            return out
+
+
+    def put(self, key: str, out: bytes):
+        """
+        Caches out under key, evicting the least recently 
+        used entries to stay within :py:attr:`max_bytes`.
+        Output larger than :py:attr:`max_bytes` is not cached.
+        """
+        out = bytes(out)
+
+        if len(out) > self._max_bytes:
+            return
+
+        with self._lock:
+            previous = self._entries.pop(key, None)
+
+            if previous is not None:
+                self._size -= len(previous)
+
+            self._entries[key] = out
+            self._size        += len(out)
+
+            while self._size > self._max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+
+                self._size      -= len(evicted)
+                self._evictions += 1
+
+
+    def clear(self):
+        """
+        Empties the cache. The statistics are kept.
+        """
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+
+    def render(
+        self,
+        config: Union[ReadOnlyCanvasConfig, CanvasConfigSnapshot],
+        src_pixel_type: PixelType,
+        src_pixels,
+        src_width: int,
+        src_height: int,
+        src_rowstride: int,
+        term_info: TermInfo=None,
+        fallback: bool=False
+    ) -> bytes:
+        """
+        Returns what drawing src_pixels on a :py:class:`Canvas` made 
+        with config and printing it would, drawing and printing only 
+        if the result isn't cached. The arguments are the same as 
+        :py:meth:`Canvas.draw_all_pixels` and :py:meth:`Canvas.print`.
+
+        :param config: The config to render with. Passing a snapshot 
+            saves taking one on every call.
+        :type config: CanvasConfig | CanvasConfigSnapshot
+
+        :rtype: bytes
+        """
+
+        term_info = Canvas._resolve_term_info(term_info, fallback)
+
+        key = self.key(
+            config,
+            src_pixel_type,
+            src_pixels,
+            src_width,
+            src_height,
+            src_rowstride,
+            term_info
+        )
+
+        out = self.get(key)
+
+        if out is not None:
+            return out
+
+        if self._store is not None:
+            out = self._store.get(key)
+
+            if out is not None:
+                with self._lock:
+                    self._store_hits += 1
+
+                self.put(key, out)
+
+                return out
+
+        if isinstance(config, CanvasConfigSnapshot):
+            config = CanvasConfig.from_snapshot(config)
+
+        # Read only configs, like the one from Canvas.peek_config, can't make a canvas
+        elif not isinstance(config, CanvasConfig):
+            config = CanvasConfig.from_snapshot(config.snapshot())
+
+        canvas = Canvas(config)
+        canvas.draw_all_pixels(
+            src_pixel_type,
+            src_pixels,
+            src_width,
+            src_height,
+            src_rowstride
+        )
+
+        out = canvas.print(term_info)
+
+        self.put(key, out)
+
+        if self._store is not None:
+            self._store.put(key, out)
+
+        return out
@@ -1,15 +1,114 @@
 from __future__ import annotations
+import re
 import ctypes
+import threading
+from collections import OrderedDict
+from typing import Optional, Tuple
 
-from .libraries import _Chafa
+from .libraries import _Chafa, _GLib
 from .enums import *
 
+# How many maps SymbolMap.from_selectors keeps around
+_SELECTOR_CACHE_SIZE = 256
+
+_selector_cache = OrderedDict()
+_selector_lock  = threading.Lock()
+
+# Selector strings are tag names separated by +, - and commas
+_SELECTOR_TOKENS = re.compile(r"[+\-]|[,\s]+|[^+\-,\s]+")
+
+# Tags are passed to chafa as unsigned ints
+_TAG_MASK = 0xffffffff
+
+
+def _parse_selectors(selectors: str):
+    """
+    Turns a selector string into add_by_tags and remove_by_tags 
+    operations, or returns None if it has anything but tag names.
+    """
+    ops    = []
+    adding = True
+
+    for token in _SELECTOR_TOKENS.findall(selectors):
+        if token == "+":
+            adding = True
+
+        elif token == "-":
+            adding = False
+
+        elif token[0] in ", \t\n":
+            continue
+
+        else:
+            try:
+                tags = SymbolTags[f"CHAFA_SYMBOL_TAG_{token.upper()}"]
+
+            except KeyError:
+                return None
+
+            # Names are lower case only
+            if token != token.lower():
+                return None
+
+            ops.append(("add_by_tags" if adding else "remove_by_tags", int(tags) & _TAG_MASK))
+
+    return ops
+
+
+def _canonical_ops(ops) -> tuple:
+    """
+    Normalises recorded operations so that maps built differently 
+    but with the same result usually end up with the same operations.
+    Selectors are split into tag operations, consecutive tag 
+    operations of the same kind are merged, operations that do 
+    nothing are dropped and so are removals from an empty map.
+    """
+    expanded = []
+
+    for name, *args in ops:
+        if name == "apply_selectors":
+            parsed = _parse_selectors(args[0])
+
+            if parsed is not None:
+                expanded.extend(parsed)
+                continue
+
+        elif name in ("add_by_tags", "remove_by_tags"):
+            args = [int(args[0]) & _TAG_MASK]
+
+        expanded.append((name, *args))
+
+    canonical = []
+
+    for name, *args in expanded:
+        if name in ("add_by_tags", "remove_by_tags"):
+            if args[0] == 0:
+                continue
+
+            if canonical and canonical[-1][0] == name:
+                canonical[-1] = (name, canonical[-1][1] | args[0])
+                continue
+
+        # Nothing to remove yet
+        if name.startswith("remove") and not canonical:
+            continue
+
+        canonical.append((name, *args))
+
+    return tuple(canonical)
+
+
 class ReadOnlySymbolMap():
     def __init__(self):
         # Init map
         _Chafa.chafa_symbol_map_new.restype = ctypes.c_void_p
         self._symbol_map = _Chafa.chafa_symbol_map_new()
 
+        # The operations that built this map, starting from an empty 
+        # one, or None if they are unknown. Used to describe the map 
+        # in CanvasConfig snapshots.
+        self._ops = []
+
     
     def copy(self) -> SymbolMap:
         """
@@ -31,12 +130,130 @@ class ReadOnlySymbolMap():
         # Init symbol map
         symbol_map = SymbolMap()
         symbol_map._symbol_map = new_pointer
+        symbol_map._ops = None if self._ops is None else list(self._ops)
 
         return symbol_map
 
 
+    @property
+    def canonical(self) -> Optional[Tuple[tuple, ...]]:
+        """
+        :type: Tuple[tuple, ...] | None
+
+        The operations that build this map from an empty one, in a 
+        normalised form, or None if it is not known how the map was 
+        built. Maps with the same canonical form contain the same 
+        symbols. Found without asking chafa.
+        """
+        if self._ops is None:
+            return None
+
+        return _canonical_ops(self._ops)
+
+
+    def __eq__(self, other):
+        if not isinstance(other, ReadOnlySymbolMap):
+            return NotImplemented
+
+        canonical = self.canonical
+
+        # Without a canonical form only the same map is equal
+        if canonical is None or other.canonical is None:
+            return self._symbol_map == other._symbol_map
+
+        return canonical == other.canonical
+
+
+    def __hash__(self):
+        canonical = self.canonical
+
+        if canonical is None:
+            return hash(self._symbol_map)
+
+        return hash(canonical)
+
+
+    def _log(self, *op):
+        """
+        Records an operation applied to the map
+        """
+        if self._ops is not None:
+            self._ops.append(op)
+
+
 
 class SymbolMap(ReadOnlySymbolMap):
+    # Changing a map would change its hash
+    __hash__ = None
+
+    # Operations that may be replayed by _from_ops
+    _OPS = (
+        "add_by_tags",
+        "remove_by_tags",
+        "add_by_range",
+        "remove_by_range",
+        "apply_selectors"
+    )
+
+    @staticmethod
+    def _from_ops(ops) -> SymbolMap:
+        """
+        Returns a shared map built by replaying recorded operations, 
+        cached like the maps of :py:meth:`from_selectors`
+        """
+        key = tuple(tuple(op) for op in ops)
+
+        with _selector_lock:
+            symbol_map = _selector_cache.get(key)
+
+            if symbol_map is not None:
+                _selector_cache.move_to_end(key)
+                return symbol_map
+
+        symbol_map = _SharedSymbolMap()
+
+        for name, *args in key:
+            if name not in SymbolMap._OPS:
+                raise ValueError(f"Unknown symbol map operation {name}")
+
+            getattr(SymbolMap, name)(symbol_map, *args)
+
+        return _cache_shared(key, symbol_map)
+
+
+    @staticmethod
+    def from_selectors(selectors: str) -> SymbolMap:
+        """
+        Returns a symbol map made with :py:meth:`apply_selectors` 
+        from an empty map. Maps are cached, so every call with the 
+        same selectors returns the same map. The map is shared and 
+        can't be changed, :py:meth:`copy` it to get one that can.
+
+        :param str selectors: The string of selectors to apply.
+
+        :rtype: SymbolMap
+
+        :raises TypeError: if selectors is not a str.
+        :raises ValueError: if the selectors string is invalid.
+        """
+
+        if not isinstance(selectors, str):
+            raise TypeError(f"selectors must be of type str. Got {type(selectors)}")
+
+        with _selector_lock:
+            symbol_map = _selector_cache.get(selectors)
+
+            if symbol_map is not None:
+                _selector_cache.move_to_end(selectors)
+                return symbol_map
+
+        # Parse outside the lock, invalid selectors raise here and aren't cached
+        symbol_map = _SharedSymbolMap()
+        SymbolMap.apply_selectors(symbol_map, selectors)
+
+        return _cache_shared(selectors, symbol_map)
+
+
     def add_by_tags(self, tags: SymbolTags):
         """
         Adds symbols matching the set of tags to the symbol map.
@@ -52,6 +269,8 @@ class SymbolMap(ReadOnlySymbolMap):
 
         _Chafa.chafa_symbol_map_add_by_tags(self._symbol_map, tags)
 
+        self._log("add_by_tags", int(tags))
+
     
     def remove_by_tags(self, tags: SymbolTags):
         """
@@ -60,11 +279,11 @@ class SymbolMap(ReadOnlySymbolMap):
         :param SymbolTags tags: The set of tags to remove from the map.
         """
 
-        # If we did not get passed a SymbolTags
-        # try to convert to SymbolTags which will give
+        # If we did not get passed a SymbolTags or a combination 
+        # of them try to convert to SymbolTags which will give
         # an appropriate error if invalid
-        if not isinstance(tags, SymbolTags):
-            tags = SymbolTags(SymbolTags)
+        if not isinstance(tags, int):
+            tags = SymbolTags(tags)
 
         # Set types
         _Chafa.chafa_symbol_map_remove_by_tags.argtypes = [
@@ -74,6 +293,8 @@ class SymbolMap(ReadOnlySymbolMap):
 
         _Chafa.chafa_symbol_map_remove_by_tags(self._symbol_map, tags)
 
+        self._log("remove_by_tags", int(tags))
+
     
     def add_by_range(self, first: str, last: str):
         """
@@ -116,6 +337,8 @@ class SymbolMap(ReadOnlySymbolMap):
             last
         )
 
+        self._log("add_by_range", first, last)
+
 
     def remove_by_range(self, first: str, last: str):
         """
@@ -156,6 +379,8 @@ class SymbolMap(ReadOnlySymbolMap):
             last
         )
 
+        self._log("remove_by_range", first, last)
+
     
     def apply_selectors(self, selectors: str):
         """
@@ -208,7 +433,8 @@ class SymbolMap(ReadOnlySymbolMap):
 
         _Chafa.chafa_symbol_map_apply_selectors.restype = ctypes.c_bool
 
-        selectors = ctypes.c_char_p(bytes(selectors, "utf8"))
+        selector_str = selectors
+        selectors    = ctypes.c_char_p(bytes(selector_str, "utf8"))
 
         # Init error
         error = ctypes.POINTER(GError)()
@@ -220,7 +446,50 @@ class SymbolMap(ReadOnlySymbolMap):
         )
         
         if not success:
-            error = error.contents.message.decode()
-            raise ValueError(error)
+            message = error.contents.message.decode()
+            _GLib.g_error_free(error)
+
+            raise ValueError(message)
+
+        # Absolute selectors clear the map first
+        if not selector_str.startswith(("+", "-")):
+            self._ops = []
+
+        self._log("apply_selectors", selector_str)
 
         return success
+
+
+
+def _cache_shared(key, symbol_map: SymbolMap) -> SymbolMap:
+    """
+    Caches a shared map under key, unless another thread beat us 
+    to it, and returns the cached map
+    """
+    with _selector_lock:
+        symbol_map = _selector_cache.setdefault(key, symbol_map)
+        _selector_cache.move_to_end(key)
+
+        if len(_selector_cache) > _SELECTOR_CACHE_SIZE:
+            _selector_cache.popitem(last=False)
+
+    return symbol_map
+
+
+class _SharedSymbolMap(SymbolMap):
+    """
+    A map from SymbolMap.from_selectors, shared by everyone
+    who asked for the same selectors
+    """
+
+    # Can't be changed, so safe to hash
+    __hash__ = ReadOnlySymbolMap.__hash__
+
+    def _frozen(self, *_):
+        raise TypeError("Symbol maps from SymbolMap.from_selectors are shared and can't be changed, change a copy() instead")
+
+    add_by_tags     = _frozen
+    remove_by_tags  = _frozen
+    add_by_range    = _frozen
+    remove_by_range = _frozen
+    apply_selectors = _frozen
@@ -1,9 +1,54 @@
 from __future__ import annotations
 import ctypes
+import os
+import threading
+from collections import OrderedDict
+from typing import Mapping, Optional
 
-from .libraries import _Chafa, _lib_glib
+from .libraries import _Chafa, _GLib
 from .term_info import TermInfo
 
+# The environment variables chafa looks at when detecting the terminal
+_TERM_ENVIRONMENT = (
+    "TERM",
+    "COLORTERM",
+    "TERM_PROGRAM",
+    "TERM_PROGRAM_VERSION",
+    "LC_TERMINAL",
+    "VTE_VERSION",
+    "KONSOLE_VERSION",
+    "KITTY_WINDOW_ID",
+    "WEZTERM_EXECUTABLE",
+    "ALACRITTY_SOCKET",
+    "WT_SESSION",
+    "ConEmuANSI",
+    "MLTERM",
+    "TMUX",
+    "STY",
+    "NVIM",
+    "INSIDE_EMACS",
+)
+
+# Detected TermInfos by term db, fallback and environment fingerprint,
+# least recently used first. Every custom environment gets its own 
+# entry, so only the most recent ones are kept
+_detect_cache      = OrderedDict()
+_detect_cache_lock = threading.Lock()
+_DETECT_CACHE_SIZE = 64
+
+
+def _environment_fingerprint(environment: Optional[Mapping[str, str]]=None) -> tuple:
+    """
+    The values of the environment variables that affect the outcome 
+    of terminal detection. Uses the process environment if 
+    environment is None.
+    """
+    if environment is None:
+        return tuple(os.environ.get(name) for name in _TERM_ENVIRONMENT)
+
+    # Anything could be in a custom environment, so all of it counts
+    return ("environment", frozenset(environment.items()))
+
 class TermDb():
     def __init__(self, no_defaults: bool=False):
         no_defaults = bool(no_defaults)
@@ -16,20 +61,80 @@ class TermDb():
             _Chafa.chafa_term_db_get_default.restype = ctypes.c_void_p
             self._term_db = _Chafa.chafa_term_db_get_default()
 
-    def detect(self):
+    def detect(self, environment: Optional[Mapping[str, str]]=None) -> TermInfo:
         """
+        :param Mapping environment: Environment variables to detect from instead of the system's.
+
         :rtype: TermInfo
 
         Builds a new :py:class:`TermInfo` with capabilities implied by 
         the system environment variables (principally the ``TERM`` 
         variable, but also others).
+
+        Detection results are cached for as long as the relevant 
+        environment variables stay the same, see 
+        :py:meth:`invalidate_detect_cache`.
+        """
+
+        if environment is not None:
+            environment = {str(name): str(value) for name, value in environment.items()}
+
+        return self._detect_cached(False, environment).copy()
+
+
+    @staticmethod
+    def invalidate_detect_cache():
+        """
+        Forgets all cached :py:meth:`detect` results. This is only 
+        needed if the terminal changes in a way that isn't reflected 
+        in the environment variables chafa looks at.
+        """
+        with _detect_cache_lock:
+            _detect_cache.clear()
+
+
+    def _detect_cached(self, fallback: bool, environment: Optional[Mapping[str, str]]=None) -> TermInfo:
         """
-        # Init glib
-        glib = ctypes.CDLL(_lib_glib)
-        glib.g_get_environ.restype = ctypes.c_void_p
+        Returns the shared, cached detection result, supplemented 
+        with fallback sequences if fallback is True. The returned 
+        :py:class:`TermInfo` must not be modified.
+        """
+
+        key = (self._term_db, fallback, _environment_fingerprint(environment))
+
+        with _detect_cache_lock:
+            term_info = _detect_cache.get(key)
+
+            if term_info is not None:
+                _detect_cache.move_to_end(key)
+
+                return term_info
+
+        term_info = self._detect(environment)
+
+        if fallback:
+            term_info.supplement(self.get_fallback_info())
+
+        with _detect_cache_lock:
+            term_info = _detect_cache.setdefault(key, term_info)
+            _detect_cache.move_to_end(key)
+
+            # Forget the least recently used result
+            if len(_detect_cache) > _DETECT_CACHE_SIZE:
+                _detect_cache.popitem(last=False)
+
+        return term_info
+
+
+    def _detect(self, environment: Optional[Mapping[str, str]]=None) -> TermInfo:
+        """
+        Wrapper for chafa_term_db_detect
+        """
+        if environment is not None:
+            return self._detect_from(environment)
 
         # Get environment
-        environment = glib.g_get_environ()
+        environment = _GLib.g_get_environ()
 
         _Chafa.chafa_term_db_detect.restype  = ctypes.c_void_p
         _Chafa.chafa_term_db_detect.argtypes = [
@@ -42,6 +147,34 @@ class TermDb():
             environment
         )
 
+        # chafa copies what it needs from the environment
+        _GLib.g_strfreev(environment)
+
+        term_info = TermInfo()
+        term_info._term_info = new_term_info
+
+        return term_info
+
+
+    def _detect_from(self, environment: Mapping[str, str]) -> TermInfo:
+        """
+        Wrapper for chafa_term_db_detect with a custom environment
+        """
+        # Build a NULL terminated envp
+        variables = [f"{name}={value}".encode() for name, value in environment.items()]
+        envp      = (ctypes.c_char_p * (len(variables) + 1))(*variables, None)
+
+        _Chafa.chafa_term_db_detect.restype  = ctypes.c_void_p
+        _Chafa.chafa_term_db_detect.argtypes = [
+            ctypes.c_void_p,
+            ctypes.c_void_p
+        ]
+
+        new_term_info = _Chafa.chafa_term_db_detect(
+            self._term_db,
+            ctypes.cast(envp, ctypes.c_void_p)
+        )
+
         term_info = TermInfo()
         term_info._term_info = new_term_info
 
@@ -1,19 +1,186 @@
 from __future__ import annotations
 import ctypes
 import os
+import json
+import hashlib
 import platform
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Iterable, Mapping, Union
 
-from .libraries import _Chafa
+from .libraries import _Chafa, _GLib
 from .chafa import get_device_attributes
 from .enums import *
 
+# The longest sequence chafa_term_info_emit_* can write, CHAFA_TERM_SEQ_LENGTH_MAX
+_SEQ_LENGTH_MAX = 96
+
+# Argument types of the typed chafa_term_info_emit_* function
+# for each sequence. Sequences not listed take no arguments.
+_EMIT_ARGTYPES = {
+    TermSeq.CHAFA_TERM_SEQ_CURSOR_TO_POS: (ctypes.c_uint,) * 2,
+    TermSeq.CHAFA_TERM_SEQ_CURSOR_UP:     (ctypes.c_uint,),
+    TermSeq.CHAFA_TERM_SEQ_CURSOR_DOWN:   (ctypes.c_uint,),
+    TermSeq.CHAFA_TERM_SEQ_CURSOR_LEFT:   (ctypes.c_uint,),
+    TermSeq.CHAFA_TERM_SEQ_CURSOR_RIGHT:  (ctypes.c_uint,),
+
+    TermSeq.CHAFA_TERM_SEQ_INSERT_CELLS: (ctypes.c_uint,),
+    TermSeq.CHAFA_TERM_SEQ_DELETE_CELLS: (ctypes.c_uint,),
+    TermSeq.CHAFA_TERM_SEQ_INSERT_ROWS:  (ctypes.c_uint,),
+    TermSeq.CHAFA_TERM_SEQ_DELETE_ROWS:  (ctypes.c_uint,),
+
+    TermSeq.CHAFA_TERM_SEQ_SET_SCROLLING_ROWS: (ctypes.c_uint,) * 2,
+
+    TermSeq.CHAFA_TERM_SEQ_SET_COLOR_FG_DIRECT:   (ctypes.c_uint8,) * 3,
+    TermSeq.CHAFA_TERM_SEQ_SET_COLOR_BG_DIRECT:   (ctypes.c_uint8,) * 3,
+    TermSeq.CHAFA_TERM_SEQ_SET_COLOR_FGBG_DIRECT: (ctypes.c_uint8,) * 6,
+
+    TermSeq.CHAFA_TERM_SEQ_SET_COLOR_FG_256:   (ctypes.c_uint8,),
+    TermSeq.CHAFA_TERM_SEQ_SET_COLOR_BG_256:   (ctypes.c_uint8,),
+    TermSeq.CHAFA_TERM_SEQ_SET_COLOR_FGBG_256: (ctypes.c_uint8,) * 2,
+
+    TermSeq.CHAFA_TERM_SEQ_SET_COLOR_FG_16:   (ctypes.c_uint8,),
+    TermSeq.CHAFA_TERM_SEQ_SET_COLOR_BG_16:   (ctypes.c_uint8,),
+    TermSeq.CHAFA_TERM_SEQ_SET_COLOR_FGBG_16: (ctypes.c_uint8,) * 2,
+
+    TermSeq.CHAFA_TERM_SEQ_SET_COLOR_FG_8:   (ctypes.c_uint8,),
+    TermSeq.CHAFA_TERM_SEQ_SET_COLOR_BG_8:   (ctypes.c_uint8,),
+    TermSeq.CHAFA_TERM_SEQ_SET_COLOR_FGBG_8: (ctypes.c_uint8,) * 2,
+
+    TermSeq.CHAFA_TERM_SEQ_BEGIN_SIXELS: (ctypes.c_uint,) * 3,
+    TermSeq.CHAFA_TERM_SEQ_REPEAT_CHAR:  (ctypes.c_uint,),
+
+    TermSeq.CHAFA_TERM_SEQ_BEGIN_KITTY_IMMEDIATE_IMAGE_V1: (ctypes.c_uint,) * 5,
+    TermSeq.CHAFA_TERM_SEQ_BEGIN_ITERM2_IMAGE:             (ctypes.c_uint,) * 2,
+}
+
+# Sequences whose typed function translates its arguments, e.g. 0-based 
+# cursor positions to 1-based ones or pens to SGR codes, unlike 
+# chafa_term_info_emit_seq. These stay on the variadic function so 
+# TermInfo.emit keeps passing arguments through as they are.
+_TRANSLATED_ARGS = frozenset((
+    TermSeq.CHAFA_TERM_SEQ_CURSOR_TO_POS,
+    TermSeq.CHAFA_TERM_SEQ_SET_SCROLLING_ROWS,
+    TermSeq.CHAFA_TERM_SEQ_SET_COLOR_FG_16,
+    TermSeq.CHAFA_TERM_SEQ_SET_COLOR_BG_16,
+    TermSeq.CHAFA_TERM_SEQ_SET_COLOR_FGBG_16,
+    TermSeq.CHAFA_TERM_SEQ_SET_COLOR_FG_8,
+    TermSeq.CHAFA_TERM_SEQ_SET_COLOR_BG_8,
+    TermSeq.CHAFA_TERM_SEQ_SET_COLOR_FGBG_8,
+))
+
+# The terminal's device attributes, queried at most once per process
+_device_attributes      = None
+_device_attributes_lock = threading.Lock()
+
+def _shared_device_attributes():
+    """
+    Returns the terminal's device attributes, 
+    querying the terminal only the first time.
+    """
+    global _device_attributes
+
+    with _device_attributes_lock:
+        if _device_attributes is None:
+            _device_attributes = get_device_attributes()
+
+        return _device_attributes
+
+
+# Environments of well known terminals, for TermInfo.from_profile
+_PROFILES = {
+    "dumb":            {"TERM": "dumb"},
+    "vt100":           {"TERM": "vt100"},
+    "linux":           {"TERM": "linux"},
+    "xterm":           {"TERM": "xterm"},
+    "xterm-256color":  {"TERM": "xterm-256color"},
+    "xterm-truecolor": {"TERM": "xterm-256color", "COLORTERM": "truecolor"},
+    "kitty":           {"TERM": "xterm-kitty", "KITTY_WINDOW_ID": "1"},
+    "foot":            {"TERM": "foot"},
+    "mlterm":          {"TERM": "mlterm", "MLTERM": "3.9.3"},
+    "wezterm":         {"TERM": "xterm-256color", "TERM_PROGRAM": "WezTerm"},
+    "iterm2":          {"TERM": "xterm-256color", "TERM_PROGRAM": "iTerm.app", "LC_TERMINAL": "iTerm2"},
+}
+
+# Bumped whenever the layout of saved profiles changes
+_PROFILE_VERSION = 1
+
+
+# Typed emit functions by sequence, None if libchafa doesn't have one
+_emitters = {}
+
+def _get_emitter(seq: TermSeq):
+    """
+    Returns the typed chafa_term_info_emit_* function for seq, 
+    with its prototype declared, or None if there is none or it 
+    translates its arguments.
+    """
+
+    try:
+        return _emitters[seq]
+
+    except KeyError:
+        pass
+
+    name = "chafa_term_info_emit_" + seq.name[len("CHAFA_TERM_SEQ_"):].lower()
+
+    try:
+        emitter = getattr(_Chafa, name)
+
+    except AttributeError:
+        emitter = None
+
+    if seq in _TRANSLATED_ARGS:
+        emitter = None
+
+    if emitter is not None:
+        emitter.argtypes = [
+            ctypes.c_void_p,
+            ctypes.c_void_p,
+            *_EMIT_ARGTYPES.get(seq, ())
+        ]
+
+        # Returns a pointer past the last byte written
+        emitter.restype = ctypes.c_void_p
+
+    _emitters[seq] = emitter
+
+    return emitter
+
+
 class TermInfo():
+    # How many parameterised sequences to remember per TermInfo
+    _EMIT_CACHE_SIZE = 4096
+
     def __init__(self):
         # Init term_info
         _Chafa.chafa_term_info_new.restype = ctypes.c_void_p
 
         self._term_info = _Chafa.chafa_term_info_new()
 
+        # Emitted sequences only change when sequences get supplemented
+        self._have_seq_cache = {}
+        self._seq_cache      = {}
+        self._param_cache    = OrderedDict()
+        self._capabilities   = None
+        self._digest         = None
+
+        # Profiles describe some other terminal, don't ask this one
+        self._allow_queries = True
+
+        # Typed emitters write into this
+        self._emit_buffer  = ctypes.create_string_buffer(_SEQ_LENGTH_MAX)
+        self._emit_address = ctypes.addressof(self._emit_buffer)
+
+
+    def _clear_caches(self):
+        self._have_seq_cache.clear()
+        self._seq_cache.clear()
+        self._param_cache.clear()
+        self._capabilities = None
+        self._digest       = None
+
 
     class TerminalCapabilities:
         def __init__(self, canvas_mode, pixel_mode):
@@ -47,9 +214,204 @@ class TermInfo():
         # Init new term_info
         term_info = TermInfo()
         term_info._term_info = new_pointer
+        term_info._allow_queries = self._allow_queries
 
         return term_info
 
+
+    @staticmethod
+    def from_profile(profile: Union[str, Mapping]) -> TermInfo:
+        """
+        Builds a :py:class:`TermInfo` for a known terminal without 
+        looking at the environment or querying the terminal. 
+
+        :param profile: The name of a built in profile, or a profile made by :py:meth:`to_profile`.
+        :type profile: str | Mapping
+
+        :raises ValueError: if the profile is unknown or malformed
+
+        :rtype: TermInfo
+        """
+
+        if isinstance(profile, str):
+            try:
+                environment = _PROFILES[profile]
+
+            except KeyError:
+                raise ValueError(f"Unknown profile {profile}, expected one of: {', '.join(_PROFILES)}")
+
+            from .term_db import TermDb
+
+            term_info = TermDb().detect(environment)
+            term_info._allow_queries = False
+
+            return term_info
+
+        if not isinstance(profile, Mapping):
+            raise TypeError(f"profile must be of type str or Mapping, not {type(profile)}")
+
+        if profile.get("version") != _PROFILE_VERSION:
+            raise ValueError(f"Unsupported profile version {profile.get('version')}")
+
+        term_info = TermInfo()
+        term_info._allow_queries = False
+
+        try:
+            for name, seq_str in profile["sequences"].items():
+                term_info._set_seq(TermSeq[name], seq_str.encode("utf8", "surrogateescape"))
+
+            capabilities = profile.get("capabilities")
+
+            if capabilities is not None:
+                term_info._capabilities = TermInfo.TerminalCapabilities(
+                    CanvasMode[capabilities["canvas_mode"]],
+                    PixelMode[capabilities["pixel_mode"]]
+                )
+
+        except (KeyError, AttributeError) as err:
+            raise ValueError(f"Malformed profile: {err}") from err
+
+        return term_info
+
+
+    def to_profile(self) -> dict:
+        """
+        Returns a JSON serialisable profile of this :py:class:`TermInfo`,
+        its sequences and its capabilities, that can be turned 
+        back into a :py:class:`TermInfo` with :py:meth:`from_profile`.
+
+        :rtype: dict
+        """
+
+        sequences = {}
+
+        for seq in TermSeq:
+            if seq == TermSeq.CHAFA_TERM_SEQ_MAX:
+                continue
+
+            seq_str = self._get_seq(seq)
+
+            if seq_str is not None:
+                sequences[seq.name] = seq_str.decode("utf8", "surrogateescape")
+
+        capabilities = self.detect_capabilities()
+
+        return {
+            "version":   _PROFILE_VERSION,
+            "sequences": sequences,
+            "capabilities": {
+                "canvas_mode": capabilities.canvas_mode.name,
+                "pixel_mode":  capabilities.pixel_mode.name
+            }
+        }
+
+
+    def _sequences_digest(self) -> str:
+        """
+        A hex digest of this TermInfo's sequences, the same for 
+        TermInfos that produce the same output in any process.
+        """
+
+        if self._digest is None:
+            sequences = []
+
+            for seq in TermSeq:
+                if seq == TermSeq.CHAFA_TERM_SEQ_MAX:
+                    continue
+
+                seq_str = self._get_seq(seq)
+                sequences.append(None if seq_str is None else seq_str.hex())
+
+            data = json.dumps(sequences, separators=(",", ":"))
+
+            self._digest = hashlib.sha256(data.encode()).hexdigest()
+
+        return self._digest
+
+
+    def save_profile(self, path: Union[str, Path]):
+        """
+        Saves the profile of this :py:class:`TermInfo` as JSON.
+
+        :param path: Where to save the profile.
+        :type path: str | Path
+        """
+
+        with open(path, "w") as f:
+            json.dump(self.to_profile(), f, indent=4)
+
+
+    @staticmethod
+    def load_profile(path: Union[str, Path]) -> TermInfo:
+        """
+        Builds a :py:class:`TermInfo` from a profile saved 
+        with :py:meth:`save_profile`.
+
+        :param path: The profile to load.
+        :type path: str | Path
+
+        :raises ValueError: if the profile is malformed
+
+        :rtype: TermInfo
+        """
+
+        with open(path) as f:
+            return TermInfo.from_profile(json.load(f))
+
+
+    def _get_seq(self, seq: TermSeq):
+        """
+        Wrapper for chafa_term_info_get_seq
+        """
+
+        _Chafa.chafa_term_info_get_seq.argtypes = [
+            ctypes.c_void_p,
+            ctypes.c_int
+        ]
+
+        # Owned by the term info
+        _Chafa.chafa_term_info_get_seq.restype = ctypes.c_char_p
+
+        return _Chafa.chafa_term_info_get_seq(self._term_info, seq)
+
+
+    def _set_seq(self, seq: TermSeq, seq_str: bytes):
+        """
+        Wrapper for chafa_term_info_set_seq
+        """
+
+        class GError(ctypes.Structure):
+            _fields_ = [('domain',   ctypes.c_uint32),
+                        ('code',     ctypes.c_int),
+                        ('message',  ctypes.c_char_p)]
+
+        _Chafa.chafa_term_info_set_seq.argtypes = [
+            ctypes.c_void_p,
+            ctypes.c_int,
+            ctypes.c_char_p,
+            ctypes.POINTER(ctypes.POINTER(GError))
+        ]
+
+        _Chafa.chafa_term_info_set_seq.restype = ctypes.c_bool
+
+        # Init error
+        error = ctypes.POINTER(GError)()
+
+        success = _Chafa.chafa_term_info_set_seq(
+            self._term_info,
+            seq,
+            seq_str,
+            ctypes.byref(error)
+        )
+
+        if not success:
+            message = error.contents.message.decode()
+            _GLib.g_error_free(error)
+
+            raise ValueError(f"Could not set {TermSeq(seq).name}: {message}")
+
+        self._clear_caches()
+
     
     def supplement(self, source: 'TermInfo'):
         """
@@ -78,6 +440,8 @@ class TermInfo():
 
         _Chafa.chafa_term_info_supplement(self._term_info, source)
 
+        self._clear_caches()
+
 
     def have_seq(self, seq: TermSeq) -> bool:
         """
@@ -88,6 +452,12 @@ class TermInfo():
         :rtype: bool
         """
 
+        try:
+            return self._have_seq_cache[seq]
+
+        except KeyError:
+            pass
+
         seq = TermSeq(seq)
 
         # Set types
@@ -99,7 +469,11 @@ class TermInfo():
         _Chafa.chafa_term_info_have_seq.restype = ctypes.c_bool
 
         # Check for sequence
-        return _Chafa.chafa_term_info_have_seq(self._term_info, seq)
+        have_seq = _Chafa.chafa_term_info_have_seq(self._term_info, seq)
+
+        self._have_seq_cache[seq] = have_seq
+
+        return have_seq
 
 
     def detect_capabilities(self) -> TerminalCapabilities:
@@ -107,6 +481,20 @@ class TermInfo():
         A function that tries to detect the capabilities of the
         terminal and return the appropriate canvas and pixel modes
         """
+        if self._capabilities is None:
+            self._capabilities = self._detect_capabilities()
+
+        # Hand out a copy so the cached one can't be modified
+        return self.TerminalCapabilities(
+            self._capabilities.canvas_mode,
+            self._capabilities.pixel_mode
+        )
+
+
+    def _detect_capabilities(self) -> TerminalCapabilities:
+        """
+        Detects the capabilities, bypassing the cache
+        """
         # === Canvas mode ===
 
         color_direct = self.have_seq(TermSeq.CHAFA_TERM_SEQ_SET_COLOR_FGBG_DIRECT) \
@@ -145,8 +533,8 @@ class TermInfo():
         terminal = os.environ.get("TERM", "")
         xterm_sixels = False
 
-        if "xterm" in terminal and platform.system() == "Linux":
-            attributes = get_device_attributes()
+        if self._allow_queries and "xterm" in terminal and platform.system() == "Linux":
+            attributes = _shared_device_attributes()
 
             xterm_sixels = 4 in attributes
 
@@ -181,6 +569,19 @@ class TermInfo():
         return terminal_capabilities
 
 
+    def compile(self) -> CompiledTermInfo:
+        """
+        Returns a :py:class:`CompiledTermInfo` that formats this 
+        :py:class:`TermInfo`'s sequences in Python, for use in tight loops.
+        Later changes to this :py:class:`TermInfo` are not reflected in it.
+
+        :rtype: CompiledTermInfo
+        """
+        from .compiled_term_info import CompiledTermInfo
+
+        return CompiledTermInfo(self)
+
+
     def emit(self, sequence: TermSeq, *args) -> bytes:
         """
         Returns the asked for terminal sequences as bytes.
@@ -189,6 +590,69 @@ class TermInfo():
 
         :rtype: bytes
         """
+
+        # Sequences without arguments never change
+        if not args:
+            try:
+                return self._seq_cache[sequence]
+
+            except KeyError:
+                pass
+
+            out = self._emit_uncached(sequence)
+            self._seq_cache[sequence] = out
+
+            return out
+
+        key = (sequence, *args)
+
+        try:
+            out = self._param_cache[key]
+            self._param_cache.move_to_end(key)
+
+            return out
+
+        except KeyError:
+            pass
+
+        out = self._emit_uncached(sequence, *args)
+
+        self._param_cache[key] = out
+
+        # Forget the least recently used sequence
+        if len(self._param_cache) > self._EMIT_CACHE_SIZE:
+            self._param_cache.popitem(last=False)
+
+        return out
+
+
+    def emit_many(self, sequences: Iterable) -> bytes:
+        """
+        Emits several sequences in one go and returns them joined together.
+        Sequences that take arguments are given as tuples, 
+        ``(TermSeq, arg1, arg2, ...)``.
+
+        :param Iterable sequences: The sequences to emit
+
+        :rtype: bytes
+        """
+
+        out = []
+
+        for sequence in sequences:
+            if isinstance(sequence, tuple):
+                out.append(self.emit(*sequence))
+
+            else:
+                out.append(self.emit(sequence))
+
+        return b"".join(out)
+
+
+    def _emit_uncached(self, sequence: TermSeq, *args) -> bytes:
+        """
+        Emits a sequence, bypassing the caches
+        """
         # Make sure we have a terminal sequence
         sequence = TermSeq(sequence)
 
@@ -196,17 +660,34 @@ class TermInfo():
         if not self.have_seq(sequence):
             raise ValueError(f"Your terminal does not appear the sequence {sequence.name}")
         
-        # Terminate the args
-        args = (*args, -1)
+        emitter = _get_emitter(sequence)
+
+        if emitter is not None:
+            argtypes = _EMIT_ARGTYPES.get(sequence, ())
+
+            if len(args) != len(argtypes):
+                raise TypeError(f"{sequence.name} takes {len(argtypes)} arguments, not {len(args)}")
+
+            args = [int(arg) for arg in args]
+
+            # ctypes silently wraps values that don't fit
+            for arg, argtype in zip(args, argtypes):
+                limit = (1 << 8 * ctypes.sizeof(argtype)) - 1
 
-        # Grab the sequence
+                if arg < 0 or limit < arg:
+                    raise ValueError(f"Arguments of {sequence.name} must be in range [0,{limit}], not {arg}")
+
+            end = emitter(self._term_info, self._emit_address, *args)
+
+            return ctypes.string_at(self._emit_address, end - self._emit_address)
+
+        # Fall back on the variadic chafa_term_info_emit_seq
         out = self._emit_seq(sequence, *args)
 
         # Check if we actually got anything
         if out is None:
             raise TypeError(f"Wrong number of arguments passed for sequence {sequence.name}")
 
-
         return out
 
 
@@ -220,9 +701,19 @@ class TermInfo():
             ctypes.c_int
         ]
 
-        _Chafa.chafa_term_info_emit_seq.restype  = ctypes.c_char_p
+        # Returns a newly allocated string we have to free
+        _Chafa.chafa_term_info_emit_seq.restype  = ctypes.c_void_p
+
+        # The arguments are gints terminated by -1
+        args = [ctypes.c_int(int(arg)) for arg in args]
+        args.append(ctypes.c_int(-1))
 
         res = _Chafa.chafa_term_info_emit_seq(self._term_info, seq, *args)
 
-        return res
-    
+        if res is None:
+            return None
+
+        out = ctypes.string_at(res)
+        _GLib.g_free(res)
+
+        return out
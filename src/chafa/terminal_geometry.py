@@ -0,0 +1,248 @@
+from __future__ import annotations
+import os
+import sys
+import signal
+import threading
+from io import UnsupportedOperation
+from typing import Callable, Optional, Tuple
+
+from .chafa import query_terminal, TerminalQueryResult, DEFAULT_TIMEOUT
+from .canvas_config import CanvasConfig
+
+
+class TerminalGeometry:
+    """
+    The terminal's size in character cells and pixels, queried once
+    and cached. The terminal is only queried again after a ``SIGWINCH``
+    or when :py:func:`os.get_terminal_size` reports a different size.
+
+    :param Callable callback: Called with the :py:class:`TerminalGeometry` whenever the geometry changes.
+    :param float timeout: How long to wait for the terminal to reply to queries, in seconds.
+    :param bool watch: Install a ``SIGWINCH`` handler. The previously installed handler is still called.
+    """
+
+    def __init__(
+        self,
+        callback: Optional[Callable[[TerminalGeometry], None]]=None,
+        timeout: float=DEFAULT_TIMEOUT,
+        watch: bool=True
+    ):
+        self._callback = callback
+        self._timeout  = float(timeout)
+
+        self._lock   = threading.Lock()
+        self._dirty  = True
+        self._size   = None
+        self._result = TerminalQueryResult()
+
+        self._previous_handler = None
+        self._watching         = False
+
+        if watch:
+            self._watch()
+
+
+    def __enter__(self):
+        return self
+
+
+    def __exit__(self, *_):
+        self.close()
+
+
+    def _watch(self):
+        """
+        Installs our SIGWINCH handler, keeping the previous one around.
+        """
+
+        if not hasattr(signal, "SIGWINCH"):
+            return
+
+        # Signal handlers can only be installed from the main thread
+        if threading.current_thread() is not threading.main_thread():
+            return
+
+        self._previous_handler = signal.signal(signal.SIGWINCH, self._on_resize)
+        self._watching         = True
+
+
+    def _on_resize(self, signum, frame):
+        # Querying the terminal from a signal handler is a bad idea,
+        # so just remember to do it on next access
+        self._dirty = True
+
+        if callable(self._previous_handler):
+            self._previous_handler(signum, frame)
+
+
+    def close(self):
+        """
+        Restores the ``SIGWINCH`` handler that was installed before this
+        :py:class:`TerminalGeometry` was created.
+        """
+
+        if not self._watching:
+            return
+
+        # Don't clobber a handler someone installed after us
+        if signal.getsignal(signal.SIGWINCH) == self._on_resize:
+            previous = self._previous_handler
+
+            signal.signal(
+                signal.SIGWINCH,
+                signal.SIG_DFL if previous is None else previous
+            )
+
+        self._watching = False
+
+
+    @staticmethod
+    def _get_terminal_size() -> Optional[Tuple[int, int]]:
+        """
+        The terminal's size in character cells according
+        to the os, ``(height, width)``.
+        """
+        try:
+            columns, lines = os.get_terminal_size(sys.stdout.fileno())
+
+        except (OSError, ValueError, AttributeError, UnsupportedOperation):
+            return None
+
+        return (lines, columns)
+
+
+    def refresh(self, force: bool=False) -> bool:
+        """
+        Queries the terminal again if it was resized since the last query.
+
+        :param bool force: Query the terminal even if it was not resized.
+
+        :returns: Whether the geometry changed.
+        :rtype: bool
+        """
+
+        with self._lock:
+            size = self._get_terminal_size()
+
+            if not (force or self._dirty or size != self._size):
+                return False
+
+            self._dirty = False
+            self._size  = size
+
+            result  = query_terminal(self._timeout)
+            changed = result != self._result
+
+            self._result = result
+
+        if changed and self._callback is not None:
+            self._callback(self)
+
+        return changed
+
+
+    @property
+    def terminal_geometry(self) -> Tuple[int, ...]:
+        """
+        :type: (int, int)
+
+        The size of the terminal in character cells, ``(height, width)``.
+        Falls back to :py:func:`os.get_terminal_size` if the terminal
+        does not report it. Empty if neither knows.
+        """
+        self.refresh()
+
+        if self._result.terminal_geometry:
+            return self._result.terminal_geometry
+
+        return self._size or tuple()
+
+
+    @property
+    def pixel_geometry(self) -> Tuple[int, ...]:
+        """
+        :type: (int, int)
+
+        The size of the terminal in pixels, ``(height, width)``.
+        Empty if the terminal does not report it.
+        """
+        self.refresh()
+
+        return self._result.pixel_geometry
+
+
+    @property
+    def cell_geometry(self) -> Tuple[int, ...]:
+        """
+        :type: (int, int)
+
+        The size of a character cell in pixels, ``(height, width)``.
+        Empty if the terminal does not report it.
+        """
+        self.refresh()
+
+        return self._result.cell_geometry
+
+
+    @property
+    def font_ratio(self) -> Optional[float]:
+        """
+        :type: float | None
+
+        The width of a character cell divided by its height,
+        or None if the cell geometry is unknown.
+        """
+        cell_geometry = self.cell_geometry
+
+        if not cell_geometry or cell_geometry[0] == 0:
+            return None
+
+        height, width = cell_geometry
+
+        return width / height
+
+
+    def update_config(
+        self,
+        config: CanvasConfig,
+        src_width: int,
+        src_height: int,
+        zoom: bool=False,
+        stretch: bool=False,
+        font_ratio: float=0.5
+    ):
+        """
+        Sizes a :py:class:`CanvasConfig` for an image to fit the terminal
+        using :py:meth:`CanvasConfig.calc_canvas_geometry`. The config's
+        cell geometry is set too, if known.
+
+        :param CanvasConfig config: The config to update.
+        :param int src_width: Width of the input image in pixels.
+        :param int src_height: Height of the input image in pixels.
+        :param bool zoom: Upscale the image to fit the canvas.
+        :param bool stretch: Ignore the aspect ratio of source.
+        :param float font_ratio: The font ratio to use if the cell geometry is unknown.
+
+        :raises TypeError: if config is not a :py:class:`CanvasConfig`
+        """
+
+        if not isinstance(config, CanvasConfig):
+            raise TypeError(f"config must be of type CanvasConfig, not {type(config)}")
+
+        terminal_geometry = self.terminal_geometry
+        cell_geometry     = self.cell_geometry
+
+        if terminal_geometry:
+            config.height, config.width = terminal_geometry
+
+        if cell_geometry:
+            config.cell_height, config.cell_width = cell_geometry
+            font_ratio = self.font_ratio
+
+        config.calc_canvas_geometry(
+            src_width,
+            src_height,
+            font_ratio,
+            zoom,
+            stretch
+        )
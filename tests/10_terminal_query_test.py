@@ -0,0 +1,41 @@
+from chafa import *
+from chafa.chafa import _parse_replies, TerminalQueryResult
+
+
+def test_parse_all_replies():
+    replies = b"\033[4;600;800t\033[8;30;100t\033[?62;4;22c"
+    result  = _parse_replies(replies)
+
+    assert result.device_attributes == (62, 4, 22)
+    assert result.pixel_geometry    == (600, 800)
+    assert result.terminal_geometry == (30, 100)
+    assert result.cell_geometry     == (20, 8)
+
+
+def test_parse_partial_replies():
+    # Terminal ignored the size queries
+    result = _parse_replies(b"\033[?1;2c")
+
+    assert result.device_attributes == (1, 2)
+    assert result.pixel_geometry    == ()
+    assert result.cell_geometry     == ()
+
+
+def test_parse_no_replies():
+    assert _parse_replies(b"") == TerminalQueryResult()
+
+
+def test_query_without_terminal():
+    # Pytest replaces stdin, so nothing can be queried
+    result = query_terminal(timeout=0.1)
+
+    assert result == TerminalQueryResult()
+    assert get_cell_geometry(timeout=0.1) == ()
+
+
+def test_probe_without_terminal():
+    import asyncio
+
+    result = asyncio.run(probe_terminal(timeout=0.1))
+
+    assert result == TerminalQueryResult()
@@ -0,0 +1,81 @@
+import os
+import signal
+
+import pytest
+
+from chafa import terminal_geometry
+from chafa import *
+from chafa.chafa import TerminalQueryResult
+
+REPLY = TerminalQueryResult(
+    device_attributes = (62, 4),
+    terminal_geometry = (30, 100),
+    pixel_geometry    = (600, 800)
+)
+
+
+@pytest.fixture
+def queries(monkeypatch):
+    calls = []
+
+    def fake_query(timeout):
+        calls.append(timeout)
+        return REPLY
+
+    monkeypatch.setattr(terminal_geometry, "query_terminal", fake_query)
+
+    return calls
+
+
+def test_geometry_is_cached(queries):
+    geometry = TerminalGeometry(watch=False)
+
+    assert geometry.cell_geometry     == (20, 8)
+    assert geometry.terminal_geometry == (30, 100)
+    assert geometry.pixel_geometry    == (600, 800)
+    assert geometry.font_ratio        == 8/20
+
+    assert len(queries) == 1
+
+
+def test_callback(queries):
+    changes = []
+    geometry = TerminalGeometry(callback=changes.append, watch=False)
+
+    assert geometry.refresh()
+    assert not geometry.refresh(force=True)
+
+    assert changes == [geometry]
+    assert len(queries) == 2
+
+
+@pytest.mark.skipif(not hasattr(signal, "SIGWINCH"), reason="no SIGWINCH")
+def test_sigwinch(queries):
+    previous = []
+    signal.signal(signal.SIGWINCH, lambda *args: previous.append(args))
+
+    with TerminalGeometry() as geometry:
+        geometry.cell_geometry
+        geometry.cell_geometry
+        assert len(queries) == 1
+
+        os.kill(os.getpid(), signal.SIGWINCH)
+
+        geometry.cell_geometry
+        assert len(queries) == 2
+
+    # Previous handler was chained and restored
+    assert len(previous) == 1
+    assert signal.getsignal(signal.SIGWINCH) is not geometry._on_resize
+
+    signal.signal(signal.SIGWINCH, signal.SIG_DFL)
+
+
+def test_update_config(queries):
+    config = CanvasConfig()
+    TerminalGeometry(watch=False).update_config(config, 800, 600)
+
+    assert config.cell_width  == 8
+    assert config.cell_height == 20
+    assert 0 < config.width  <= 100
+    assert 0 < config.height <= 30
@@ -0,0 +1,99 @@
+import pytest
+
+from chafa import *
+
+
+def xterm_info(monkeypatch):
+    monkeypatch.setenv("TERM", "xterm-256color")
+
+    return TermDb().detect()
+
+
+def test_emit_cache(monkeypatch):
+    info = xterm_info(monkeypatch)
+
+    reset = info.emit(TermSeq.CHAFA_TERM_SEQ_RESET_ATTRIBUTES)
+    assert reset == info._emit_uncached(TermSeq.CHAFA_TERM_SEQ_RESET_ATTRIBUTES)
+    assert info.emit(TermSeq.CHAFA_TERM_SEQ_RESET_ATTRIBUTES) is reset
+
+    move = info.emit(TermSeq.CHAFA_TERM_SEQ_CURSOR_TO_POS, 4, 2)
+    assert move == info._emit_uncached(TermSeq.CHAFA_TERM_SEQ_CURSOR_TO_POS, 4, 2)
+    assert move != info.emit(TermSeq.CHAFA_TERM_SEQ_CURSOR_TO_POS, 2, 4)
+
+
+def test_emit_lru_is_bounded(monkeypatch):
+    info = xterm_info(monkeypatch)
+    info._EMIT_CACHE_SIZE = 2
+
+    for x in range(10):
+        info.emit(TermSeq.CHAFA_TERM_SEQ_CURSOR_TO_POS, x, 0)
+
+    assert len(info._param_cache) == 2
+
+
+def test_emit_many(monkeypatch):
+    info = xterm_info(monkeypatch)
+
+    sequences = [
+        (TermSeq.CHAFA_TERM_SEQ_CURSOR_TO_POS, 1, 1),
+        TermSeq.CHAFA_TERM_SEQ_RESET_ATTRIBUTES,
+        (TermSeq.CHAFA_TERM_SEQ_SET_COLOR_FG_DIRECT, 255, 0, 0)
+    ]
+
+    expected = b"".join(
+        info.emit(*seq) if isinstance(seq, tuple) else info.emit(seq)
+        for seq in sequences
+    )
+
+    assert info.emit_many(sequences) == expected
+
+
+def test_supplement_clears_cache(monkeypatch):
+    monkeypatch.setenv("TERM", "dumb")
+    info = TermDb().detect()
+
+    assert not info.have_seq(TermSeq.CHAFA_TERM_SEQ_SET_COLOR_FG_DIRECT)
+
+    info.supplement(xterm_info(monkeypatch))
+
+    assert info.have_seq(TermSeq.CHAFA_TERM_SEQ_SET_COLOR_FG_DIRECT)
+
+
+def test_typed_emit_matches_variadic(monkeypatch):
+    info = xterm_info(monkeypatch)
+
+    sequences = [
+        (TermSeq.CHAFA_TERM_SEQ_RESET_ATTRIBUTES,),
+        (TermSeq.CHAFA_TERM_SEQ_CURSOR_TO_POS, 12, 34),
+        (TermSeq.CHAFA_TERM_SEQ_CURSOR_UP, 3),
+        (TermSeq.CHAFA_TERM_SEQ_SET_COLOR_FG_DIRECT, 1, 128, 255),
+        (TermSeq.CHAFA_TERM_SEQ_SET_COLOR_FGBG_256, 17, 231),
+    ]
+
+    for sequence, *args in sequences:
+        assert info._emit_uncached(sequence, *args) == info._emit_seq(sequence, *args)
+
+
+def test_typed_emit_arity(monkeypatch):
+    info = xterm_info(monkeypatch)
+
+    try:
+        info.emit(TermSeq.CHAFA_TERM_SEQ_CURSOR_TO_POS, 1)
+        assert False
+
+    except TypeError:
+        pass
+
+
+def test_typed_emit_out_of_range(monkeypatch):
+    info = xterm_info(monkeypatch)
+
+    # Too big for the typed function's guint8, which would wrap it to 44
+    with pytest.raises(ValueError):
+        info.emit(TermSeq.CHAFA_TERM_SEQ_SET_COLOR_FG_256, 300)
+
+    with pytest.raises(ValueError):
+        info.emit(TermSeq.CHAFA_TERM_SEQ_CURSOR_UP, -1)
+
+    assert info.emit(TermSeq.CHAFA_TERM_SEQ_SET_COLOR_FG_256, 255) == \
+        info._emit_seq(TermSeq.CHAFA_TERM_SEQ_SET_COLOR_FG_256, 255)
@@ -0,0 +1,60 @@
+import random
+
+from chafa import *
+from chafa.term_info import _EMIT_ARGTYPES
+
+
+def check_against_libchafa():
+    info     = TermDb().detect()
+    compiled = info.compile()
+
+    rng = random.Random(0)
+
+    for seq in compiled.sequences:
+        arity = len(_EMIT_ARGTYPES.get(seq, ()))
+
+        for _ in range(50):
+            args = [rng.randrange(256) for _ in range(arity)]
+
+            assert compiled.emit(seq, *args) == info._emit_uncached(seq, *args), seq.name
+
+
+def test_xterm(monkeypatch):
+    monkeypatch.setenv("TERM", "xterm-256color")
+    check_against_libchafa()
+
+    compiled = TermDb().detect().compile()
+
+    # The hot sequences are formatted in Python
+    for seq in (
+        TermSeq.CHAFA_TERM_SEQ_CURSOR_TO_POS,
+        TermSeq.CHAFA_TERM_SEQ_SET_COLOR_FG_DIRECT,
+        TermSeq.CHAFA_TERM_SEQ_SET_COLOR_BG_256,
+        TermSeq.CHAFA_TERM_SEQ_RESET_ATTRIBUTES
+    ):
+        assert seq in compiled.sequences
+
+    # libchafa clamps large arguments
+    to_pos = TermSeq.CHAFA_TERM_SEQ_CURSOR_TO_POS
+
+    assert compiled.emit(to_pos, 20000, 5) == TermDb().detect()._emit_uncached(to_pos, 20000, 5)
+
+
+def test_kitty(monkeypatch):
+    monkeypatch.setenv("TERM", "xterm-kitty")
+    check_against_libchafa()
+
+
+def test_emit_many(monkeypatch):
+    monkeypatch.setenv("TERM", "xterm-256color")
+
+    info     = TermDb().detect()
+    compiled = info.compile()
+
+    sequences = [
+        (TermSeq.CHAFA_TERM_SEQ_CURSOR_TO_POS, 80, 24),
+        TermSeq.CHAFA_TERM_SEQ_RESET_ATTRIBUTES,
+        (TermSeq.CHAFA_TERM_SEQ_SET_COLOR_FGBG_DIRECT, 1, 2, 3, 4, 5, 6)
+    ]
+
+    assert compiled.emit_many(sequences) == info.emit_many(sequences)
@@ -0,0 +1,59 @@
+import pytest
+
+from chafa import *
+from chafa import term_info as term_info_module
+
+
+def test_detect_environment(monkeypatch):
+    monkeypatch.setenv("TERM", "dumb")
+
+    info = TermDb().detect({"TERM": "xterm-kitty"})
+
+    assert info.have_seq(TermSeq.CHAFA_TERM_SEQ_BEGIN_KITTY_IMMEDIATE_IMAGE_V1)
+    assert not TermDb().detect().have_seq(TermSeq.CHAFA_TERM_SEQ_BEGIN_KITTY_IMMEDIATE_IMAGE_V1)
+
+
+def test_named_profile(monkeypatch):
+    def no_queries():
+        raise AssertionError("terminal was queried")
+
+    monkeypatch.setattr(term_info_module, "get_device_attributes", no_queries)
+    monkeypatch.setattr(term_info_module, "_device_attributes", None)
+    monkeypatch.setenv("TERM", "xterm-256color")
+
+    kitty = TermInfo.from_profile("kitty")
+    assert kitty.detect_capabilities().pixel_mode == PixelMode.CHAFA_PIXEL_MODE_KITTY
+
+    xterm = TermInfo.from_profile("xterm-256color")
+    xterm.detect_capabilities()
+
+    with pytest.raises(ValueError):
+        TermInfo.from_profile("not a terminal")
+
+
+def test_profile_round_trip(tmp_path):
+    info = TermInfo.from_profile("xterm-truecolor")
+    path = tmp_path / "profile.json"
+
+    info.save_profile(path)
+    loaded = TermInfo.load_profile(path)
+
+    assert loaded.to_profile() == info.to_profile()
+    assert loaded.detect_capabilities() == info.detect_capabilities()
+
+    for seq in (
+        (TermSeq.CHAFA_TERM_SEQ_CURSOR_TO_POS, 3, 7),
+        (TermSeq.CHAFA_TERM_SEQ_SET_COLOR_FG_DIRECT, 10, 20, 30),
+        (TermSeq.CHAFA_TERM_SEQ_RESET_ATTRIBUTES,)
+    ):
+        assert loaded.emit(*seq) == info.emit(*seq)
+
+
+def test_malformed_profile():
+    with pytest.raises(ValueError) as error:
+        TermInfo.from_profile({"version": 1, "sequences": {"NOT_A_SEQUENCE": ""}})
+
+    assert isinstance(error.value.__cause__, KeyError)
+
+    with pytest.raises(ValueError):
+        TermInfo.from_profile({"version": 0})
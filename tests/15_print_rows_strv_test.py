@@ -0,0 +1,57 @@
+from chafa import *
+from chafa.loader import Loader
+
+from pathlib import Path
+
+
+def snake_canvas():
+    config = CanvasConfig()
+
+    config.height = 20
+    config.width  = 20
+
+    image = Loader(Path(__file__).parent / "snake.jpg")
+
+    canvas = Canvas(config)
+    canvas.draw_all_pixels(
+        image.pixel_type,
+        image.get_pixels(),
+        image.width,
+        image.height,
+        image.rowstride
+    )
+
+    return canvas
+
+
+def test_print_rows_strv():
+    canvas    = snake_canvas()
+    term_info = TermDb().get_fallback_info()
+
+    rows = canvas.print_rows_strv(term_info)
+
+    assert len(rows) == 20
+    assert rows == list(canvas.print_rows(term_info))
+
+
+def test_print_rows_strv_buffers():
+    canvas    = snake_canvas()
+    term_info = TermDb().get_fallback_info()
+
+    # Too many buffers to begin with
+    buffers = [bytearray() for _ in range(25)]
+
+    changed = canvas.print_rows_strv(term_info, out=buffers)
+
+    assert changed == list(range(20))
+    assert buffers == canvas.print_rows_strv(term_info)
+
+    first_row = buffers[0]
+
+    # Nothing changed, so nothing is rewritten
+    assert canvas.print_rows_strv(term_info, out=buffers) == []
+
+    canvas[0, 0].char = "x"
+
+    assert canvas.print_rows_strv(term_info, out=buffers) == [0]
+    assert buffers[0] is first_row
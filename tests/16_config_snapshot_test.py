@@ -0,0 +1,62 @@
+import pickle
+
+from chafa import *
+
+
+def make_config():
+    config = CanvasConfig()
+
+    config.width       = 40
+    config.height      = 20
+    config.canvas_mode = CanvasMode.CHAFA_CANVAS_MODE_INDEXED_240
+    config.dither_mode = DitherMode.CHAFA_DITHER_MODE_ORDERED
+    config.work_factor = 0.25
+    config.fg_color    = (10, 20, 30)
+
+    symbol_map = SymbolMap()
+    symbol_map.apply_selectors("block+border")
+    config.set_symbol_map(symbol_map)
+
+    return config
+
+
+def test_snapshot_is_hashable_and_picklable():
+    snapshot = make_config().snapshot()
+
+    assert snapshot == make_config().snapshot()
+    assert hash(snapshot) == hash(make_config().snapshot())
+
+    assert pickle.loads(pickle.dumps(snapshot)) == snapshot
+    assert snapshot.digest == make_config().snapshot().digest
+
+
+def test_from_snapshot():
+    snapshot = make_config().snapshot()
+    config   = CanvasConfig.from_snapshot(snapshot)
+
+    assert config.snapshot() == snapshot
+    assert config.width == 40
+    assert config.canvas_mode == CanvasMode.CHAFA_CANVAS_MODE_INDEXED_240
+
+
+def test_symbol_maps_change_digest():
+    config  = make_config()
+    default = CanvasConfig().snapshot()
+
+    symbol_map = SymbolMap()
+    symbol_map.apply_selectors("block+border")
+    symbol_map.remove_by_tags(SymbolTags.CHAFA_SYMBOL_TAG_BORDER)
+
+    other = config.copy()
+    other.set_symbol_map(symbol_map)
+
+    assert other.snapshot().digest != config.snapshot().digest
+    assert default.symbol_map is None
+
+
+def test_peek_config_snapshot():
+    config = make_config()
+    canvas = Canvas(config)
+
+    assert canvas.peek_config().snapshot() == config.snapshot()
+    assert canvas.new_similar().peek_config().snapshot() == config.snapshot()
@@ -0,0 +1,78 @@
+import pytest
+
+from chafa import *
+
+
+def test_kwargs_match_setters():
+    bulk = CanvasConfig(
+        width       = 30,
+        height      = 15,
+        canvas_mode = CanvasMode.CHAFA_CANVAS_MODE_INDEXED_16,
+        work_factor = 0.75,
+        bg_color    = (1, 2, 3),
+        dither_width = 2
+    )
+
+    config = CanvasConfig()
+    config.width        = 30
+    config.height       = 15
+    config.canvas_mode  = CanvasMode.CHAFA_CANVAS_MODE_INDEXED_16
+    config.work_factor  = 0.75
+    config.bg_color     = (1, 2, 3)
+    config.dither_width = 2
+
+    assert bulk.snapshot() == config.snapshot()
+
+
+def test_from_dict_enum_names():
+    config = CanvasConfig.from_dict({
+        "pixel_mode":    "CHAFA_PIXEL_MODE_SIXELS",
+        "optimizations": ["CHAFA_OPTIMIZATION_REUSE_ATTRIBUTES"]
+    })
+
+    assert config.pixel_mode == PixelMode.CHAFA_PIXEL_MODE_SIXELS
+    assert config.optimizations == (Optimizations.CHAFA_OPTIMIZATION_REUSE_ATTRIBUTES,)
+
+
+def test_validation_is_all_or_nothing():
+    config = CanvasConfig(width=20)
+
+    with pytest.raises(ValueError):
+        config.copy_with(width=50, work_factor=2)
+
+    with pytest.raises(TypeError):
+        CanvasConfig(not_a_setting=1)
+
+    assert config.width == 20
+
+
+def test_bulk_and_setters_reject_alike():
+    invalid = [
+        ("width",            "wide"),
+        ("pixel_mode",       "CHAFA_NOT_A_MODE"),
+        ("pixel_mode",       100),
+        ("dither_intensity", -1),
+        ("work_factor",      1.5),
+        ("optimizations",    7),
+        ("preprocessing",    None),
+        ("fg_color",         "white"),
+        ("bg_color",         (1, 2)),
+        ("bg_color",         (1, 2, 300)),
+    ]
+
+    for name, value in invalid:
+        with pytest.raises((TypeError, ValueError)) as bulk:
+            CanvasConfig(**{name: value})
+
+        with pytest.raises((TypeError, ValueError)) as setter:
+            setattr(CanvasConfig(), name, value)
+
+        assert bulk.type is setter.type, name
+
+
+def test_copy_with():
+    config = CanvasConfig(width=20, height=10)
+    other  = config.copy_with(height=5)
+
+    assert (other.width, other.height) == (20, 5)
+    assert (config.width, config.height) == (20, 10)
@@ -0,0 +1,102 @@
+from chafa import *
+
+
+def make_config():
+    config = CanvasConfig()
+
+    config.width  = 10
+    config.height = 5
+
+    return config
+
+
+def make_pixels(value):
+    return bytes([value, 0, 0, 255] * 16 * 16)
+
+
+def render(cache, config, pixels, term_info):
+    return cache.render(
+        config,
+        PixelType.CHAFA_PIXEL_RGBA8_UNASSOCIATED,
+        pixels,
+        16, 16,
+        16 * 4,
+        term_info
+    )
+
+
+def test_hits_match_canvas_output():
+    term_info = TermDb().get_fallback_info()
+    config    = make_config()
+    pixels    = make_pixels(200)
+
+    canvas = Canvas(config)
+    canvas.draw_all_pixels(
+        PixelType.CHAFA_PIXEL_RGBA8_UNASSOCIATED,
+        pixels,
+        16, 16,
+        16 * 4
+    )
+
+    expected = canvas.print(term_info)
+    cache    = RenderCache()
+
+    assert render(cache, config, pixels, term_info) == expected
+    assert render(cache, config.snapshot(), pixels, term_info) == expected
+
+    stats = cache.stats
+
+    assert stats.hits == 1
+    assert stats.misses == 1
+    assert stats.entries == 1
+    assert stats.size == len(expected)
+
+
+def test_key_changes():
+    term_info = TermDb().get_fallback_info()
+    config    = make_config()
+    pixels    = make_pixels(200)
+
+    pixel_type = PixelType.CHAFA_PIXEL_RGBA8_UNASSOCIATED
+    key        = RenderCache.key(config, pixel_type, pixels, 16, 16, 64, term_info)
+
+    other_config = make_config()
+    other_config.width = 11
+
+    assert key == RenderCache.key(make_config(), pixel_type, bytearray(pixels), 16, 16, 64, term_info)
+    assert key != RenderCache.key(config, pixel_type, make_pixels(201), 16, 16, 64, term_info)
+    assert key != RenderCache.key(other_config, pixel_type, pixels, 16, 16, 64, term_info)
+    assert key != RenderCache.key(config, pixel_type, pixels, 16, 16, 64, TermInfo.from_profile("vt100"))
+
+
+def test_lru_eviction():
+    cache = RenderCache(max_bytes=10)
+
+    cache.put("a", b"aaaa")
+    cache.put("b", b"bbbb")
+
+    # Touch a so that b is evicted first
+    assert cache.get("a") == b"aaaa"
+
+    cache.put("c", b"cccc")
+
+    assert "a" in cache
+    assert "b" not in cache
+    assert "c" in cache
+
+    # Too big to ever fit
+    cache.put("d", b"d" * 11)
+
+    assert "d" not in cache
+    assert cache.stats.evictions == 1
+    assert cache.stats.size == 8
+
+
+def test_read_only_config():
+    term_info = TermDb().get_fallback_info()
+    config    = Canvas(make_config()).peek_config()
+    pixels    = make_pixels(120)
+
+    cache = RenderCache()
+
+    assert render(cache, config, pixels, term_info) == render(RenderCache(), make_config(), pixels, term_info)
@@ -0,0 +1,100 @@
+import os
+import hashlib
+
+from chafa import *
+
+
+def make_key(value):
+    return hashlib.sha256(str(value).encode()).hexdigest()
+
+
+def test_put_get(tmp_path):
+    store = DiskRenderStore(tmp_path)
+
+    store.put(make_key(1), b"output")
+
+    assert make_key(1) in store
+    assert store.get(make_key(1)) == b"output"
+    assert store.get(make_key(2)) is None
+
+    # Visible to another store on the same directory
+    assert DiskRenderStore(tmp_path).get(make_key(1)) == b"output"
+
+    store.clear()
+
+    assert store.get(make_key(1)) is None
+
+
+def test_eviction(tmp_path):
+    store = DiskRenderStore(tmp_path, max_bytes=1000)
+
+    for i in range(20):
+        store.put(make_key(i), b"x" * 100)
+
+    assert store._scan_size() <= 1000
+    assert store.get(make_key(19)) == b"x" * 100
+
+
+def test_overwrite(tmp_path):
+    store = DiskRenderStore(tmp_path, max_bytes=1000)
+
+    for _ in range(20):
+        store.put(make_key(1), b"x" * 100)
+
+    assert store._size == store._scan_size() == 100
+
+
+def test_stale_temp_files(tmp_path):
+    store = DiskRenderStore(tmp_path, max_bytes=100)
+
+    stale = store.directory / "00" / "stale.tmp"
+    fresh = store.directory / "00" / "fresh.tmp"
+
+    stale.parent.mkdir()
+    stale.write_bytes(b"x" * 10)
+    fresh.write_bytes(b"x" * 10)
+    os.utime(stale, (0, 0))
+
+    store.put(make_key(1), b"x" * 60)
+    store.put(make_key(2), b"x" * 60)
+
+    assert not stale.exists()
+    assert fresh.exists()
+
+
+def test_bad_keys(tmp_path):
+    store = DiskRenderStore(tmp_path)
+
+    for key in ["../../etc/passwd", "ABCDEF0123", ""]:
+        try:
+            store.get(key)
+
+        except ValueError:
+            pass
+
+        else:
+            raise AssertionError(f"{key!r} was accepted")
+
+
+def test_render_cache_uses_store(tmp_path):
+    term_info = TermDb().get_fallback_info()
+
+    config = CanvasConfig()
+    config.width  = 10
+    config.height = 5
+
+    pixels = bytes([30, 60, 90, 255] * 16 * 16)
+    args   = (
+        config.snapshot(), 
+        PixelType.CHAFA_PIXEL_RGBA8_UNASSOCIATED, 
+        pixels, 16, 16, 64, 
+        term_info
+    )
+
+    output = RenderCache(store=DiskRenderStore(tmp_path)).render(*args)
+
+    # A fresh cache, like after a restart
+    cache = RenderCache(store=DiskRenderStore(tmp_path))
+
+    assert cache.render(*args) == output
+    assert cache.stats.store_hits == 1
@@ -0,0 +1,123 @@
+import threading
+
+from chafa import *
+
+
+def make_config(width=10):
+    config = CanvasConfig()
+
+    config.width  = width
+    config.height = 5
+
+    return config
+
+
+def test_checkout_reuses_canvases():
+    pool     = CanvasPool(max_idle=1)
+    snapshot = make_config().snapshot()
+
+    with pool.checkout(snapshot) as canvas:
+        assert canvas.peek_config().snapshot() == snapshot
+        first = canvas
+
+    assert pool.idle_count(snapshot) == 1
+
+    with pool.checkout(make_config()) as canvas:
+        assert canvas is first
+
+    with pool.checkout(make_config(width=20)) as canvas:
+        assert canvas.peek_config().width == 20
+
+    assert pool.idle_count() == 2
+
+
+def test_max_idle():
+    pool     = CanvasPool(max_idle=2)
+    snapshot = make_config().snapshot()
+
+    canvases = [pool.acquire(snapshot) for _ in range(4)]
+
+    for canvas in canvases:
+        pool.release(canvas)
+
+    assert pool.idle_count(snapshot) == 2
+
+
+def test_max_keys():
+    pool = CanvasPool(max_keys=3)
+
+    for width in range(10, 30):
+        with pool.checkout(make_config(width=width)):
+            pass
+
+        assert pool.config_count() <= 3
+        assert pool.idle_count() <= 3
+
+    # The most recently used configs are kept
+    assert pool.idle_count(make_config(width=29)) == 1
+    assert pool.idle_count(make_config(width=10)) == 0
+
+    # Released after its config was evicted
+    canvas = pool.acquire(make_config(width=40))
+
+    for width in range(41, 45):
+        with pool.checkout(make_config(width=width)):
+            pass
+
+    pool.release(canvas)
+
+    assert pool.idle_count(make_config(width=40)) == 0
+    assert pool.config_count() == 3
+
+
+def test_release_foreign_canvas():
+    pool = CanvasPool()
+
+    try:
+        pool.release(Canvas(make_config()))
+
+    except ValueError:
+        pass
+
+    else:
+        raise AssertionError("released a canvas that was never acquired")
+
+
+def test_threads():
+    pool     = CanvasPool()
+    snapshot = make_config().snapshot()
+    errors   = []
+
+    def work():
+        try:
+            for _ in range(50):
+                with pool.checkout(snapshot) as canvas:
+                    canvas.print(TermDb().get_fallback_info())
+
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=work) for _ in range(4)]
+
+    for thread in threads:
+        thread.start()
+
+    for thread in threads:
+        thread.join()
+
+    assert not errors
+    assert pool.idle_count(snapshot) <= pool.max_idle
+
+
+def test_read_only_config():
+    pool   = CanvasPool()
+    config = Canvas(make_config(width=14)).peek_config()
+
+    with pool.checkout(config) as canvas:
+        assert canvas.peek_config().width == 14
+
+
+def test_peek_config_outlives_canvas():
+    config = Canvas(make_config(width=12)).peek_config()
+
+    assert config.width == 12
@@ -0,0 +1,46 @@
+from chafa import *
+
+
+def test_from_selectors_is_cached():
+    symbol_map = SymbolMap.from_selectors("block+border-dot")
+
+    assert symbol_map is SymbolMap.from_selectors("block+border-dot")
+    assert symbol_map is not SymbolMap.from_selectors("block+border")
+
+    config = CanvasConfig()
+    config.set_symbol_map(symbol_map)
+
+    other = CanvasConfig()
+    other_map = SymbolMap()
+    other_map.apply_selectors("block+border-dot")
+    other.set_symbol_map(other_map)
+
+    assert config.snapshot() == other.snapshot()
+
+
+def test_shared_maps_are_frozen():
+    symbol_map = SymbolMap.from_selectors("block")
+
+    try:
+        symbol_map.add_by_tags(SymbolTags.CHAFA_SYMBOL_TAG_BORDER)
+
+    except TypeError:
+        pass
+
+    else:
+        raise AssertionError("changed a shared symbol map")
+
+    # Copies can be changed
+    symbol_map.copy().add_by_tags(SymbolTags.CHAFA_SYMBOL_TAG_BORDER)
+
+
+def test_invalid_selectors():
+    for _ in range(2):
+        try:
+            SymbolMap.from_selectors("block+not_a_tag")
+
+        except ValueError:
+            pass
+
+        else:
+            raise AssertionError("invalid selectors were accepted")
@@ -0,0 +1,79 @@
+from chafa import *
+
+
+def test_equal_maps():
+    selectors = SymbolMap()
+    selectors.apply_selectors("block,border-dot")
+
+    tags = SymbolMap()
+    tags.add_by_tags(SymbolTags.CHAFA_SYMBOL_TAG_BLOCK)
+    tags.add_by_tags(SymbolTags.CHAFA_SYMBOL_TAG_BORDER)
+    tags.remove_by_tags(SymbolTags.CHAFA_SYMBOL_TAG_DOT)
+
+    assert selectors == tags
+    assert selectors.canonical == (
+        ("add_by_tags", int(SymbolTags.CHAFA_SYMBOL_TAG_BLOCK | SymbolTags.CHAFA_SYMBOL_TAG_BORDER)),
+        ("remove_by_tags", int(SymbolTags.CHAFA_SYMBOL_TAG_DOT)),
+    )
+
+    shared = SymbolMap.from_selectors("block+border-dot")
+
+    assert shared == tags
+    assert hash(shared) == hash(SymbolMap.from_selectors("block,border-dot"))
+
+
+def test_only_unchangeable_maps_hash():
+    try:
+        hash(SymbolMap())
+
+    except TypeError:
+        pass
+
+    else:
+        raise AssertionError("a changeable symbol map was hashable")
+
+    config = CanvasConfig()
+    config.set_symbol_map(SymbolMap.from_selectors("block"))
+
+    assert len({config.peek_symbol_map(), config.peek_symbol_map()}) == 1
+
+
+def test_different_maps():
+    first = SymbolMap()
+    first.apply_selectors("block")
+
+    second = first.copy()
+    second.add_by_range("a", "z")
+
+    assert first != second
+    assert SymbolMap() == SymbolMap()
+    assert SymbolMap() != first
+
+
+def test_peeked_maps():
+    symbol_map = SymbolMap()
+    symbol_map.apply_selectors("braille")
+
+    config = CanvasConfig()
+    config.set_symbol_map(symbol_map)
+
+    assert config.peek_symbol_map() == symbol_map
+    assert config.peek_symbol_map().canonical == symbol_map.canonical
+
+    # chafa's default map has no canonical form
+    default = CanvasConfig().peek_symbol_map()
+
+    assert default.canonical is None
+    assert default != symbol_map
+
+
+def test_snapshot_round_trip_with_removals():
+    symbol_map = SymbolMap()
+    symbol_map.apply_selectors("all-dot-braille")
+
+    config = CanvasConfig()
+    config.set_symbol_map(symbol_map)
+
+    snapshot = config.snapshot()
+
+    assert CanvasConfig.from_snapshot(snapshot).snapshot() == snapshot
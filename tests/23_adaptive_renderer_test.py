@@ -0,0 +1,94 @@
+from chafa import *
+
+
+class FakeClock:
+    """
+    Pretends every frame takes frame_time seconds
+    """
+
+    def __init__(self):
+        self.now        = 0.0
+        self.frame_time = 0.0
+        self.started    = False
+
+    def __call__(self):
+        if self.started:
+            self.now += self.frame_time
+
+        self.started = not self.started
+
+        return self.now
+
+
+def make_config():
+    config = CanvasConfig()
+
+    config.width       = 10
+    config.height      = 5
+    config.work_factor = 0.5
+    config.dither_mode = DitherMode.CHAFA_DITHER_MODE_ORDERED
+
+    return config
+
+
+def draw(renderer, frames):
+    pixels = bytes([100, 150, 200, 255] * 8 * 8)
+
+    for _ in range(frames):
+        renderer.draw(PixelType.CHAFA_PIXEL_RGBA8_UNASSOCIATED, pixels, 8, 8, 32)
+
+
+def test_turns_quality_down_and_up():
+    clock    = FakeClock()
+    renderer = AdaptiveRenderer(
+        make_config(), 
+        target_frame_time=0.01, 
+        window=2, 
+        tune_dither_mode=True, 
+        clock=clock
+    )
+
+    # Way too slow, ends up at the lowest level
+    clock.frame_time = 1.0
+    draw(renderer, 100)
+
+    assert renderer.config.work_factor == 0.0
+    assert renderer.config.dither_mode == DitherMode.CHAFA_DITHER_MODE_NONE
+    assert renderer.last_frame_time == 1.0
+
+    # Plenty of time, back to the original config
+    clock.frame_time = 0.0
+    draw(renderer, 100)
+
+    assert renderer.level == 0
+    assert renderer.config.work_factor == 0.5
+    assert renderer.config.dither_mode == DitherMode.CHAFA_DITHER_MODE_ORDERED
+
+
+def test_hysteresis():
+    clock    = FakeClock()
+    renderer = AdaptiveRenderer(make_config(), target_frame_time=0.01, window=2, clock=clock)
+
+    # Slower than the target, but within the hysteresis
+    clock.frame_time = 0.011
+    draw(renderer, 20)
+
+    assert renderer.level == 0
+
+
+def test_update_config_keeps_level():
+    clock    = FakeClock()
+    renderer = AdaptiveRenderer(make_config(), target_frame_time=0.01, window=2, clock=clock)
+
+    clock.frame_time = 0.02
+    draw(renderer, 2)
+
+    level  = renderer.level
+    config = make_config()
+    config.width = 20
+
+    renderer.update_config(config)
+
+    assert level > 0
+    assert renderer.level == level
+    assert renderer.config.width == 20
@@ -0,0 +1,43 @@
+from chafa import *
+
+
+FONT_RATIO = 11/24
+
+SIZES = [(640, 480), (480, 640), (1920, 1080), (640, 480), (16, 16), (1, 1000)]
+
+
+def test_matches_calc_canvas_geometry():
+    for zoom, stretch in [(False, False), (True, False), (False, True)]:
+        widths, heights = calc_geometries(SIZES, 40, 20, FONT_RATIO, zoom, stretch)
+
+        assert len(widths) == len(heights) == len(SIZES)
+
+        for (src_width, src_height), width, height in zip(SIZES, widths, heights):
+            config = CanvasConfig()
+            config.width  = 40
+            config.height = 20
+
+            config.calc_canvas_geometry(src_width, src_height, FONT_RATIO, zoom, stretch)
+
+            assert (config.width, config.height) == (width, height)
+
+
+def test_repeated_sizes():
+    widths, heights = calc_geometries(SIZES, 40, 20, FONT_RATIO)
+
+    assert (widths[0], heights[0]) == (widths[3], heights[3])
+
+    # Same results from the cache
+    assert calc_geometries(SIZES, 40, 20, FONT_RATIO) == (widths, heights)
+
+
+def test_invalid_sizes():
+    for sizes, font_ratio in [([(0, 10)], FONT_RATIO), ([(10, -1)], FONT_RATIO), ([(10, 10)], 0)]:
+        try:
+            calc_geometries(sizes, 40, 20, font_ratio)
+
+        except ValueError:
+            pass
+
+        else:
+            raise AssertionError(f"{sizes} with font ratio {font_ratio} was accepted")
@@ -0,0 +1,34 @@
+from chafa import *
+
+
+def test_presets():
+    fastest = CanvasConfig.from_preset("fastest")
+    quality = CanvasConfig.from_preset("quality")
+
+    assert fastest.work_factor == 0.0
+    assert fastest.dither_mode == DitherMode.CHAFA_DITHER_MODE_NONE
+
+    assert quality.work_factor == 1.0
+    assert quality.color_space == ColorSpace.CHAFA_COLOR_SPACE_DIN99D
+    assert quality.color_extractor == ColorExtractor.CHAFA_COLOR_EXTRACTOR_MEDIAN
+
+    assert CanvasConfig.from_preset("balanced").snapshot() != fastest.snapshot()
+
+
+def test_preset_changes():
+    config = CanvasConfig.from_preset("balanced", width=20, dither_mode="CHAFA_DITHER_MODE_NONE")
+
+    assert config.width == 20
+    assert config.work_factor == 0.5
+    assert config.dither_mode == DitherMode.CHAFA_DITHER_MODE_NONE
+
+
+def test_unknown_preset():
+    try:
+        CanvasConfig.from_preset("ludicrous")
+
+    except ValueError:
+        pass
+
+    else:
+        raise AssertionError("unknown preset was accepted")
@@ -6,4 +6,28 @@ def test_capabilities():
 
     capabilites = info.detect_capabilities()
 
-    print(capabilites)
\ No newline at end of file
+    print(capabilites)
+
+
+def test_capabilities_cache(monkeypatch):
+    from chafa import term_info
+
+    queries = []
+
+    def fake_device_attributes():
+        queries.append(None)
+        return (62, 4)
+
+    monkeypatch.setattr(term_info, "get_device_attributes", fake_device_attributes)
+    monkeypatch.setattr(term_info, "_device_attributes", None)
+    monkeypatch.setenv("TERM", "xterm-256color")
+
+    info = TermDb().detect()
+    capabilities = info.detect_capabilities()
+
+    assert info.detect_capabilities() == capabilities
+    assert info.detect_capabilities() is not capabilities
+
+    # The terminal is queried once per process
+    TermDb().detect().detect_capabilities()
+    assert len(queries) <= 1
@@ -0,0 +1,35 @@
+from chafa import *
+from chafa.loader import Loader
+
+from pathlib import Path
+
+import pytest
+
+def test_loader_auto_pixel_type():
+    # A jpeg has no alpha channel so we should get RGB
+    image = Loader(Path(__file__).parent / "snake.jpg")
+
+    assert image.pixel_type == PixelType.CHAFA_PIXEL_RGB8
+    assert image.channels   == 3
+    assert image.rowstride  == image.width * 3
+    assert len(image.get_pixels()) == image.rowstride * image.height
+
+
+def test_loader_explicit_pixel_type():
+    rgb  = Loader(Path(__file__).parent / "snake.jpg", PixelType.CHAFA_PIXEL_RGB8)
+    bgra = Loader(Path(__file__).parent / "snake.jpg", PixelType.CHAFA_PIXEL_BGRA8_UNASSOCIATED)
+
+    assert bgra.channels  == 4
+    assert bgra.rowstride == bgra.width * 4
+
+    rgb_pixels  = rgb.get_pixels()
+    bgra_pixels = bgra.get_pixels()
+
+    # The first pixel should be the same, just in a different order
+    assert tuple(rgb_pixels[0:3]) == tuple(bgra_pixels[2::-1])
+    assert bgra_pixels[3] == 255
+
+
+def test_loader_unsupported_pixel_type():
+    with pytest.raises(ValueError):
+        Loader(Path(__file__).parent / "snake.jpg", PixelType.CHAFA_PIXEL_MAX)
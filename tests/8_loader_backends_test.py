@@ -0,0 +1,113 @@
+from chafa import *
+from chafa import loader
+from chafa.loader import Loader, available_backends, load_many
+
+from pathlib import Path
+
+import pytest
+
+SNAKE = Path(__file__).parent / "snake.jpg"
+
+def test_backends_agree():
+    backends = [name for name in available_backends() if name != "raw"]
+
+    loaded = [Loader(SNAKE, backend=name) for name in backends]
+
+    for image in loaded:
+        assert image.pixel_type == PixelType.CHAFA_PIXEL_RGB8
+        assert image.width      == loaded[0].width
+        assert image.height     == loaded[0].height
+
+
+def test_max_size():
+    image = Loader(SNAKE, max_size=(64, 64))
+
+    assert image.width  <= 64
+    assert image.height <= 64
+    assert len(image.get_pixels()) == image.rowstride * image.height
+
+
+def test_raw_backend(tmp_path):
+    path = tmp_path / "image.ppm"
+
+    # A 2x1 image with one red and one blue pixel
+    path.write_bytes(b"P6\n# a comment\n2 1\n255\n" + bytes([255, 0, 0, 0, 0, 255]))
+
+    image = Loader(path, PixelType.CHAFA_PIXEL_BGRA8_UNASSOCIATED, backend="raw")
+
+    assert image.backend == "raw"
+    assert (image.width, image.height) == (2, 1)
+    assert tuple(image.get_pixels()) == (0, 0, 255, 255, 255, 0, 0, 255)
+
+
+def test_raw_backend_maxval(tmp_path):
+    path = tmp_path / "image.pgm"
+
+    # White, grey and black with a maxval of 15
+    path.write_bytes(b"P5 3 1 15\n" + bytes([15, 5, 0]))
+
+    image = Loader(path, PixelType.CHAFA_PIXEL_RGB8, backend="raw")
+
+    assert tuple(image.get_pixels()) == (255,) * 3 + (85,) * 3 + (0,) * 3
+
+    path.write_bytes(b"P5 1 1 0\n" + bytes([0]))
+
+    with pytest.raises(ValueError):
+        Loader(path, backend="raw")
+
+
+def test_raw_backend_truncated(tmp_path):
+    path = tmp_path / "truncated.ppm"
+
+    # Claims 2x2 pixels but only has one
+    path.write_bytes(b"P6\n2 2\n255\n" + bytes([255, 0, 0]))
+
+    with pytest.raises(ValueError):
+        Loader(path, backend="raw")
+
+
+def test_unknown_backend():
+    with pytest.raises(ValueError):
+        Loader(SNAKE, backend="not a backend")
+
+
+def test_load_many(tmp_path):
+    paths = []
+
+    # Images of different widths so we can tell them apart
+    for width in range(1, 9):
+        path = tmp_path / f"{width}.ppm"
+        path.write_bytes(f"P6 {width} 1 255\n".encode() + bytes(3 * width))
+
+        paths.append(path)
+
+    ordered = [image.width for image in load_many(paths, workers=4, max_pending=2)]
+    assert ordered == list(range(1, 9))
+
+    unordered = [image.width for image in load_many(paths, workers=4, ordered=False)]
+    assert sorted(unordered) == list(range(1, 9))
+
+    results = list(load_many([paths[0], tmp_path / "missing.ppm"], return_exceptions=True))
+    assert isinstance(results[1], FileNotFoundError)
+
+    # The image being consumed counts towards max_pending
+    started = []
+
+    def tracked():
+        for path in paths:
+            started.append(path)
+            yield path
+
+    for consumed, image in enumerate(load_many(tracked(), workers=4, max_pending=2)):
+        assert len(started) <= consumed + 2
+
+
+def test_bad_magickwand_override(tmp_path, monkeypatch):
+    monkeypatch.setattr(loader, "_MagickWand", None)
+    monkeypatch.setattr(loader, "_magickwand_searched", False)
+    monkeypatch.setenv("CHAFA_MAGICKWAND_LIBRARY", str(tmp_path / "missing.so"))
+
+    # Raised every time, not just the first
+    for _ in range(2):
+        with pytest.raises(ImportError):
+            loader._load_magickwand()
@@ -0,0 +1,37 @@
+from chafa import *
+from chafa import term_db
+
+def test_detect_cache(monkeypatch):
+    db = TermDb()
+
+    monkeypatch.setenv("TERM", "xterm-kitty")
+
+    # The shared result is reused while the environment stays the same
+    assert db._detect_cached(False) is db._detect_cached(False)
+
+    kitty = db.detect()
+    assert kitty.have_seq(TermSeq.CHAFA_TERM_SEQ_BEGIN_KITTY_IMMEDIATE_IMAGE_V1)
+
+    # Changing the environment gives a new result
+    monkeypatch.setenv("TERM", "dumb")
+    monkeypatch.delenv("KITTY_WINDOW_ID", raising=False)
+
+    dumb = db.detect()
+    assert not dumb.have_seq(TermSeq.CHAFA_TERM_SEQ_BEGIN_KITTY_IMMEDIATE_IMAGE_V1)
+
+    # Invalidating forgets the cached results
+    cached = db._detect_cached(False)
+    TermDb.invalidate_detect_cache()
+
+    assert db._detect_cached(False) is not cached
+
+
+def test_detect_cache_is_bounded():
+    db = TermDb()
+
+    TermDb.invalidate_detect_cache()
+
+    for i in range(200):
+        db.detect(environment={"TERM": "xterm-256color", "COLUMNS": str(i)})
+
+    assert len(term_db._detect_cache) <= term_db._DETECT_CACHE_SIZE